@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:36:32 2026
+
+@author: agent
+
+Scaling benchmark for every public function of info_geo. Each function is run on synthetic signals
+and swept along its scaling axes one axis at a time (the other axes stay at the default values);
+N=channels #, T=windows #, W=window of data, L=samples, bins=bins size, P=vectors # (pair count P(P-1)/2).
+
+The wall time (best of the repeats) and the peak memory (tracemalloc, main process only) are recorded
+and compared with the stored baseline. A case is flagged when the time or the peak memory is larger
+than the baseline by more than the threshold (25% by default). No network or data file is needed.
+
+The wall time depends on the machine, so the baseline is not kept in the repository: generate it on the
+machine that runs the comparison (--save-baseline, e.g. on the base commit), and generate it again after a
+change of the machine, Python or NumPy. Without a baseline the cases are only measured.
+
+usage:
+    python benchmarks/bench_info_geo.py                      # run and compare with benchmarks/baseline.json
+    python benchmarks/bench_info_geo.py --save-baseline      # run and store the baseline of this machine
+    python benchmarks/bench_info_geo.py --filter fix_ --threshold 0.5
+
+return (exit code):
+    0: no regression; 1: regression beyond the threshold; 2: public function without benchmark.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import warnings
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import info_geo as ig
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# synthetic signals ######################################################################################
+def make_signal(n, l, seed=0):
+    rng = np.random.default_rng(seed)
+    temp_time = np.arange(l)/250
+    temp_signal = np.sin(2*np.pi*(5 + np.arange(n)[:, None])*temp_time) + 0.3*rng.standard_normal((n, l))
+    return temp_signal, temp_time
+
+def make_windows(n, t, w, sld=None, seed=0):
+    sld = w//2 if sld is None else sld
+    temp_signal, temp_time = make_signal(n, (t - 1)*sld + w, seed=seed)
+    temp_signal = temp_signal/np.max(np.abs(temp_signal))
+    return sliding_window_view(temp_signal, w, axis=-1)[:, ::sld], sliding_window_view(temp_time, w)[::sld]
+
+def make_vectors(p, n, seed=0):
+    temp_vec = np.random.default_rng(seed).standard_normal((p, n))
+    return temp_vec/np.linalg.norm(temp_vec, axis=1, keepdims=True)
+
+def stream_run(stream, data, time_data, chunk):
+    for i in range(0, data.shape[-1], chunk):
+        stream.update(data[..., i:i + chunk], time_data[i:i + chunk])
+
+def stft_stream_run(stream, data, chunk):
+    for i in range(0, data.shape[-1], chunk):
+        stream.update(data[..., i:i + chunk])
+    stream.flush()
+
+# benchmark cases: name -> (public names covered, default axes, sweep axes, setup returning a callable) ####
+def case_adj_collect(N, T, W, bins):
+    d, t = make_windows(N, T, W)
+    return lambda: [ig.adj_collect_inforate_square(d, t, i, bins_size=bins) for i in range(T - 1)]
+
+def case_adj_collect_series(N, T, W, bins):
+    d, t = make_windows(N, T, W)
+    return lambda: ig.adj_collect_inforate_series(d, t, bins_size=bins)
+
+def case_fix_single(T, W, bins):
+    d, t = make_windows(1, T, W)
+    return lambda: ig.fix_single_inforate_square(d[0], t, int_bins=bins)
+
+def case_fix_collect(N, T, W, bins):
+    d, t = make_windows(N, T, W)
+    return lambda: ig.fix_collect_inforate_square(d, t, int_range=(-1.05, 1.05), int_bins=bins)
+
+def case_fix_stream(N, L, W, bins):
+    x, t = make_signal(N, L)
+    x = x/np.max(np.abs(x))
+    return lambda: stream_run(ig.FixInforateStream(W, W//2, bins, 1.05, N), x, t, 1000)
+
+def case_adj2d_collect(N, T, W, bins):
+    d1, t = make_windows(N, T, W, seed=1)
+    d2, _ = make_windows(N, T, W, seed=2)
+    return lambda: [ig.adj2d_collect_inforate_square(d1, d2, t, i, bins_size=bins) for i in range(T - 1)]
+
+def case_fix_double(N, T, W, bins):
+    d1, t = make_windows(N, T, W, seed=1)
+    d2, _ = make_windows(N, T, W, seed=2)
+    return lambda: ig.fix_double_inforate_square(d1, d2, t, int_bins=bins)
+
+def case_fix_double_density(N, T, W, bins, density):
+    d1, t = make_windows(N, T, W, seed=1)
+    d2, _ = make_windows(N, T, W, seed=2)
+    return lambda: ig.fix_double_inforate_square(d1, d2, t, int_bins=bins, density=density)
+
+def case_fix_double_channels(N1, N2, T, W):
+    # different number of channels; tiled pairing of the channels
+    d1, t = make_windows(N1, T, W, seed=1)
+    d2, _ = make_windows(N2, T, W, seed=2)
+    return lambda: ig.fix_double_inforate_square(d1, d2, t, int_range=4.0)
+
+def case_nd_inforate(D, N, T, W, bins):
+    # joint distribution of D regions; sparse occupied cells
+    d = [make_windows(N, T, W, seed=seed)[0] for seed in range(1, D + 1)]
+    _, t = make_windows(N, T, W)
+    return lambda: (ig.fix_nd_inforate_square(d, t, int_bins=bins, int_range=4.0), ig.adjnd_collect_inforate_series(d, t, bins_size=bins))
+
+def case_adj_collect_series_density(N, T, W, bins, density):
+    d, t = make_windows(N, T, W)
+    return lambda: ig.adj_collect_inforate_series(d, t, bins_size=bins, density=density)
+
+def case_stft(N, L, W):
+    x, t = make_signal(N, L)
+    return lambda: ig.inforate_square_stft(x, t, win_size=W, int_freq_range=[0, 100])
+
+def case_stft_stream(N, L, W):
+    x, t = make_signal(N, L)
+    return lambda: stft_stream_run(ig.InforateStftStream(250, W, int_freq_range=[0, 100], n_channels=N), x, 1000)
+
+def case_phase_en_pmf(T, L, bins):
+    x, _ = make_signal(T, L)
+    return lambda: ig.phase_en_pmf(x, K=bins, tau=1)
+
+def case_phase_en_pdf(T, W, bins):
+    d, _ = make_windows(1, T, W)
+    return lambda: [ig.phase_en_pdf(d[0], i, int_k=bins) for i in range(T)]
+
+def case_phase_en_pdf_batch(T, W, bins):
+    d, _ = make_windows(1, T, W)
+    return lambda: ig.phase_en_pdf_batch(d[0], int_k=bins)
+
+def case_phase_en_pdf_range(L, W, bins):
+    x, t = make_signal(1, L)
+    return lambda: ig.phase_en_pdf_range(x[0], t, int_win=W, int_sld=W//2, int_bins=bins)
+
+def case_adj2d_entro(L, W, bins):
+    x, t = make_signal(2, L)
+    return lambda: ig.adj2d_inforate_shannon_entro(x[0], x[1], t, win=W, sld=W//2, bins=bins)
+
+def case_adj2d_connectivity(N, L, bins):
+    x, t = make_signal(N, L)
+    return lambda: ig.adj2d_inforate_connectivity(x, t, win=20, sld=10, bins=bins)
+
+def case_fix2d_entro(L, W, bins):
+    x, t = make_signal(2, L)
+    return lambda: ig.fix2d_phase_inforate_shannon_entro(x[0], x[1], t, win=W, sld=W//2, bins=bins)
+
+def case_phase_lock(N, L):
+    x, _ = make_signal(N, L)
+    return lambda: ig.phase_lock_matrix(x)
+
+def case_analytic(N, L, block):
+    x, _ = make_signal(N, L)
+    def run():
+        ig.analytic_signal(x, block_size=block, dtype=np.float32)
+        ig.unwrapped_phase(x, block_size=block)
+    return run
+
+def case_phase_lock_chunks(N, L):
+    x, _ = make_signal(N, L)
+    return lambda: [None for _ in ig.phase_lock_matrix_chunks(x, chunk_size=256)]
+
+def case_phase_lead_eigvec(N, L):
+    x, _ = make_signal(N, L)
+    return lambda: ig.phase_lead_eigvec(x)
+
+def case_lead_eigvec(N, T):
+    x, _ = make_signal(N, T)
+    m = ig.phase_lock_matrix(x)
+    return lambda: ig.lead_eigvec_cal(m)
+
+def case_lead_eigvec_optimized(N, T):
+    x, _ = make_signal(N, T)
+    m = ig.phase_lock_matrix(x)
+    return lambda: ig.lead_eigvec_cal_optimized(m)
+
+def case_lead_eigvec_batched(N, T):
+    x, _ = make_signal(N, T)
+    m = ig.phase_lock_matrix(x)
+    return lambda: ig.lead_eigvec_cal_batched(m)
+
+def case_any_dist_his(P, N, bins):
+    v = make_vectors(P, N)
+    return lambda: ig.any_dist_his(v, int_bins=bins, int_range=(0, 2.1))
+
+def case_any_dist_kde(P, N, bins):
+    v = make_vectors(P, N)
+    return lambda: ig.any_dist_kde(v, int_bins=bins, int_range=(-0.1, 2.2))
+
+def case_hjorth(N, T, W):
+    d, t = make_windows(N, T, W)
+    return lambda: (ig.hjorth_act(d, t), ig.hjorth_mob(d, t), ig.hjorth_com(d, t), ig.hjorth_paras(d, t))
+
+def case_hjorth_raw(N, L, W):
+    x, t = make_signal(N, L)
+    return lambda: ig.hjorth_paras_raw(x, t, W, W//2)
+
+def case_disper(L, bins):
+    x, _ = make_signal(1, L)
+    return lambda: ig.disper_entropy(x[0], m_val=3, c_val=bins)
+
+def case_disper_multi(N, L, bins):
+    x, _ = make_signal(N, L)
+    return lambda: ig.disper_entropy_multi(x, m_val=3, c_val=bins, scales=3)
+
+def case_fft_power(N, L):
+    x, t = make_signal(N, L)
+    temp_amp = np.abs(np.fft.rfft(x, axis=-1))
+    temp_freq = np.fft.rfftfreq(L, t[1] - t[0])
+    return lambda: ig.fft_power(temp_amp, temp_freq, (4, 8))
+
+def case_profile_stages(N, T, W, bins):
+    d1, t = make_windows(N, T, W, seed=1)
+    d2, _ = make_windows(N, T, W, seed=2)
+    def run():
+        with ig.profile_stages(trace_memory=False):
+            ig.fix_double_inforate_square(d1, d2, t, int_bins=bins)
+    return run
+
+def case_execution(N, T):
+    x, _ = make_signal(N, T)
+    m = ig.phase_lock_matrix(x)
+    def run():
+        with ig.execution(backend='serial', blas_threads=1):
+            ig.get_execution()
+            ig.lead_eigvec_cal(m)
+    return run
+
+def case_execution_dtype(N, T, W, dtype):
+    # float32 path; the windows are views of the float32 signal
+    x, t = make_signal(N, (T - 1)*(W//2) + W)
+    x = (x/np.max(np.abs(x))).astype(dtype)
+    d, t = sliding_window_view(x, W, axis=-1)[:, ::W//2], sliding_window_view(t, W)[::W//2]
+    def run():
+        with ig.execution(backend='serial', dtype=dtype):
+            ig.fix_collect_inforate_square(d, t, int_range=(-1.05, 1.05))
+            ig.hjorth_paras(d, t)
+            ig.phase_lock_matrix(d[:, :, 0])
+    return run
+
+def case_jit(N, T, W, bins):
+    # compiled kernels if numba is installed (NumPy path otherwise)
+    d, t = make_windows(N, T, W)
+    def run():
+        with ig.execution(backend='serial', jit=True):
+            ig.fix_collect_inforate_square(d, t, int_range=(-1.05, 1.05), int_bins=bins)
+            ig.adj_collect_inforate_series(d, t, bins_size=bins)
+            ig.fix_double_inforate_square(d[:N//2], d[N//2:], t, int_bins=bins)
+    return run
+
+def case_shared(N, L, W):
+    # process backend; the inputs are shared with the workers once (shared memory)
+    x, t = make_signal(N, L)
+    m = ig.phase_lock_matrix(x)
+    def run():
+        with ig.execution(backend='process', n_jobs=2):
+            ig.lead_eigvec_cal(m)
+            ig.adj2d_inforate_shannon_entro(x[0], x[1], t, win=W, sld=W//2, bins=30)
+    return run
+
+def case_cache(L, W, bins):
+    x, t = make_signal(2, L)
+    cache = ig.StageCache()
+    ig.set_cache(None)
+    def run():
+        # sweep of entro_bins: the information rate series is computed once, then reused
+        cache.clear()
+        with ig.cache_stages(cache=cache):
+            for entro_bins in (10, 20, 40):
+                ig.fix2d_phase_inforate_shannon_entro(x[0], x[1], t, win=W, sld=W//2, bins=bins, entro_bins=entro_bins)
+    return run
+
+def case_out_of_core(N, L, chunk):
+    x, t = make_signal(N, L)
+    temp_dir = tempfile.mkdtemp(prefix='bench_info_geo_')
+    np.save(os.path.join(temp_dir, 'signal.npy'), x)
+    np.save(os.path.join(temp_dir, 'time.npy'), t)
+    def run():
+        # the recording is read memory-mapped and the outputs are written to .npy files
+        signal = os.path.join(temp_dir, 'signal.npy')
+        time_data = os.path.join(temp_dir, 'time.npy')
+        out_dir = os.path.join(temp_dir, 'out')
+        ig.out_of_core_inforate(signal, time_data, out_dir, win=20, sld=10, chunk_windows=chunk)
+        ig.out_of_core_hjorth(signal, time_data, out_dir, 20, sld=10, chunk_windows=chunk)
+        ig.out_of_core_phase_en(signal, time_data, out_dir, int_win=200, int_sld=100, chunk_windows=chunk)
+        ig.out_of_core_phase_lock(signal, out_dir, dtype=np.float32, chunk_size=chunk*10, margin=chunk)
+    return run
+
+def case_find_indices(L):
+    rng = np.random.default_rng(0)
+    temp_original = rng.permutation(L)
+    temp_subset = temp_original[::10]
+    return lambda: ig.find_indices(temp_original, temp_subset)
+
+BENCHMARKS = {
+    'adj_collect_inforate_square': (['adj_collect_inforate_square'], case_adj_collect, dict(N=4, T=100, W=100, bins=50), dict(N=[16], T=[400], W=[400], bins=[200])),
+    'adj_collect_inforate_series': (['adj_collect_inforate_series'], case_adj_collect_series, dict(N=4, T=100, W=100, bins=50), dict(N=[16], T=[400], W=[400], bins=[200])),
+    'adj_collect_inforate_series_density': ([], case_adj_collect_series_density, dict(N=4, T=100, W=100, bins=50, density='ash'), dict(density=['kde'], T=[400], bins=[200])),
+    'fix_single_inforate_square': (['fix_single_inforate_square'], case_fix_single, dict(T=200, W=100, bins=30), dict(T=[800], W=[400], bins=[120])),
+    'fix_collect_inforate_square': (['fix_collect_inforate_square'], case_fix_collect, dict(N=4, T=200, W=100, bins=30), dict(N=[16], T=[800], W=[400], bins=[120])),
+    'FixInforateStream': (['FixInforateStream'], case_fix_stream, dict(N=1, L=20000, W=100, bins=30), dict(N=[8], L=[80000], W=[400], bins=[120])),
+    'adj2d_collect_inforate_square': (['adj2d_collect_inforate_square'], case_adj2d_collect, dict(N=2, T=100, W=100, bins=30), dict(N=[8], T=[400], W=[400], bins=[60])),
+    'fix_double_inforate_square': (['fix_double_inforate_square'], case_fix_double, dict(N=2, T=200, W=100, bins=30), dict(N=[8], T=[800], W=[400], bins=[60])),
+    'fix_double_inforate_square_density': ([], case_fix_double_density, dict(N=2, T=200, W=100, bins=30, density='ash'), dict(density=['kde'], T=[800], bins=[60])),
+    'fix_double_inforate_square_channels': ([], case_fix_double_channels, dict(N1=16, N2=8, T=200, W=100), dict(N1=[64, 63], N2=[32])),
+    'nd_inforate_square': (['fix_nd_inforate_square', 'adjnd_collect_inforate_series'], case_nd_inforate, dict(D=3, N=2, T=200, W=100, bins=30), dict(D=[5], N=[8], W=[400], bins=[50])),
+    'inforate_square_stft': (['inforate_square_stft'], case_stft, dict(N=1, L=20000, W=150), dict(N=[8], L=[80000], W=[600])),
+    'InforateStftStream': (['InforateStftStream'], case_stft_stream, dict(N=1, L=20000, W=150), dict(N=[8], L=[80000], W=[600])),
+    'phase_en_pmf': (['phase_en_pmf'], case_phase_en_pmf, dict(T=50, L=500, bins=80), dict(T=[200], L=[2000], bins=[320])),
+    'phase_en_pdf': (['phase_en_pdf'], case_phase_en_pdf, dict(T=50, W=500, bins=80), dict(T=[200], W=[2000], bins=[320])),
+    'phase_en_pdf_batch': (['phase_en_pdf_batch'], case_phase_en_pdf_batch, dict(T=50, W=500, bins=80), dict(T=[200], W=[2000], bins=[320])),
+    'phase_en_pdf_range': (['phase_en_pdf_range'], case_phase_en_pdf_range, dict(L=20000, W=500, bins=80), dict(L=[80000], W=[2000], bins=[320])),
+    'adj2d_inforate_shannon_entro': (['adj2d_inforate_shannon_entro'], case_adj2d_entro, dict(L=2000, W=20, bins=30), dict(L=[8000], W=[80], bins=[60])),
+    'adj2d_inforate_connectivity': (['adj2d_inforate_connectivity'], case_adj2d_connectivity, dict(N=8, L=2000, bins=30), dict(N=[32], L=[8000], bins=[120])),
+    'fix2d_phase_inforate_shannon_entro': (['fix2d_phase_inforate_shannon_entro'], case_fix2d_entro, dict(L=2000, W=20, bins=30), dict(L=[8000], W=[80], bins=[60])),
+    'analytic_signal': (['analytic_signal', 'unwrapped_phase'], case_analytic, dict(N=16, L=100003, block=8192), dict(N=[64], L=[400009], block=[2048])),
+    'phase_lock_matrix': (['phase_lock_matrix'], case_phase_lock, dict(N=16, L=2000), dict(N=[64], L=[8000])),
+    'phase_lock_matrix_chunks': (['phase_lock_matrix_chunks'], case_phase_lock_chunks, dict(N=16, L=2000), dict(N=[64], L=[8000])),
+    'phase_lead_eigvec': (['phase_lead_eigvec'], case_phase_lead_eigvec, dict(N=16, L=2000), dict(N=[64], L=[8000])),
+    'lead_eigvec_cal': (['lead_eigvec_cal'], case_lead_eigvec, dict(N=16, T=200), dict(N=[64], T=[800])),
+    'lead_eigvec_cal_optimized': (['lead_eigvec_cal_optimized'], case_lead_eigvec_optimized, dict(N=16, T=200), dict(N=[64], T=[800])),
+    'lead_eigvec_cal_batched': (['lead_eigvec_cal_batched'], case_lead_eigvec_batched, dict(N=16, T=200), dict(N=[64], T=[800])),
+    'any_dist_his': (['any_dist_his'], case_any_dist_his, dict(P=500, N=16, bins=100), dict(P=[2000], N=[64], bins=[400])),
+    'any_dist_kde': (['any_dist_kde'], case_any_dist_kde, dict(P=500, N=16, bins=1000), dict(P=[2000], N=[64], bins=[4000])),
+    'hjorth': (['hjorth_act', 'hjorth_mob', 'hjorth_com', 'hjorth_paras'], case_hjorth, dict(N=4, T=200, W=100), dict(N=[16], T=[800], W=[400])),
+    'hjorth_paras_raw': (['hjorth_paras_raw'], case_hjorth_raw, dict(N=4, L=20000, W=100), dict(N=[16], L=[80000], W=[400])),
+    'disper_entropy': (['disper_entropy'], case_disper, dict(L=20000, bins=3), dict(L=[80000], bins=[6])),
+    'disper_entropy_multi': (['disper_entropy_multi'], case_disper_multi, dict(N=4, L=20000, bins=3), dict(N=[16], L=[80000], bins=[6])),
+    'fft_power': (['fft_power'], case_fft_power, dict(N=4, L=20000), dict(N=[16], L=[80000])),
+    'find_indices': (['find_indices'], case_find_indices, dict(L=20000), dict(L=[80000])),
+    'profile_stages': (['profile_stages'], case_profile_stages, dict(N=2, T=200, W=100, bins=30), dict(T=[800])),
+    'execution': (['execution', 'set_execution', 'get_execution'], case_execution, dict(N=16, T=200), dict(N=[64], T=[800])),
+    'out_of_core': (['out_of_core_inforate', 'out_of_core_hjorth', 'out_of_core_phase_en', 'out_of_core_phase_lock'], case_out_of_core, dict(N=4, L=4000, chunk=256), dict(N=[16], L=[16000], chunk=[64])),
+    'execution_dtype': ([], case_execution_dtype, dict(N=8, T=200, W=200, dtype='float32'), dict(dtype=['float64'], T=[800])),
+    'execution_jit': ([], case_jit, dict(N=4, T=200, W=100, bins=30), dict(N=[16], T=[800], W=[400], bins=[120])),
+    'execution_shared': ([], case_shared, dict(N=16, L=2000, W=20), dict(N=[64], L=[8000], W=[80])),
+    'cache_stages': (['cache_stages', 'set_cache', 'StageCache'], case_cache, dict(L=2000, W=20, bins=30), dict(L=[8000])),
+}
+
+# running the benchmarks ##################################################################################
+def case_list(int_filter=None):
+    temp_cases = []
+    for temp_name, (_, temp_setup, temp_default, temp_sweep) in BENCHMARKS.items():
+        if int_filter and int_filter not in temp_name:
+            continue
+        temp_cases.append((temp_name, temp_setup, dict(temp_default)))
+        for temp_axis, temp_values in temp_sweep.items():
+            for temp_value in temp_values:
+                temp_params = dict(temp_default)
+                temp_params[temp_axis] = temp_value
+                temp_cases.append((temp_name, temp_setup, temp_params))
+    return temp_cases
+
+def case_key(temp_name, temp_params):
+    return temp_name + '[' + ','.join(f'{k}={v}' for k, v in temp_params.items()) + ']'
+
+def measure(temp_func, int_repeat=3):
+    temp_func() # warm up (imports, worker pools, caches)
+
+    temp_times = []
+    for _ in range(int_repeat):
+        temp_start = time.perf_counter()
+        temp_func()
+        temp_times.append(time.perf_counter() - temp_start)
+
+    tracemalloc.start()
+    temp_func()
+    _, temp_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return min(temp_times), temp_peak
+
+def uncovered_names():
+    temp_covered = set(name for names, _, _, _ in BENCHMARKS.values() for name in names)
+    temp_public = set(name for name in getattr(ig, '__all__', dir(ig)) if not name.startswith('_') and callable(getattr(ig, name)))
+    return sorted(temp_public - temp_covered)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Scaling benchmark for the public functions of info_geo.')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='path of the baseline json file.')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the baseline.')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed relative increase of time and peak memory; default is 0.25.')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs (best is taken); default is 3.')
+    parser.add_argument('--filter', default=None, help='only run the benchmarks containing this name.')
+    args = parser.parse_args(argv)
+
+    temp_missing = uncovered_names()
+    if temp_missing:
+        print(f'public functions without benchmark: {temp_missing}')
+        return 2
+
+    temp_baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            temp_baseline = json.load(f).get('results', {})
+    elif not args.save_baseline:
+        print(f'no baseline at {args.baseline}; the cases are measured only (see --save-baseline).')
+
+    temp_results = {}
+    temp_regressions = []
+    warnings.simplefilter('ignore')
+    for temp_name, temp_setup, temp_params in case_list(args.filter):
+        temp_key = case_key(temp_name, temp_params)
+        temp_time, temp_peak = measure(temp_setup(**temp_params), int_repeat=args.repeat)
+        temp_results[temp_key] = {'time': temp_time, 'peak': temp_peak}
+
+        temp_flag = ''
+        if temp_key in temp_baseline:
+            temp_ref = temp_baseline[temp_key]
+            temp_ratio_time = temp_time/temp_ref['time']
+            temp_ratio_peak = temp_peak/max(temp_ref['peak'], 1)
+            temp_flag = f'  time x{temp_ratio_time:.2f}  peak x{temp_ratio_peak:.2f}'
+            if (temp_ratio_time > 1 + args.threshold) or (temp_ratio_peak > 1 + args.threshold):
+                temp_regressions.append(temp_key)
+                temp_flag += '  REGRESSION'
+        print(f'{temp_key:70s} {temp_time*1e3:10.2f} ms {temp_peak/2**20:10.2f} MiB{temp_flag}', flush=True)
+
+    if args.save_baseline:
+        if args.filter and os.path.exists(args.baseline):
+            temp_baseline.update(temp_results)
+            temp_results = temp_baseline
+        with open(args.baseline, 'w') as f:
+            json.dump({'machine': platform.platform(), 'python': platform.python_version(), 'numpy': np.__version__, 'results': temp_results}, f, indent=1, sort_keys=True)
+        print(f'baseline is stored: {args.baseline}')
+
+    if temp_regressions:
+        print(f'{len(temp_regressions)} regression(s) beyond the threshold of {args.threshold}: {temp_regressions}')
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:55:06 2026
+
+@author: agent
+
+All-pairs 2D [information rate] connectivity. For every pair of channels (a, b), the [information rate]
+series and its Shannon entropy are the same as adj2d_inforate_shannon_entro(data[a], data[b], time)
+(the 2D distribution is symmetric in the pair), but the pairs are not computed one by one:
+    the sliding windows of every channel are taken once;
+    the range of every two consecutive windows (minimum and maximum) is computed once per channel;
+    the bin index of every sample (BEFORE and AFTER window, in the range of the two windows) is computed once per channel,
+    in blocks of time indices and in the smallest integer type that holds bins,
+and every pair only combines the bin indices of its two channels. The joint counts of the pair are taken on
+the occupied cells only (at most 2W cells for every time index), so the cost of a pair does not grow with bins**2.
+The rows of the matrix (channel a with all b > a) are run through the execution configuration (see set_execution());
+the bin indices (or the windows) are shared with the workers once, and every row is written into the shared output.
+
+parameters:
+    data: given signals in 2 dimensions [N x L]; N=# channels, L=samples.
+    time: given time data in 1 dimension [L].
+    win: window size of the sliding window. Integer is expected; default is 10.
+    sld: sliding of the sliding window. Integer is expected; default is 2.
+    bins: bins size of the distribution for information rate calculation. Integer is expected; default is 50.
+    entro_bins: bins size of the distribution for shannon entropy calculation. Integer is expected; default is 10.
+    base: base for the shannon entropy calculation. Integer or float is expected; default is 2.
+    norm: normalization of the shannon entropy. Boolean is expected; default is True.
+    density: density estimator for the information rate calculation; histogram, ash, or kde. Default is histogram.
+        ash and kde are estimated pair by pair (batch_density2d()); the windows and the ranges are still shared.
+
+return:
+    numpy.ndarray: inforate_entropy; 2D information rate Shannon entropy of every pair [N x N] (symmetric, NaN diagonal).
+    numpy.ndarray: inforate_data; information rate square series of every pair [N x N x (T-1)] (symmetric, NaN diagonal).
+    numpy.ndarray: inforate_time; time [T-1].
+"""
+
+import numpy as np
+
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.stats import entropy
+from info_geo._Profiling import stage
+from info_geo._BatchHistogram import batch_bin_indices, batch_histogram_func
+from info_geo._DensityEstimator import batch_density2d, check_density
+from info_geo._ExecConfig import shared_run, as_working
+from info_geo._Cache import cached_stage
+
+# information rate square of one pair from the bin index of both channels [(T-1) x 2 x W]; only the occupied cells are counted.
+def pair_inforate(index1, index2, bins, dt):
+    temp_rows = index1.shape[0]
+    temp_keys = (np.arange(temp_rows, dtype=np.int64)[:, None, None]*bins + index1)*bins + index2
+    temp_cells, temp_inverse = np.unique(temp_keys, return_inverse=True)
+    temp_inverse = temp_inverse.reshape(temp_keys.shape)
+
+    temp_before = np.bincount(temp_inverse[:, 0, :].ravel(), minlength=temp_cells.shape[0])
+    temp_after = np.bincount(temp_inverse[:, 1, :].ravel(), minlength=temp_cells.shape[0])
+    temp_diff = (np.sqrt(temp_after) - np.sqrt(temp_before))**2
+    temp_sum = np.bincount(temp_cells//(bins*bins), weights=temp_diff, minlength=temp_rows)
+
+    # PDF = counts/(W dx dy), so dx dy cancels: 4 sum((sqrt(c2) - sqrt(c1))**2)/(W dt**2)
+    return 4*temp_sum/(index1.shape[-1]*dt**2)
+
+# information rate square of one pair through batch_density2d() (ash, kde); windows [T x W], ranges [T-1]
+def pair_inforate_density(windows1, windows2, range1, range2, bins, dt, density):
+    temp_rows = windows1.shape[0] - 1
+    windows1 = np.stack((windows1[:-1], windows1[1:]), axis=1) # [(T-1) x 2 x W], BEFORE and AFTER
+    windows2 = np.stack((windows2[:-1], windows2[1:]), axis=1)
+    temp_pdf, temp_dx, temp_dy = batch_density2d(windows1.reshape(2*temp_rows, -1), windows2.reshape(2*temp_rows, -1), np.repeat(range1[0], 2), np.repeat(range1[1], 2), np.repeat(range2[0], 2), np.repeat(range2[1], 2), bins, density=density)
+    temp_pdf = temp_pdf.reshape((temp_rows, 2) + temp_pdf.shape[1:])
+    temp_diff = (temp_pdf[:, 1]**0.5) - (temp_pdf[:, 0]**0.5)
+
+    return 4*np.sum(temp_diff**2, axis=(1, 2), dtype=np.float64)*(temp_dx[::2]*temp_dy[::2])/dt**2
+
+# one row of the connectivity: channel a with every channel b > a
+def job_connectivity_row(a, index, windows, ranges, bins, dt, density):
+    if density=='histogram':
+        return [pair_inforate(index[a], index[b], bins, dt) for b in range(a + 1, index.shape[0])]
+    return [pair_inforate_density(windows[a], windows[b], ranges[:, a], ranges[:, b], bins, dt, density) for b in range(a + 1, windows.shape[0])]
+
+# one row of the connectivity written into out [P x (T-1)] at the pairs (a, b > a) (see shared_run())
+def job_connectivity_out(out, index, windows, ranges, dt, a, bins, density):
+    temp_n = ranges.shape[1]
+    temp_first = a*temp_n - a*(a + 1)//2
+    out[temp_first:temp_first + temp_n - 1 - a] = job_connectivity_row(a, index, windows, ranges, bins, dt, density)
+
+# bin index of the BEFORE and AFTER windows of every channel [N x (T-1) x 2 x W], in the range of the two windows;
+# the windows are stacked in blocks of time indices (about 2**22 samples), not for the whole series.
+def connectivity_bin_indices(windows, ranges, bins):
+    temp_n, temp_rows, temp_win = windows.shape[0], windows.shape[1] - 1, windows.shape[2]
+    temp_index = np.empty((temp_n, temp_rows, 2, temp_win), dtype=np.min_scalar_type(-bins))
+    temp_block = max(1, 2**22//(temp_n*2*temp_win))
+    for temp_start in range(0, temp_rows, temp_block):
+        temp_stop = min(temp_start + temp_block, temp_rows)
+        temp_windows = np.stack((windows[:, temp_start:temp_stop], windows[:, temp_start + 1:temp_stop + 1]), axis=2)
+        temp_indices = batch_bin_indices(temp_windows.reshape((-1,) + temp_windows.shape[2:]), ranges[0, :, temp_start:temp_stop].ravel(), ranges[1, :, temp_start:temp_stop].ravel(), bins)
+        temp_index[:, temp_start:temp_stop] = temp_indices.reshape(temp_windows.shape)
+
+    return temp_index
+
+# information rate square series of every pair [P x (T-1)], P=N(N-1)/2 in the order of numpy.triu_indices(N, k=1)
+def connectivity_inforate(data, time, win, sld, bins, density):
+    with stage('windowing', 'adj2d_inforate_connectivity', data.size):
+        temp_windows = sliding_window_view(data, window_shape=win, axis=-1)[:, ::sld, :]
+        temp_time = sliding_window_view(time, window_shape=win)[::sld, 0]
+
+    # range of every two consecutive windows of every channel [2 x N x (T-1)]
+    temp_min, temp_max = np.min(temp_windows, axis=-1), np.max(temp_windows, axis=-1)
+    temp_ranges = np.stack((np.minimum(temp_min[:, :-1], temp_min[:, 1:]), np.maximum(temp_max[:, :-1], temp_max[:, 1:])))
+    temp_dt = np.diff(temp_time)
+
+    temp_index = None
+    if density=='histogram':
+        with stage('histogram', 'adj2d_inforate_connectivity', 2*temp_ranges.shape[2]*temp_windows.shape[0]*win):
+            temp_index = connectivity_bin_indices(temp_windows, temp_ranges, bins)
+        temp_windows = None
+
+    with stage('dispatch', 'adj2d_inforate_connectivity', data.shape[0]*(data.shape[0] - 1)//2):
+        inforate_data = shared_run(job_connectivity_out, [(a, bins, density) for a in range(data.shape[0] - 1)], [temp_index, temp_windows, temp_ranges, temp_dt], (data.shape[0]*(data.shape[0] - 1)//2, temp_dt.shape[0]), data.dtype)
+
+    return inforate_data, temp_time[:-1]
+
+def adj2d_inforate_connectivity(data, time, win=10, sld=2, bins=50, entro_bins=10, base=2, norm=True, density='histogram'):
+    data = as_working(data)
+    time = np.asarray(time)
+
+    assert len(data.shape)==2, 'data: given signals should be in 2D numpy.array [N x L]; N=# channels, L=samples.'
+    assert data.shape[0] >= 2, 'data: given signals should have 2 or more channels [N >= 2]; N=# channels.'
+    assert len(time.shape)==1, 'time: given time data should be in 1D numpy.array with time index.'
+    assert data.shape[1] == time.shape[0], 'data and time should have the same number of samples.'
+    assert isinstance(win, int), 'win: window size of the sliding window. Integer is expected; default is 10.'
+    assert isinstance(sld, int), 'sld: sliding of the sliding window. Integer is expected; default is 2.'
+    assert data.shape[1] >= win + sld, 'data: given signals should have at least 2 windows.'
+    assert isinstance(bins, int), 'bins: bins size of the distribution for the information rate calculation. Integer is expected; default is 50.'
+    assert isinstance(entro_bins, int), 'entro_bins: bins size of the distribution for shannon entropy calculation. Integer is expected; default is 10.'
+    assert isinstance(base, (int, float)), 'base: base for the shannon entropy calculation. Integer or float is expected; default is 2.'
+    assert isinstance(norm, bool), 'norm: normalization of the shannon entropy. Boolean is expected; default is True.'
+    check_density(density)
+
+    # the information rate series is reused from the cache (if active) when only entro_bins, base or norm are changed.
+    temp_pairs, inforate_time = cached_stage('adj2d_inforate_connectivity', lambda: connectivity_inforate(data, time, win, sld, bins, density), [data, time], dict(win=win, sld=sld, bins=bins, density=density))
+
+    # Shannon entropy of every pair; the histogram of every pair within its own minimum and maximum (same as numpy.histogram())
+    with stage('reduction', 'adj2d_inforate_connectivity', temp_pairs.size):
+        temp_square = temp_pairs**0.5
+        temp_pdf, temp_dx = batch_histogram_func(temp_square, np.min(temp_square, axis=-1), np.max(temp_square, axis=-1), entro_bins)
+        temp_pmf = temp_pdf * temp_dx[:, None]
+
+        temp_entropy = entropy(temp_pmf, base=base, axis=-1)
+        if norm==True:
+            temp_entropy = temp_entropy/entropy(np.ones(entro_bins)/entro_bins, base=base)
+
+    # symmetric matrices of the pairs
+    temp_a, temp_b = np.triu_indices(data.shape[0], k=1)
+    inforate_entropy = np.full((data.shape[0], data.shape[0]), np.nan)
+    inforate_entropy[temp_a, temp_b] = temp_entropy
+    inforate_entropy[temp_b, temp_a] = temp_entropy
+
+    inforate_data = np.full((data.shape[0], data.shape[0], temp_pairs.shape[-1]), np.nan, dtype=temp_pairs.dtype)
+    inforate_data[temp_a, temp_b] = temp_pairs
+    inforate_data[temp_b, temp_a] = temp_pairs
+
+    #[information rate shannon entropy], [information rate data], [time]
+    return inforate_entropy, inforate_data, inforate_time
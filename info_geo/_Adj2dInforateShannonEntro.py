@@ -17,6 +17,7 @@ parameters:
     entro_bins: bins size of the distribution for shannon entropy calculation. Integer is expected; default is 10.
     base: base for the shannon entropy calculation. Integer or float is expected; default is 2.
     norm: normalization of the shannon entropy. Boolean is expected; default is True.
+    density: density estimator for the information rate calculation; histogram, ash, or kde. Default is histogram.
     
 return: 
     float: inforate_entropy; 2D information rate Shannon entropy.
@@ -28,13 +29,58 @@ import numpy as np
 import info_geo as ig
 
 from numpy.lib.stride_tricks import sliding_window_view
-from joblib import Parallel, delayed
 from scipy.stats import entropy
+from info_geo._Profiling import stage
+from info_geo._DensityEstimator import check_density
+from info_geo._ExecConfig import shared_run, task_blocks, as_working, jit_kernels
+from info_geo._Cache import cached_stage
+
+# information rate square of the time index start to stop, written into out [T-1] (see shared_run())
+def job_adj2d_inforate(out, y_sliding, x_sliding, time_sliding, start, stop, bins, density):
+    for t in range(start, stop):
+        out[t], _ = ig.adj2d_collect_inforate_square(y_sliding[None], x_sliding[None], time_sliding, i=t, bins_size=bins, density=density)
+
+# 2D information rate series of the adjacent windows (cached stage; see cache_stages())
+def adj2d_inforate(sig1, sig2, time, win, sld, bins, density):
+    int_win = win
+    int_sld = sld
 
-def adj2d_inforate_shannon_entro(sig1, sig2, time, win=10, sld=2, bins=50, entro_bins=10, base=2, norm=True):
-    sig1 = np.array(sig1)
-    sig2 = np.array(sig2)
-    time = np.array(time)
+    # contiguous signals (e.g. a column of a [L x N] array), so that the sliding windows span the signal only
+    sig1 = np.ascontiguousarray(sig1)
+    sig2 = np.ascontiguousarray(sig2)
+
+    with stage('windowing', 'adj2d_inforate_shannon_entro', 2*sig1.shape[0]):
+        time_sliding = sliding_window_view(time, window_shape=int_win)
+        time_sliding = time_sliding[::int_sld, :]
+
+        x_sliding = sliding_window_view(sig1, window_shape=int_win)
+        x_sliding = x_sliding[::int_sld, :]
+
+        y_sliding = sliding_window_view(sig2, window_shape=int_win)
+        y_sliding = y_sliding[::int_sld, :]
+
+    # compiled kernel (jit, see set_execution()): all the time index at once, no PDF array
+    temp_kernels = jit_kernels()
+    if (temp_kernels is not None) and (density=='histogram'):
+        with stage('fused', 'adj2d_inforate_shannon_entro', 2*(x_sliding.size + y_sliding.size)):
+            temp_ranges = []
+            for temp_sliding in (y_sliding, x_sliding):
+                temp_min, temp_max = np.min(temp_sliding, axis=-1), np.max(temp_sliding, axis=-1)
+                temp_ranges += temp_kernels.kernel_ranges(np.minimum(temp_min[:-1], temp_min[1:]), np.maximum(temp_max[:-1], temp_max[1:]), time_sliding.shape[0] - 1)
+            temp_sum = temp_kernels.inforate2d_sqrt_diff(y_sliding[None], x_sliding[None], *temp_ranges, bins, bins)
+        return (4*temp_sum/np.diff(time_sliding[:, 0])**2).astype(np.result_type(sig1.dtype, sig2.dtype), copy=False), time_sliding[:-1, 0]
+
+    # the sliding windows are shared with the workers once (as the signals they span); every job writes its
+    # time index into the information rate series.
+    with stage('dispatch', 'adj2d_inforate_shannon_entro', time_sliding.shape[0] - 1):
+        inforate_data = shared_run(job_adj2d_inforate, [temp_block + (bins, density) for temp_block in task_blocks(time_sliding.shape[0] - 1)], [y_sliding, x_sliding, time_sliding], (time_sliding.shape[0] - 1,), np.result_type(sig1.dtype, sig2.dtype, np.float32))
+
+    return inforate_data, time_sliding[:-1, 0].copy()
+
+def adj2d_inforate_shannon_entro(sig1, sig2, time, win=10, sld=2, bins=50, entro_bins=10, base=2, norm=True, density='histogram'):
+    sig1 = as_working(sig1)
+    sig2 = as_working(sig2)
+    time = np.asarray(time)
     
     sig1 = np.squeeze(sig1)
     sig2 = np.squeeze(sig2)
@@ -51,30 +97,11 @@ def adj2d_inforate_shannon_entro(sig1, sig2, time, win=10, sld=2, bins=50, entro
     assert isinstance(entro_bins, int), 'entro_bins: bins size of the distribution for shannon entropy calculation. Integer is expected; default is 10.'
     assert isinstance(base, (int, float)), 'base: base for the shannon entropy calculation. Integer or float is expected; default is 2.'
     assert isinstance(norm, bool), 'norm: normalization of the shannon entropy. Boolean is expected; default is True.'
+    check_density(density)
 
-    int_win = win
-    int_sld = sld
-
-    time_sliding = sliding_window_view(time, window_shape=int_win)
-    time_sliding = time_sliding[::int_sld, :]
-
-    x_sliding = sliding_window_view(sig1, window_shape=int_win)
-    x_sliding = x_sliding[::int_sld, :]
-
-    y_sliding = sliding_window_view(sig2, window_shape=int_win)
-    y_sliding = y_sliding[::int_sld, :]
-
-    inforate_data, inforate_time = zip(*Parallel(n_jobs=-1)(delayed(ig.adj2d_collect_inforate_square)(
-            np.expand_dims(y_sliding, axis=0), 
-            np.expand_dims(x_sliding, axis=0), 
-            time_sliding, 
-            i=t, 
-            bins_size=bins
-        ) for t in range(time_sliding.shape[0] - 1)
-    ))
-    inforate_data = np.array(inforate_data)
-    inforate_time = np.array(inforate_time)
-
+    # the information rate series depends on the signals, win, sld, bins and density only;
+    # it is reused from the cache (if active) when only entro_bins, base or norm are changed.
+    inforate_data, inforate_time = cached_stage('adj2d_inforate', lambda: adj2d_inforate(sig1, sig2, time, win, sld, bins, density), [sig1, sig2, time], dict(win=win, sld=sld, bins=bins, density=density))
 
     temp_inforate_pdf, temp_inforate_range = np.histogram(inforate_data**0.5, bins=entro_bins, density=True, )
     temp_inforate_range = (temp_inforate_range[1:] + temp_inforate_range[:-1])/2
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:27:17 2026
+
+@author: agent
+
+The [information rate] series of adj_collect_inforate_square() in one call. The PDF is sampled
+at the ensemble of regions (NxW of data) and the range of every two consecutive distributions
+is taken from their minimum and maximum, same as adj_collect_inforate_square(). Instead of one
+call per time index, the ranges of all the consecutive windows are computed at once and all the
+windows are binned in one pass.
+
+Return information rate square series for 1D distribution
+
+parameters:
+    data: array of data in 3 dimensions; NxTxW, N=signals #, T=time index, W=window of data.
+    time: array of time data with 2 dimensions; TxW, T=time index, W=window of data.
+    bins_size: bins size of the distribution estimation; it should be integer, rice or sturges. Default is 50.
+    density: density estimator of the distribution; histogram, ash (averaged shifted histogram), or kde (binned FFT-KDE). Default is histogram.
+
+return:
+    numpy.ndarray: information rate square [T-1]
+    numpy.ndarray: time [T-1]
+
+"""
+
+import numpy as np
+
+from info_geo._DensityEstimator import batch_density, density_bins, check_density
+from info_geo._Profiling import stage
+from info_geo._ExecConfig import as_working, jit_kernels
+
+def adj_collect_inforate_series(data, time, bins_size=50, density='histogram'):
+    data = as_working(data)
+    time = np.asarray(time)
+
+    assert len(data.shape) == 3, 'data: given data should be in 3 dimensional array of NxTxW; N=signals #, T=time index, W=window of data.'
+    assert len(time.shape) == 2, 'time: given data should be in 2 dimension array of TxW; T=time index, W=window of data.'
+    assert data.shape[1] == time.shape[0], 'BOTH data and time should have same length of time.'
+    assert data.shape[1] >= 2, 'data: given data should have at least 2 time index to compute the information rate.'
+    assert (bins_size=='rice') or (bins_size=='sturges') or (type(bins_size)==int), 'bins_size: bin size for the histogram. it can estimated by rice, sturges, or specify to certain number.'
+    check_density(density)
+
+    temp_bins = density_bins(bins_size, data.shape[0] * data.shape[-1])
+
+    # window index at the first axis; TxNxW (view, no copy)
+    temp_data_interval = np.moveaxis(data, 1, 0)
+
+    # getting the range between every two consecutive distribution (running min/max)
+    temp_min = np.min(temp_data_interval, axis=(1, 2))
+    temp_max = np.max(temp_data_interval, axis=(1, 2))
+    temp_range_lo = np.minimum(temp_min[:-1], temp_min[1:])
+    temp_range_hi = np.maximum(temp_max[:-1], temp_max[1:])
+
+    # compiled kernel (jit, see set_execution()): from the windows to the information rate, no PDF array
+    temp_kernels = jit_kernels()
+    if (temp_kernels is not None) and (density=='histogram'):
+        with stage('fused', 'adj_collect_inforate_series', 2*temp_data_interval[1:].size):
+            temp_lo, temp_hi = temp_kernels.kernel_ranges(temp_range_lo, temp_range_hi, data.shape[1] - 1)
+            temp_sum = temp_kernels.inforate_sqrt_diff(data, temp_lo, temp_hi, temp_bins)
+        temp_dt = np.diff(time[:, 0])
+        return (4 * temp_sum / (temp_dt**2)).astype(data.dtype, copy=False), time[:-1, 0]
+
+    # estimating the distribution BEFORE and AFTER for every consecutive pair
+    with stage('histogram', 'adj_collect_inforate_series', 2*temp_data_interval[1:].size):
+        temp_pdf1, temp_dx = batch_density(temp_data_interval[:-1], temp_range_lo, temp_range_hi, temp_bins, density=density)
+        temp_pdf2, _ = batch_density(temp_data_interval[1:], temp_range_lo, temp_range_hi, temp_bins, density=density)
+
+    # information rate square calculation
+    with stage('reduction', 'adj_collect_inforate_series', 2*temp_pdf1.size):
+        temp_dt = np.diff(time[:, 0])
+        temp_diff_pdf = (temp_pdf2**0.5) - (temp_pdf1**0.5)
+
+        temp_inforate_square = 4 * np.sum(temp_diff_pdf**(2), axis=-1, dtype=np.float64) * (temp_dx/(temp_dt**2))
+        temp_inforate_square = temp_inforate_square.astype(temp_pdf1.dtype, copy=False)
+
+    return temp_inforate_square, time[:-1, 0]
@@ -16,6 +16,7 @@ parameters:
     time: array of time data with 2 dimensions; TxW, T=time index, W=window of data. 
     i : time index for data1, data2, and time; it should be integer. 
     bins_size: bins size of the distribution estimation; it should be integer. Default is 50.
+    density: density estimator of the distribution; histogram, ash (averaged shifted histogram), or kde (binned FFT-KDE). Default is histogram.
     
 return: 
     float: information rate square
@@ -24,9 +25,12 @@ return:
 """
 import numpy as np
 
-def adj_collect_inforate_square(data, time, i, bins_size=50):
-    data = np.array(data)
-    time = np.array(time)
+from info_geo._DensityEstimator import batch_density, density_bins, check_density
+from info_geo._ExecConfig import as_working
+
+def adj_collect_inforate_square(data, time, i, bins_size=50, density='histogram'):
+    data = as_working(data)
+    time = np.asarray(time)
     
     assert isinstance(data, (np.ndarray)), 'data: given data should be in numpy.array.'
     assert len(data.shape) == 3, 'data: given data should be in 3 dimensional array of NxTxW; N=signals #, T=time index, W=window of data.'
@@ -35,42 +39,28 @@ def adj_collect_inforate_square(data, time, i, bins_size=50):
     assert data.shape[1] == time.shape[0], 'BOTH data and time should have same length of time.'
     assert (bins_size=='rice') or (bins_size=='sturges') or (type(bins_size)==int), 'bins_size: bin size for the histogram. it can estimated by rice, sturges, or specify to certain number.'
     assert isinstance(i, (int)), 'i: index for the data and time; it should be integer.'
+    check_density(density)
 
     temp_data_interval = data
     temp_time_interval = time
 
-    if type(bins_size)==int:
-        temp_bins = bins_size
-    elif bins_size=='rice':
-        temp_bins = int(np.ceil(2 * (data.shape[0] * data.shape[-1])**(1/3)))
-    elif bins_size=='sturges':
-        temp_bins = int(np.ceil(1 + np.log2(data.shape[0] * data.shape[-1])))
+    temp_bins = density_bins(bins_size, data.shape[0] * data.shape[-1])
     
 
     # getting the range between two consecutive distribution
     temp_range = (min(np.min(temp_data_interval[:, i, :]), np.min(temp_data_interval[:, i+1, :])), max(np.max(temp_data_interval[:, i, :]), np.max(temp_data_interval[:, i+1, :])))
 
-    # estimating the distribution BEFORE
-    temp_pdf1, temp_edges1 = np.histogram(temp_data_interval[:, i, :], range=(np.min(temp_range), np.max(temp_range)), bins=temp_bins, density=True)
-    temp_dist_range1 = 0.5*(temp_edges1[1:] + temp_edges1[:-1]) 
-    #temp_pmf1 = temp_pdf1 * np.diff(temp_dist_range1)[0] # mass function
-
-    # estimating the distribution AFTER
-    temp_pdf2, temp_edges2 = np.histogram(temp_data_interval[:, i+1, :], range=(np.min(temp_range), np.max(temp_range)), bins=temp_bins, density=True)
-    temp_dist_range2 = 0.5*(temp_edges2[1:] + temp_edges2[:-1])
-    #temp_pmf2 = temp_pdf2 * np.diff(temp_dist_range2)[0] # mass function
-
-    # checking the range between two consecutive distribution; both should be the same. 
-    if not np.array_equal(temp_dist_range1, temp_dist_range2): 
-        print('consecutive distribution range is incorrect!')
-        return None
+    # estimating the distribution BEFORE and AFTER; both share the same edges of the range.
+    temp_pdf, temp_dx = batch_density(np.moveaxis(temp_data_interval[:, i:i+2, :], 1, 0), np.min(temp_range), np.max(temp_range), temp_bins, density=density)
+    temp_pdf1 = temp_pdf[0]
+    temp_pdf2 = temp_pdf[1]
     
     # information rate square calculation
     temp_dt = temp_time_interval[i+1, 0] - temp_time_interval[i, 0]
-    temp_dx = np.diff(temp_dist_range1)[0]
+    temp_dx = temp_dx[0]
     temp_diff_pdf = (temp_pdf2**0.5) - (temp_pdf1**0.5)
 
     temp_inforate_square = ((temp_diff_pdf)/(temp_dt))**(2) * (temp_dx)
-    temp_inforate_square = 4*np.sum(temp_inforate_square)
+    temp_inforate_square = temp_pdf.dtype.type(4*np.sum(temp_inforate_square, dtype=np.float64))
 
     return temp_inforate_square, temp_time_interval[i, 0]
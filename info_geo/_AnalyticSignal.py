@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:52:50 2026
+
+@author: agent
+
+Blockwise analytic signal (hilbert transform) and unwrapped phase of the long signals. The signals of all
+the channels are transformed together (batched along the last axis).
+
+Without block_size, the whole signal is transformed at once, same as scipy.signal.hilbert(). With block_size,
+the signal is transformed block by block (overlap-save): every block of block_size samples is transformed
+with margin samples of the signal on both sides, and only the block is kept. The FFT size of the block is
+padded to the fast size (scipy.fft.next_fast_len), so the time of every block is predictable and the complex
+temporary arrays are [N x (block_size + 2 margin)] instead of [N x L]. The error of the block is at its
+border; it decreases with the margin (about 1/margin for the broadband signal, faster for the narrowband
+signal). The unwrapped phase is continuous from block to block (the phase jump between two blocks is
+unwrapped as well). Where the amplitude of the analytic signal is near zero the phase is ill-defined, so a
+border error there can give a different 2pi jump and the unwrapped phase can differ from the whole transform
+by a multiple of 2pi after it; cos() and sin() of the phase (e.g. phase_lock_matrix()) are not affected.
+
+dtype numpy.float32 transforms in complex64 (half of the memory). The unwrapped phase grows with the time
+(2 pi f t), so in float32 its absolute error is about 6e-8 x |phase|; float64 is recommended for the long
+unwrapped phase. The dtype of analytic_signal() follows the dtype of set_execution() by default, while
+unwrapped_phase() stays in float64 unless it is given.
+
+parameters:
+    data: signal in 1 dimension [L] or 2 dimensions [N x L]; N=# channels, L=samples.
+    block_size: number of samples of every block. Integer or None (whole signal) is expected; default is None.
+    margin: samples on both sides of the block. Integer or None (block_size//2) is expected; default is None.
+    dtype: numpy.float64 (complex128), numpy.float32 (complex64), or None (dtype of set_execution()).
+           Default is None for analytic_signal() and numpy.float64 for unwrapped_phase().
+
+return:
+    analytic_signal(): numpy.ndarray: analytic signal (complex) with the shape of data.
+    unwrapped_phase(): numpy.ndarray: unwrapped phase in radian (dtype) with the shape of data.
+
+"""
+
+import numpy as np
+
+from info_geo._ExecConfig import working_dtype
+
+# analytic signal of the block along the last axis; FFT size is n_fft (>= samples), zero-padded.
+def analytic_block(data, n_fft):
+    from scipy import fft as sp_fft
+
+    temp_spec = sp_fft.fft(data, n_fft, axis=-1)
+    if n_fft % 2 == 0:
+        temp_spec[..., 1:n_fft//2] *= 2.0
+        temp_spec[..., n_fft//2 + 1:] = 0.0
+    else:
+        temp_spec[..., 1:(n_fft + 1)//2] *= 2.0
+        temp_spec[..., (n_fft + 1)//2:] = 0.0
+
+    return sp_fft.ifft(temp_spec, axis=-1)[..., :data.shape[-1]]
+
+# blocks of the signal: (first sample, end sample, first sample with margin, end sample with margin)
+def signal_blocks(n_samples, block_size, margin):
+    for temp_start in range(0, n_samples, block_size):
+        temp_stop = min(temp_start + block_size, n_samples)
+        yield temp_start, temp_stop, max(0, temp_start - margin), min(n_samples, temp_stop + margin)
+
+# analytic signal block by block: (first sample, end sample, analytic signal of the block [... x (end - first)]).
+# The samples of data are read block by block (e.g. numpy.memmap); one block (block_size None or >= L) is the whole transform.
+def analytic_blocks(data, block_size=None, margin=None, dtype=np.float64):
+    if (block_size is None) or (block_size >= data.shape[-1]):
+        yield 0, data.shape[-1], analytic_block(np.asarray(data, dtype=dtype), data.shape[-1])
+        return
+
+    from scipy.fft import next_fast_len
+
+    temp_margin = block_size//2 if margin is None else margin
+    for temp_start, temp_stop, temp_lo, temp_hi in signal_blocks(data.shape[-1], block_size, temp_margin):
+        temp_block = analytic_block(np.asarray(data[..., temp_lo:temp_hi], dtype=dtype), next_fast_len(temp_hi - temp_lo))
+        yield temp_start, temp_stop, temp_block[..., temp_start - temp_lo:temp_stop - temp_lo]
+
+def check_analytic(data, block_size, margin, dtype):
+    assert data.ndim in (1, 2), 'data: given signal should be in 1 dimension [L] or 2 dimensions [N x L]; N=# channels, L=samples.'
+    assert (block_size is None) or (isinstance(block_size, int) and (block_size > 0)), 'block_size: number of samples of every block. Integer or None is expected; default is None.'
+    assert (margin is None) or (isinstance(margin, int) and (margin >= 0)), 'margin: samples on both sides of the block. Integer or None is expected; default is None.'
+    assert (dtype is None) or (np.dtype(dtype) in (np.float32, np.float64)), 'dtype: numpy.float64, numpy.float32, or None is expected.'
+
+def analytic_signal(data, block_size=None, margin=None, dtype=None):
+    data = np.asarray(data)
+    check_analytic(data, block_size, margin, dtype)
+    dtype = working_dtype(dtype)
+
+    if (block_size is None) or (block_size >= data.shape[-1]):
+        return analytic_block(data.astype(dtype, copy=False), data.shape[-1])
+
+    temp_analytic = np.empty(data.shape, dtype=np.result_type(dtype, np.complex64))
+    for temp_start, temp_stop, temp_block in analytic_blocks(data, block_size, margin, dtype):
+        temp_analytic[..., temp_start:temp_stop] = temp_block
+
+    return temp_analytic
+
+def unwrapped_phase(data, block_size=None, margin=None, dtype=np.float64):
+    data = np.asarray(data)
+    check_analytic(data, block_size, margin, dtype)
+    dtype = working_dtype(dtype)
+
+    if (block_size is None) or (block_size >= data.shape[-1]):
+        temp_phase = np.unwrap(np.angle(analytic_block(data.astype(dtype, copy=False), data.shape[-1]), deg=False), axis=-1)
+        return temp_phase.astype(dtype, copy=False)
+
+    temp_phase = np.empty(data.shape, dtype=dtype)
+    temp_last = None # unwrapped phase of the last sample of the previous block (float64)
+    for temp_start, temp_stop, temp_block in analytic_blocks(data, block_size, margin, dtype):
+        temp_angle = np.angle(temp_block, deg=False).astype(np.float64)
+
+        # unwrapped together with the last phase of the previous block, so that the phase is continuous
+        if temp_last is not None:
+            temp_angle = np.unwrap(np.concatenate((temp_last[..., None], temp_angle), axis=-1), axis=-1)[..., 1:]
+        else:
+            temp_angle = np.unwrap(temp_angle, axis=-1)
+
+        temp_phase[..., temp_start:temp_stop] = temp_angle
+        temp_last = temp_angle[..., -1]
+
+    return temp_phase
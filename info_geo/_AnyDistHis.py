@@ -14,6 +14,9 @@ parameters:
     int_bins: histogram bin size. It can be integer or rice or sturges; default is rice.
     int_dist: interested distance should be in string. Any option from sklearn; default is [chebyshev]. 
     int_range: range of the interested axis; default is [0.001 to 2.001]. Tuple or list is needed.
+    block_size: tile size of the distance matrix for the blocked mode. Integer or None is expected; default is None. 
+                If integer, the distance matrix is computed tile by tile across the cores and accumulated into the 
+                histogram counts, so the peak memory is set by the block size instead of N^2. 
     
 return: 
     numpy.ndarray: 1D array of amplitude of histogram. 
@@ -23,42 +26,56 @@ return:
 
 """
 
+import warnings
 import numpy as np
 
 from sklearn.metrics import pairwise_distances
+from info_geo._BlockDist import block_dist_counts
 
 
-def any_dist_his(data, int_bins='rice', int_dist='chebyshev', int_range=(0.001, 2.001)):
-    data = np.array(data)
+def any_dist_his(data, int_bins='rice', int_dist='chebyshev', int_range=(0.001, 2.001), block_size=None):
+    data = np.asarray(data)
     assert len(data.shape) == 2, 'data: given data should have 2 dimensions numpy array of [N x W], N=eigenvector dimension, W=window of data.'
     assert (type(int_bins)==int) or (int_bins=='rice') or (int_bins=='sturges'), 'bins: histogram bin size. It can be integer or rice or sturges; default is rice.'
     assert isinstance(int_dist, (str)), 'int_dist: interested distance should be in string. Any option from sklearn; default is [chebyshev]. '
     assert isinstance(int_range, (tuple, list)), 'int_range: range of the interested axis; default is [0.001 to 2.001]. Tuple or list is needed.'
     assert len(int_range) == 2, 'int_range: ONLY 2 values(min and max of axis) are needed.'
+    assert (block_size is None) or (isinstance(block_size, int) and (block_size > 0)), 'block_size: tile size of the distance matrix. Integer or None is expected; default is None.'
 
     temp_vec = data
-
-    #calculate the [any distances] of the [vectors]
-    temp_matrix = pairwise_distances(temp_vec, metric=int_dist)
-    temp_loc = np.triu_indices(temp_matrix.shape[0], k=1)
-    temp_ans_matrix = temp_matrix[temp_loc]
+    temp_num = (temp_vec.shape[0] * (temp_vec.shape[0] - 1))//2 #number of distances in the upper triangle
 
     if int_bins=='rice':
-        temp_bin = int(np.ceil(2*(temp_ans_matrix.shape[0])**(1/3))) #rice rule bin size
+        temp_bin = int(np.ceil(2*(temp_num)**(1/3))) #rice rule bin size
     elif int_bins=='sturges': 
-        temp_bin = int(1 + np.log2(temp_ans_matrix.shape[0])) #sturges rule bin size
+        temp_bin = int(1 + np.log2(temp_num)) #sturges rule bin size
     elif type(int_bins)==int:
         temp_bin = int_bins
-    ###############################################################################################
-    temp_his_amp, temp_his_axs = np.histogram(temp_ans_matrix, bins=temp_bin, density=True, range=[np.min(int_range), np.max(int_range)])
-    temp_his_axs = 0.5 * (temp_his_axs[1:] + temp_his_axs[:-1])
-    ###############################################################################################
+
+    if block_size is None:
+        #calculate the [any distances] of the [vectors]
+        temp_matrix = pairwise_distances(temp_vec, metric=int_dist)
+        temp_loc = np.triu_indices(temp_matrix.shape[0], k=1)
+        temp_ans_matrix = temp_matrix[temp_loc]
+        temp_min, temp_max = np.min(temp_ans_matrix), np.max(temp_ans_matrix)
+
+        ###############################################################################################
+        temp_his_amp, temp_his_axs = np.histogram(temp_ans_matrix, bins=temp_bin, density=True, range=[np.min(int_range), np.max(int_range)])
+        temp_his_axs = 0.5 * (temp_his_axs[1:] + temp_his_axs[:-1])
+        ###############################################################################################
+    else:
+        #accumulate the histogram counts of the [any distances] tile by tile
+        temp_edges = np.linspace(np.min(int_range), np.max(int_range), temp_bin + 1)
+        temp_counts, temp_min, temp_max, _, _, _ = block_dist_counts(temp_vec, int_dist=int_dist, int_edges=temp_edges, int_mode='histogram', block_size=block_size)
+
+        temp_his_amp = temp_counts/np.sum(temp_counts)/np.diff(temp_edges)
+        temp_his_axs = 0.5 * (temp_edges[1:] + temp_edges[:-1])
     
     
     #check the PDF --> sum to ONE. 
     check_pdf = np.sum(temp_his_amp) * np.diff(temp_his_axs)[0]
     if (check_pdf < 0.9) or (check_pdf > 1.1): 
-        print(f'PDF not normalized within 0.9 to 1.1: {check_pdf}')
+        warnings.warn(f'PDF not normalized within 0.9 to 1.1: {check_pdf}', RuntimeWarning)
     
     #return [histogram amplitude], [histogram range], [minimum distance], [max distance]
-    return temp_his_amp, temp_his_axs, np.min(temp_ans_matrix), np.max(temp_ans_matrix)
+    return temp_his_amp, temp_his_axs, temp_min, temp_max
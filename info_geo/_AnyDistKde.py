@@ -14,6 +14,14 @@ parameters:
     int_bins: histogram bin size. It can be integer or rice or sturges; default is rice.
     int_dist: interested distance should be in string. Any option from sklearn; default is [chebyshev]. 
     int_range: range of the interested axis; default is [0.001 to 2.001]. Tuple or list is needed.
+    int_kernel: kernel used for the KDE estimation; default is [biweight].
+    int_bw: bandwidth used for the KDE estimation; default is [scott].
+    add_noise: adding the noise to ensure the KDE works. Boolean is expected; default is False.
+    block_size: tile size of the distance matrix for the blocked mode. Integer or None is expected; default is None. 
+                If integer, the distance matrix is computed tile by tile across the cores and linear binned onto the 
+                PDF axis (same binning as FFTKDE), so the peak memory is set by the block size instead of N^2. 
+                In the blocked mode, int_bw can be a number, scott or silverman; the standard deviation is merged from the 
+                tiles without cancellation (see block_dist_counts()) and the interquartile range is taken from the binned counts (within one step of the PDF axis).
     
 return: 
     numpy.ndarray: 1D array of amplitude of histogram. 
@@ -26,10 +34,43 @@ return:
 import numpy as np
 
 from sklearn.metrics import pairwise_distances
+from scipy.signal import convolve
 from KDEpy import FFTKDE
+from info_geo._BlockDist import block_dist_counts
+from info_geo._DensityEstimator import kde_kernel
 
-def any_dist_kde(data, int_dist='chebyshev', int_range=(0.001, 2.005), int_bins=1000, int_kernel='biweight', int_bw='scott', add_noise=False):
-    data = np.array(data)
+# bandwidth of scott or silverman rule from the number, sum of the squared deviations and the binned counts of the data
+def binned_kde_bw(int_bw, temp_num, temp_deviation, temp_counts, temp_axs):
+    if isinstance(int_bw, (int, float)):
+        return int_bw
+
+    temp_sigma = np.sqrt(temp_deviation/(temp_num - 1))
+    temp_cdf = np.cumsum(temp_counts)/np.sum(temp_counts)
+    temp_iqr = (np.interp(0.75, temp_cdf, temp_axs) - np.interp(0.25, temp_cdf, temp_axs))/1.3489795003921634 # scipy.norm.ppf(.75) - scipy.norm.ppf(.25)
+    temp_sigma = min(temp_sigma, temp_iqr)
+
+    if int_bw.lower()=='scott':
+        return temp_sigma * np.power(temp_num, -1/5)
+    elif int_bw.lower()=='silverman':
+        return temp_sigma * (temp_num * 3/4)**(-1/5)
+
+# KDE of the linear binned counts on the equidistant grid; same kernel weights and convolution as FFTKDE.evaluate()
+def binned_kde_func(temp_counts, temp_axs, int_kernel='biweight', int_bw=0.1):
+    temp_kernel = kde_kernel(int_kernel)
+    temp_dx = (temp_axs[-1] - temp_axs[0])/(temp_axs.shape[0] - 1)
+
+    if temp_kernel.finite_support:
+        temp_real_bw = temp_kernel.support * int_bw
+    else:
+        temp_real_bw = temp_kernel.practical_support(int_bw)
+    temp_l = np.minimum(np.floor(temp_real_bw/temp_dx), temp_axs.shape[0])
+    temp_kernel_grid = np.linspace(-temp_dx*temp_l, temp_dx*temp_l, int(temp_l*2 + 1))
+    temp_kernel_weights = temp_kernel(temp_kernel_grid.reshape(-1, 1), bw=int_bw, norm=2)
+
+    return convolve(temp_counts/np.sum(temp_counts), temp_kernel_weights, mode='same')
+
+def any_dist_kde(data, int_dist='chebyshev', int_range=(0.001, 2.005), int_bins=1000, int_kernel='biweight', int_bw='scott', add_noise=False, block_size=None):
+    data = np.asarray(data)
     assert len(data.shape) == 2, 'data: given data should have 2 dimensions numpy array of [N x W], N=eigenvector dimension, W=window of data.'
     assert isinstance(int_dist, (str)), 'int_dist: interested distance should be in string. Any option from sklearn; default is [chebyshev].'
     assert isinstance(int_range, (list, tuple)), 'int_range: range of the interested axis; default is [0.001 to 2.005]. Tuple or list is needed.'
@@ -38,21 +79,34 @@ def any_dist_kde(data, int_dist='chebyshev', int_range=(0.001, 2.005), int_bins=
     assert isinstance(int_kernel, (str)), 'int_kernel: kernel used for the KDE estimation; default is [biweight].'
     assert isinstance(int_bw, (str, int, float)), 'int_bw: bandwidth used for the KDE estimation; default is [scott].'
     assert isinstance(add_noise, (bool)), 'add_noise: adding the noise to ensure the KDE works. Boolean is expected; default is False.'
+    assert (block_size is None) or (isinstance(block_size, int) and (block_size > 0)), 'block_size: tile size of the distance matrix. Integer or None is expected; default is None.'
+    assert (block_size is None) or isinstance(int_bw, (int, float)) or (int_bw.lower() in ('scott', 'silverman')), 'int_bw: bandwidth for the blocked mode should be a number, scott, or silverman.'
     
     temp_vec = data
 
-    #calculate the [chebyshev distances] of the [vectors]
-    temp_matrix = pairwise_distances(temp_vec, metric=int_dist)
-    temp_loc = np.triu_indices(temp_matrix.shape[0], k=1)
-    temp_ans_matrix = temp_matrix[temp_loc]
-    if add_noise:
-        temp_ans_matrix += np.random.normal(0, 1e-6, temp_ans_matrix.shape[0])
-
-    #estimate the PDF through KDE 
     temp_axs_lw = np.min(int_range) #lower limit of the PDF axis
     temp_axs_up = np.max(int_range) #upper limit of the PDF axis
     temp_cheby_axs = np.linspace(temp_axs_lw, temp_axs_up, int_bins) #range of the axis for PDF
-    temp_cheby_amp = FFTKDE(kernel=int_kernel, bw=int_bw).fit(temp_ans_matrix).evaluate(temp_cheby_axs) #KDE estimation.
+
+    if block_size is None:
+        #calculate the [chebyshev distances] of the [vectors]
+        temp_matrix = pairwise_distances(temp_vec, metric=int_dist)
+        temp_loc = np.triu_indices(temp_matrix.shape[0], k=1)
+        temp_ans_matrix = temp_matrix[temp_loc]
+        if add_noise:
+            temp_ans_matrix += np.random.normal(0, 1e-6, temp_ans_matrix.shape[0])
+        temp_min, temp_max = np.min(temp_ans_matrix), np.max(temp_ans_matrix)
+
+        #estimate the PDF through KDE 
+        temp_cheby_amp = FFTKDE(kernel=int_kernel, bw=int_bw).fit(temp_ans_matrix).evaluate(temp_cheby_axs) #KDE estimation.
+    else:
+        #accumulate the linear binned counts of the [chebyshev distances] tile by tile
+        temp_counts, temp_min, temp_max, temp_num, _, temp_deviation = block_dist_counts(temp_vec, int_dist=int_dist, int_edges=temp_cheby_axs, int_mode='linear', block_size=block_size, add_noise=add_noise)
+        assert (temp_axs_lw < temp_min) and (temp_axs_up > temp_max), 'int_range: every distance must be inside of the range of the PDF axis.'
+
+        #estimate the PDF through KDE of the binned counts
+        temp_bw = binned_kde_bw(int_bw, temp_num, temp_deviation, temp_counts, temp_cheby_axs)
+        temp_cheby_amp = binned_kde_func(temp_counts, temp_cheby_axs, int_kernel=int_kernel, int_bw=temp_bw) #KDE estimation.
 
     # return [pdf amplitude], [pdf range], [minimum matrix value], [maximum matrix value]
-    return temp_cheby_amp, temp_cheby_axs, np.min(temp_ans_matrix), np.max(temp_ans_matrix)
+    return temp_cheby_amp, temp_cheby_axs, temp_min, temp_max
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:27:17 2026
+
+@author: agent
+
+Batched histogram kernel for the [information rate]. All the windows are binned in one pass
+instead of calling numpy.histogram() (or numpy.histogram2d()) window by window. Every window
+can have its own range (adjacent range) or share the same range (fix range). The bin index follows numpy.histogram(),
+i.e. the last bin includes the right edge and the samples outside the range are dropped.
+
+parameters:
+    data: array of data with the window index at the first axis; Tx..., T=window index.
+    range_lo: lower limit of the range; float or 1D numpy.array with T elements.
+    range_hi: upper limit of the range; float or 1D numpy.array with T elements.
+    int_bins: bins size of the distribution estimation; it should be integer.
+
+The bin index is computed in float64 for any data; the PDF has the floating point type of the data
+(float32 data gives float32 PDF; see the dtype option of set_execution()).
+
+return:
+    numpy.ndarray: PDF of every window [T x bins], or [T x binsx x binsy] for 2D.
+    numpy.ndarray: bin width of every window [T] (for each of the axis for 2D).
+
+"""
+
+import numpy as np
+
+# edges of every window; same as numpy.linspace() for each of the window
+def batch_edges(range_lo, range_hi, int_bins):
+    range_lo = np.atleast_1d(np.asarray(range_lo, dtype=float))
+    range_hi = np.atleast_1d(np.asarray(range_hi, dtype=float))
+
+    temp_step = (range_hi - range_lo)/int_bins
+    temp_edges = np.arange(int_bins + 1) * temp_step[:, None] + range_lo[:, None]
+    temp_edges[:, -1] = range_hi
+
+    return temp_edges
+
+# numpy.histogram() widens an empty range by 0.5 on both sides; the same is done here.
+def batch_range(range_lo, range_hi):
+    range_lo = np.array(range_lo, dtype=float, ndmin=1)
+    range_hi = np.array(range_hi, dtype=float, ndmin=1)
+    assert np.all(range_lo <= range_hi), 'range: max must be larger than min in range parameter.'
+
+    temp_loc = range_lo == range_hi
+    range_lo[temp_loc] -= 0.5
+    range_hi[temp_loc] += 0.5
+
+    return range_lo, range_hi
+
+# bin index of every sample; -1 is given to the samples outside the range
+def batch_bin_indices(data, range_lo, range_hi, int_bins):
+    assert isinstance(int_bins, (int, np.integer)), 'int_bins: bins size of the distribution should be integer.'
+
+    range_lo, range_hi = batch_range(range_lo, range_hi)
+    temp_edges = batch_edges(range_lo, range_hi, int_bins)
+    if temp_edges.shape[0] == 1:
+        temp_edges = np.broadcast_to(temp_edges, (data.shape[0], int_bins + 1))
+
+    # reshape the range so that it broadcasts on the window index (first axis)
+    temp_shape = (-1,) + (1,)*(data.ndim - 1)
+    temp_lo = range_lo.reshape(temp_shape)
+    temp_hi = range_hi.reshape(temp_shape)
+
+    temp_keep = (data >= temp_lo) & (data <= temp_hi)
+    temp_indices = ((data - temp_lo)/(temp_hi - temp_lo)) * int_bins
+    temp_indices = np.where(temp_keep, temp_indices, 0).astype(np.intp)
+    temp_indices[temp_indices == int_bins] -= 1
+
+    # correct the index within ~1 ULP of the bin edges (same as numpy.histogram()).
+    temp_rows = np.arange(data.shape[0]).reshape(temp_shape)
+    temp_indices -= data < temp_edges[temp_rows, temp_indices]
+    temp_indices += (data >= temp_edges[temp_rows, temp_indices + 1]) & (temp_indices != int_bins - 1)
+    temp_indices[~temp_keep] = -1
+
+    return temp_indices
+
+# floating point type of the PDF; same as the data (float32 or float64), float64 for the integer data
+def pdf_dtype(*data):
+    return np.result_type(*(temp_data.dtype for temp_data in data), np.float32)
+
+# bin counts of every window from the bin index; -1 index is not counted.
+def batch_bin_counts(indices, int_bins):
+    temp_rows = indices.shape[0]
+    temp_flat = indices.reshape(temp_rows, -1)
+    temp_flat = np.where(temp_flat < 0, temp_rows*int_bins, temp_flat + (np.arange(temp_rows)*int_bins)[:, None])
+    temp_counts = np.bincount(temp_flat.ravel(), minlength=temp_rows*int_bins + 1)[:-1]
+
+    return temp_counts.reshape(temp_rows, int_bins)
+
+# PDF estimation of all the windows through histogram
+def batch_histogram_func(data, range_lo, range_hi, int_bins):
+    data = np.asarray(data)
+    assert data.ndim >= 2, 'data: given data should have at least 2 dimensions; Tx..., T=window index.'
+
+    temp_indices = batch_bin_indices(data, range_lo, range_hi, int_bins)
+    temp_counts = batch_bin_counts(temp_indices, int_bins)
+
+    range_lo, range_hi = batch_range(range_lo, range_hi)
+    temp_dx = np.broadcast_to((range_hi - range_lo)/int_bins, (data.shape[0],))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        temp_pdf = (temp_counts/np.sum(temp_counts, axis=-1, keepdims=True)/temp_dx[:, None]).astype(pdf_dtype(data), copy=False)
+
+    return temp_pdf, temp_dx
+
+# PDF estimation of all the windows through 2D histogram; data1 and data2 are paired sample by sample.
+def batch_histogram2d_func(data1, data2, range1_lo, range1_hi, range2_lo, range2_hi, int_bins):
+    data1 = np.asarray(data1)
+    data2 = np.asarray(data2)
+    assert data1.shape == data2.shape, 'BOTH data1 and data2 should have the same shape; the samples are paired one by one.'
+    assert data1.ndim >= 2, 'data1: given data should have at least 2 dimensions; Tx..., T=window index.'
+    assert (type(int_bins)==int) or (type(int_bins)==tuple) or (type(int_bins)==list), 'int_bins: bins size of the distribution can be integer, tuple, or list.'
+
+    if (type(int_bins)==tuple) or (type(int_bins)==list):
+        temp_binsx, temp_binsy = int_bins[0], int_bins[1]
+    else:
+        temp_binsx, temp_binsy = int_bins, int_bins
+
+    temp_indices1 = batch_bin_indices(data1, range1_lo, range1_hi, temp_binsx)
+    temp_indices2 = batch_bin_indices(data2, range2_lo, range2_hi, temp_binsy)
+    temp_indices = np.where((temp_indices1 < 0) | (temp_indices2 < 0), -1, temp_indices1*temp_binsy + temp_indices2)
+    temp_counts = batch_bin_counts(temp_indices, temp_binsx*temp_binsy)
+    temp_counts = temp_counts.reshape(data1.shape[0], temp_binsx, temp_binsy)
+
+    range1_lo, range1_hi = batch_range(range1_lo, range1_hi)
+    range2_lo, range2_hi = batch_range(range2_lo, range2_hi)
+    temp_dx = np.broadcast_to((range1_hi - range1_lo)/temp_binsx, (data1.shape[0],))
+    temp_dy = np.broadcast_to((range2_hi - range2_lo)/temp_binsy, (data1.shape[0],))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        temp_pdf = (temp_counts/np.sum(temp_counts, axis=(1, 2), keepdims=True)/(temp_dx*temp_dy)[:, None, None]).astype(pdf_dtype(data1, data2), copy=False)
+
+    return temp_pdf, temp_dx, temp_dy
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:31:11 2026
+
+@author: agent
+
+Blocked accumulation of the [distance distribution] for any_dist_his() and any_dist_kde().
+The upper triangle of the distance matrix is computed tile by tile ([block_size x block_size])
+across the workers (see set_execution()), and every tile is reduced right away into the histogram counts or the linear
+binned counts on the KDE grid. The peak memory is set by the block size instead of N^2.
+
+parameters:
+    data: given data should have 2 dimensions numpy array of [T x N], T=time index, N=eigenvector dimension.
+    int_dist: interested distance should be in string. Any option from sklearn; default is [chebyshev].
+    int_edges: histogram edges (histogram counts) or KDE grid points (linear binned counts); 1D numpy.array.
+    int_mode: 'histogram' or 'linear'; default is 'histogram'.
+    block_size: tile size of the distance matrix. Integer is expected; default is 2048.
+    add_noise: adding the noise (standard deviation of 1e-6) to the distances. Boolean is expected; default is False.
+
+return:
+    numpy.ndarray: counts of the distances.
+    float: minimum of the distance.
+    float: maximum of the distance.
+    int: number of the distances.
+    float: sum of the distances.
+    float: sum of the squared deviations of the distances from their mean (the variance is this over the number - 1).
+           Every tile gives its mean and the squared deviations from its own mean (two passes), and the tiles are merged
+           with their means (Chan et al.), so the variance has no cancellation of the sum of the square.
+
+"""
+
+import numpy as np
+
+from sklearn.metrics import pairwise_distances
+from info_geo._Profiling import stage
+from info_geo._ExecConfig import shared_run
+
+# histogram counts (same bin rule as numpy.histogram()) or linear binned counts (same as KDEpy) of the distances
+def dist_counts(temp_dist, int_edges, int_mode='histogram'):
+    if int_mode == 'histogram':
+        temp_counts, _ = np.histogram(temp_dist, bins=int_edges.shape[0] - 1, range=(int_edges[0], int_edges[-1]))
+    elif int_mode == 'linear':
+        temp_dx = (int_edges[-1] - int_edges[0])/(int_edges.shape[0] - 1)
+        temp_fractional, temp_integral = np.modf((temp_dist - int_edges[0])/temp_dx)
+        temp_integral = temp_integral.astype(int)
+        temp_loc = (temp_integral >= 0) & (temp_integral < int_edges.shape[0])
+        temp_counts = np.bincount(temp_integral[temp_loc], weights=1 - temp_fractional[temp_loc], minlength=int_edges.shape[0] + 1)
+        temp_counts += np.bincount(temp_integral[temp_loc] + 1, weights=temp_fractional[temp_loc], minlength=int_edges.shape[0] + 1)
+        temp_counts = temp_counts[:-1]
+
+    return temp_counts
+
+# one tile of the upper triangle of the distance matrix
+def job_block_dist(data, i, j, block_size, int_dist, int_edges, int_mode, add_noise):
+    temp_dist = pairwise_distances(data[i:i + block_size], data[j:j + block_size], metric=int_dist)
+    if i == j:
+        temp_dist = temp_dist[np.triu_indices(temp_dist.shape[0], k=1)]
+    else:
+        temp_dist = temp_dist.ravel()
+    if add_noise:
+        temp_dist += np.random.normal(0, 1e-6, temp_dist.shape[0])
+
+    temp_counts = dist_counts(temp_dist, int_edges, int_mode=int_mode)
+    if temp_dist.shape[0] == 0:
+        return temp_counts, np.inf, -np.inf, 0, 0.0, 0.0
+
+    temp_sum = np.sum(temp_dist)
+    return temp_counts, np.min(temp_dist), np.max(temp_dist), temp_dist.shape[0], temp_sum, np.sum((temp_dist - temp_sum/temp_dist.shape[0])**2)
+
+# one tile written into the row k of out: counts, minimum, maximum, number, sum and squared deviations (see shared_run())
+def job_block_dist_row(out, data, k, i, j, block_size, int_dist, int_edges, int_mode, add_noise):
+    temp_counts, *temp_stats = job_block_dist(data, i, j, block_size, int_dist, int_edges, int_mode, add_noise)
+    out[k, :-5] = temp_counts
+    out[k, -5:] = temp_stats
+
+def block_dist_counts(data, int_dist='chebyshev', int_edges=None, int_mode='histogram', block_size=2048, add_noise=False):
+    data = np.asarray(data)
+    assert len(data.shape) == 2, 'data: given data should have 2 dimensions numpy array of [T x N], T=time index, N=eigenvector dimension.'
+    assert isinstance(int_edges, np.ndarray) and (int_edges.ndim == 1), 'int_edges: histogram edges or KDE grid points should be 1D numpy.array.'
+    assert (int_mode == 'histogram') or (int_mode == 'linear'), 'int_mode: histogram or linear is expected; default is histogram.'
+    assert isinstance(block_size, int) and (block_size > 0), 'block_size: tile size of the distance matrix. Integer is expected; default is 2048.'
+
+    temp_tiles = [(i, j) for i in range(0, data.shape[0], block_size) for j in range(i, data.shape[0], block_size)]
+    with stage('dispatch', 'block_dist_counts', len(temp_tiles)):
+        # data is shared with the workers once; every tile is one row of the results (float64; the counts are exact)
+        temp_n_counts = int_edges.shape[0] - 1 if int_mode == 'histogram' else int_edges.shape[0]
+        temp_results = shared_run(job_block_dist_row, [(k, i, j, block_size, int_dist, int_edges, int_mode, add_noise) for k, (i, j) in enumerate(temp_tiles)], [data], (len(temp_tiles), temp_n_counts + 5), np.float64)
+    temp_counts = np.sum(temp_results[:, :-5], axis=0)
+    if int_mode == 'histogram':
+        temp_counts = temp_counts.astype(np.int64)
+
+    # squared deviations of all the tiles: within every tile plus the deviation of the tile mean from the mean
+    temp_num, temp_sum = temp_results[:, -3], temp_results[:, -2]
+    temp_mean = np.sum(temp_sum)/max(np.sum(temp_num), 1)
+    temp_tile = temp_num > 0
+    temp_deviation = np.sum(temp_results[:, -1]) + np.sum(temp_num[temp_tile]*(temp_sum[temp_tile]/temp_num[temp_tile] - temp_mean)**2)
+
+    return temp_counts, np.min(temp_results[:, -5]), np.max(temp_results[:, -4]), int(np.sum(temp_num)), np.sum(temp_sum), temp_deviation
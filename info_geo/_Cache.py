@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:46:48 2026
+
+@author: agent
+
+Opt-in content-addressed cache of the expensive stages (e.g. hilbert phase, [information rate]
+series). The key of a stage is the hash of the content of the input arrays (shape, dtype, bytes)
+and of the parameters that affect the stage only (e.g. win, sld, bins, int_range); the parameters of
+the later stages (e.g. entro_bins, base, norm) are not in the key, so changing them reuses the stage.
+The dtype of set_execution() is in the key as well, and so is CACHE_VERSION: the version of the cached
+stages and of the cache format. It is increased whenever a cached stage changes its results (e.g. the density
+estimation or the dtype handling), so the entries of the older code (e.g. on the disk tier) are not returned.
+
+Two tiers:
+    memory: least recently used (LRU) entries, bounded by the total bytes (max_bytes).
+    disk: one .npz file per entry in the directory (optional), bounded by the total bytes
+          (max_disk_bytes); the least recently used files are removed first.
+Nothing is cached unless a cache is active; cache_stages() activates it for a block of code and
+set_cache() activates it globally (set_cache(None) to deactivate).
+
+parameters (StageCache / cache_stages):
+    max_bytes: maximum total bytes of the memory tier. Integer is expected; default is 256 MiB.
+    directory: directory of the disk tier; string or None (no disk tier). Default is None.
+    max_disk_bytes: maximum total bytes of the disk tier. Integer is expected; default is 1 GiB.
+
+usage:
+    with ig.cache_stages(directory='ig_cache') as cache:
+        for entro_bins in (10, 20, 40):
+            ig.fix2d_phase_inforate_shannon_entro(sig1, sig2, time, entro_bins=entro_bins)
+    cache.hits, cache.misses
+
+"""
+
+import os
+import hashlib
+import tempfile
+import numpy as np
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from info_geo._ExecConfig import working_dtype
+
+CACHE_VERSION = 1 # version of the cached stages and of the format; increase it when a cached stage changes its results
+_GLOBAL_CACHE = [None]
+_LOCAL_CACHE = ContextVar('info_geo_cache', default=None)
+
+# hash of the content of the arrays and the parameters
+def cache_key(stage_name, arrays, params):
+    temp_hash = hashlib.blake2b(digest_size=20)
+    temp_hash.update(f'info_geo-cache-{CACHE_VERSION}'.encode())
+    temp_hash.update(stage_name.encode())
+    for temp_array in arrays:
+        temp_array = np.ascontiguousarray(temp_array)
+        temp_hash.update(f'{temp_array.dtype.str}{temp_array.shape}'.encode())
+        temp_hash.update(temp_array.view(np.uint8).reshape(-1) if temp_array.size else b'')
+    temp_hash.update(repr(sorted(params.items())).encode())
+
+    return temp_hash.hexdigest()
+
+class StageCache:
+    def __init__(self, max_bytes=2**28, directory=None, max_disk_bytes=2**30):
+        assert isinstance(max_bytes, int) and (max_bytes >= 0), 'max_bytes: maximum total bytes of the memory tier. Integer is expected; default is 256 MiB.'
+        assert (directory is None) or isinstance(directory, (str, os.PathLike)), 'directory: directory of the disk tier; string or None is expected. Default is None.'
+        assert isinstance(max_disk_bytes, int) and (max_disk_bytes >= 0), 'max_disk_bytes: maximum total bytes of the disk tier. Integer is expected; default is 1 GiB.'
+
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def clear(self):
+        self._memory.clear()
+        self._memory_bytes = 0
+        if self.directory is not None:
+            for temp_name in os.listdir(self.directory):
+                if temp_name.endswith('.npz'):
+                    os.remove(os.path.join(self.directory, temp_name))
+
+    def get(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+
+        if self.directory is not None:
+            temp_path = os.path.join(self.directory, key + '.npz')
+            try:
+                with np.load(temp_path, allow_pickle=False) as temp_file:
+                    temp_value = tuple(temp_file[f'arr_{i}'] for i in range(len(temp_file.files)))
+                os.utime(temp_path) # most recently used
+            except (OSError, KeyError, ValueError):
+                temp_value = None
+            if temp_value is not None:
+                for temp_array in temp_value:
+                    temp_array.setflags(write=False)
+                self.hits += 1
+                self.put_memory(key, temp_value)
+                return temp_value
+
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        value = tuple(np.array(temp_array) for temp_array in value) # own copy
+        for temp_array in value:
+            temp_array.setflags(write=False)
+        self.put_memory(key, value)
+        if self.directory is not None:
+            self.put_disk(key, value)
+
+    def put_memory(self, key, value):
+        temp_bytes = sum(temp_array.nbytes for temp_array in value)
+        if temp_bytes > self.max_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= sum(temp_array.nbytes for temp_array in self._memory.pop(key))
+        self._memory[key] = value
+        self._memory_bytes += temp_bytes
+        while self._memory_bytes > self.max_bytes:
+            _, temp_old = self._memory.popitem(last=False)
+            self._memory_bytes -= sum(temp_array.nbytes for temp_array in temp_old)
+
+    def put_disk(self, key, value):
+        # written to a temporary file first, so that a file of the cache is always complete
+        temp_fd, temp_tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(temp_fd, 'wb') as temp_file:
+            np.savez(temp_file, *value)
+        os.replace(temp_tmp, os.path.join(self.directory, key + '.npz'))
+
+        temp_files = [os.path.join(self.directory, temp_name) for temp_name in os.listdir(self.directory) if temp_name.endswith('.npz')]
+        temp_stats = sorted(((os.stat(temp_path).st_mtime, os.stat(temp_path).st_size, temp_path) for temp_path in temp_files))
+        temp_total = sum(temp_size for _, temp_size, _ in temp_stats)
+        for _, temp_size, temp_path in temp_stats:
+            if temp_total <= self.max_disk_bytes:
+                break
+            os.remove(temp_path)
+            temp_total -= temp_size
+
+def get_cache():
+    temp_cache = _LOCAL_CACHE.get()
+    return temp_cache if temp_cache is not None else _GLOBAL_CACHE[0]
+
+def set_cache(cache):
+    assert (cache is None) or isinstance(cache, StageCache), 'cache: StageCache or None is expected.'
+    _GLOBAL_CACHE[0] = cache
+
+@contextmanager
+def cache_stages(max_bytes=2**28, directory=None, max_disk_bytes=2**30, cache=None):
+    assert (cache is None) or isinstance(cache, StageCache), 'cache: StageCache or None is expected.'
+    temp_cache = cache if cache is not None else StageCache(max_bytes=max_bytes, directory=directory, max_disk_bytes=max_disk_bytes)
+    temp_token = _LOCAL_CACHE.set(temp_cache)
+    try:
+        yield temp_cache
+    finally:
+        _LOCAL_CACHE.reset(temp_token)
+
+# result of the stage (tuple of arrays) from the active cache, or computed (and stored) if it is not cached.
+def cached_stage(stage_name, compute, arrays, params):
+    temp_cache = get_cache()
+    if temp_cache is None:
+        return compute()
+
+    temp_key = cache_key(stage_name, arrays, dict(params, dtype=working_dtype().str)) # the stages are computed in the working dtype
+    temp_value = temp_cache.get(temp_key)
+    if temp_value is None:
+        temp_value = compute()
+        temp_cache.put(temp_key, temp_value)
+    return temp_value
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:44:39 2026
+
+@author: agent
+
+Batched density estimation shared by the [information rate] functions. All the windows are
+estimated in one call on the grid of the given range (the edges are computed once), with one of
+the estimators (density):
+    histogram: same as numpy.histogram(density=True); grid of [bins] bins.
+    ash: averaged shifted histogram of [ash_shifts] histograms with the bins size of [bins]; it is
+         computed as the histogram of [bins x ash_shifts] fine bins smoothed by the triangle weights.
+    kde: binned FFT-KDE (same kernels as KDEpy.FFTKDE); the samples are linear binned on the [bins]
+         bin centers and convolved with the kernel of every window. The bandwidth is given or computed
+         for every window (scott or silverman; minimum of the standard deviation and IQR/1.349).
+The ash and kde estimations are normalized on the grid (sum of PDF x dx is one) like the histogram.
+The counts and their smoothing are computed in float64; the PDF has the floating point type of the data.
+
+For 2D, data1 [T x C1 x ...] and data2 [T x C2 x ...] with C1 != C2 are paired channel by channel as
+numpy.tile() does (channel k % C1 with channel k % C2 for k < C1 x C2), without the tiled copies. The channels
+i and j are paired gcd(C1, C2) times if i = j (mod gcd) and never otherwise; the constant cancels in the PDF,
+so the joint counts are taken over the pairs of every residue class once. For the few pairs of every class,
+the pair indices are broadcast; otherwise the joint counts are the products of the marginal counts of every
+class and window position (weighted counting), so the memory grows with C1 + C2 instead of C1 x C2.
+
+parameters:
+    data: array of data with the window index at the first axis; Tx..., T=window index.
+    range_lo: lower limit of the range; float or 1D numpy.array with T elements.
+    range_hi: upper limit of the range; float or 1D numpy.array with T elements.
+    int_bins: bins size of the distribution estimation; integer (2-tuple or 2-list for 2D).
+    density: histogram, ash, or kde; default is histogram.
+    ash_shifts: number of the shifted histograms for ash. Integer is expected; default is 5.
+    int_kernel: kernel for kde (any kernel of KDEpy); default is biweight.
+    int_bw: bandwidth for kde; float, scott, or silverman. Default is scott.
+
+return:
+    numpy.ndarray: PDF of every window [T x grid], or [T x gridx x gridy] for 2D.
+    numpy.ndarray: grid step of every window [T] (for each of the axis for 2D).
+
+"""
+
+import numpy as np
+
+from info_geo._BatchHistogram import batch_range, batch_bin_indices, batch_bin_counts, batch_histogram_func, batch_histogram2d_func, pdf_dtype
+
+DENSITY_ESTIMATORS = ('histogram', 'ash', 'kde')
+
+# bins size from the rule (rice or sturges) or the given bins size; n=number of samples of the distribution.
+# For the joint distribution of dims axes, the dims-th root of the rule is the bins size of every axis.
+def density_bins(int_bins, n, dims=1):
+    if int_bins=='rice':
+        temp_bins = int(np.ceil(2*n**(1/3)))
+    elif int_bins=='sturges':
+        temp_bins = int(np.ceil(np.log2(n)) + 1)
+    else:
+        return int_bins
+    return temp_bins if dims == 1 else int(temp_bins**(1/dims))
+
+def check_density(density):
+    assert density in DENSITY_ESTIMATORS, 'density: density estimator should be histogram, ash, or kde; default is histogram.'
+
+# smoothing of the fine counts by the triangle weights of the averaged shifted histogram
+def ash_smooth(counts, ash_shifts, axis=-1):
+    from scipy.ndimage import convolve1d
+
+    temp_weights = 1 - np.abs(np.arange(-(ash_shifts - 1), ash_shifts))/ash_shifts
+    return convolve1d(counts.astype(float), temp_weights, axis=axis, mode='constant')
+
+# percentile (linear) of every window of the data [T x n] with every sample repeated [repeats] times
+def repeated_percentile(data, q, repeats):
+    temp_sorted = np.sort(data, axis=-1)
+    temp_last = data.shape[-1]*repeats - 1
+    temp_percentile = []
+    for temp_q in q:
+        temp_pos = temp_q/100*temp_last
+        temp_lo = int(np.floor(temp_pos))
+        temp_hi = min(temp_lo + 1, temp_last)
+        temp_percentile.append(temp_sorted[:, temp_lo//repeats] + (temp_pos - temp_lo)*(temp_sorted[:, temp_hi//repeats] - temp_sorted[:, temp_lo//repeats]))
+
+    return temp_percentile
+
+# bandwidth of every window [T]; data is [T x n], every sample counted [repeats] times (tiled pairing)
+def kde_bandwidth(data, int_bw='scott', dims=1, repeats=1):
+    if isinstance(int_bw, (int, float)):
+        return np.full(data.shape[0], float(int_bw))
+
+    temp_num = data.shape[-1]*repeats
+    if repeats == 1:
+        temp_sigma = np.std(data, axis=-1, ddof=1)
+        temp_q75, temp_q25 = np.percentile(data, [75, 25], axis=-1)
+    else:
+        temp_sigma = np.sqrt(np.var(data, axis=-1)*temp_num/(temp_num - 1))
+        temp_q75, temp_q25 = repeated_percentile(data, [75, 25], repeats)
+    temp_iqr = (temp_q75 - temp_q25)/1.3489795003921634 # scipy.norm.ppf(.75) - scipy.norm.ppf(.25)
+    temp_sigma = np.where(temp_iqr > 0, np.minimum(temp_sigma, temp_iqr), temp_sigma)
+
+    if int_bw.lower()=='scott':
+        return temp_sigma * temp_num**(-1/(dims + 4))
+    elif int_bw.lower()=='silverman':
+        return temp_sigma * (temp_num*(dims + 2)/4)**(-1/(dims + 4))
+
+# kernel of KDEpy by its name. KDEpy keeps its kernels in FFTKDE._available_kernels (not public), so it is
+# resolved here only, with an error if the installed KDEpy does not have it.
+def kde_kernel(int_kernel):
+    from KDEpy import FFTKDE
+
+    temp_kernels = getattr(FFTKDE, '_available_kernels', None)
+    if not isinstance(temp_kernels, dict):
+        raise ImportError('KDEpy: FFTKDE._available_kernels is not found; the installed KDEpy is not supported by the kde density.')
+    assert int_kernel in temp_kernels, f'int_kernel: kernel of KDEpy is expected; {", ".join(temp_kernels)}.'
+    return temp_kernels[int_kernel]
+
+# kernel weights of every window on the grid [T x (2L+1)]; same kernel grid as FFTKDE.evaluate()
+def kde_weights(int_kernel, bw, dx, grid_size):
+    temp_kernel = kde_kernel(int_kernel)
+    dx = np.broadcast_to(dx, bw.shape)
+    bw = np.maximum(bw, 1e-3*dx) # constant window (zero bandwidth) keeps its counts
+    if temp_kernel.finite_support:
+        temp_real_bw = temp_kernel.support * np.max(bw)
+    else:
+        temp_real_bw = temp_kernel.practical_support(np.max(bw))
+    temp_l = int(np.minimum(np.floor(temp_real_bw/np.min(dx)), grid_size))
+
+    temp_grid = np.arange(-temp_l, temp_l + 1) * dx[:, None]
+    temp_weights = temp_kernel(temp_grid.reshape(-1, 1), bw=np.repeat(bw, 2*temp_l + 1), norm=2)
+
+    return temp_weights.reshape(bw.shape[0], 2*temp_l + 1)
+
+# convolution of the counts [T x ...] with the weights of every window [T x K] along the axis
+def kde_smooth(counts, weights, axis):
+    from scipy.signal import fftconvolve
+
+    temp_shape = [1]*counts.ndim
+    temp_shape[0] = weights.shape[0]
+    temp_shape[axis] = weights.shape[1]
+    return fftconvolve(counts, weights.reshape(temp_shape), mode='same', axes=axis)
+
+# position of every sample on the bin centers (linear binning); samples outside the range are not kept
+def linear_position(data, range_lo, range_hi, int_bins):
+    temp_shape = (-1,) + (1,)*(data.ndim - 1)
+    temp_lo = range_lo.reshape(temp_shape)
+    temp_hi = range_hi.reshape(temp_shape)
+
+    temp_keep = (data >= temp_lo) & (data <= temp_hi)
+    temp_position = np.clip((data - temp_lo)/(temp_hi - temp_lo)*int_bins - 0.5, 0, int_bins - 1)
+    temp_index = np.minimum(np.floor(temp_position).astype(np.intp), max(int_bins - 2, 0))
+    temp_fraction = temp_position - temp_index
+
+    return temp_index, temp_fraction, temp_keep
+
+# weighted bin counts of every window; the weights outside the range are not counted
+def linear_counts(index, weights, keep, int_slots):
+    temp_rows = index.shape[0]
+    temp_index = (index.reshape(temp_rows, -1) + (np.arange(temp_rows)*int_slots)[:, None])[keep.reshape(temp_rows, -1)]
+    temp_weights = weights.reshape(temp_rows, -1)[keep.reshape(temp_rows, -1)]
+
+    return np.bincount(temp_index, weights=temp_weights, minlength=temp_rows*int_slots).reshape(temp_rows, int_slots)
+
+# joint (weighted) counts [T x slots1 x slots2] of the tiled channel pairing; index and weight are [T x C x W x K],
+# K=corners of every sample (1 for the bin index, 2 for the linear binning). The time index is taken in chunks.
+def tiled_pair_counts(index1, weight1, index2, weight2, slots1, slots2, max_elements=2**22):
+    temp_t, temp_c1, temp_w, temp_k1 = index1.shape
+    temp_c2, temp_k2 = index2.shape[1], index2.shape[3]
+    temp_g = int(np.gcd(temp_c1, temp_c2))
+    temp_pairs = (temp_c1//temp_g)*(temp_c2//temp_g)*temp_k1*temp_k2 # pairs of one class, window position and time index
+
+    # channel a*g + r is in the residue class r: [T x g x C/g x W x K]
+    def classes(temp_array, temp_c, temp_k):
+        return temp_array.reshape(-1, temp_c//temp_g, temp_g, temp_w, temp_k).swapaxes(1, 2)
+
+    temp_broadcast = temp_pairs <= slots1 + slots2
+    temp_size = temp_g*temp_w*(temp_pairs if temp_broadcast else (slots1 + slots2))
+    temp_chunk = max(1, max_elements//max(temp_size, 1))
+
+    temp_counts = np.empty((temp_t, slots1, slots2))
+    for temp_start in range(0, temp_t, temp_chunk):
+        temp_part = slice(temp_start, min(temp_start + temp_chunk, temp_t))
+        temp_rows = temp_part.stop - temp_part.start
+        temp_index1, temp_weight1 = classes(index1[temp_part], temp_c1, temp_k1), classes(weight1[temp_part], temp_c1, temp_k1)
+        temp_index2, temp_weight2 = classes(index2[temp_part], temp_c2, temp_k2), classes(weight2[temp_part], temp_c2, temp_k2)
+
+        if temp_broadcast:
+            # broadcasting: every pair of the class [T x g x C1/g x C2/g x W x K1 x K2]
+            temp_keys = temp_index1[:, :, :, None, :, :, None]*slots2 + temp_index2[:, :, None, :, :, None, :]
+            temp_keys = temp_keys + (np.arange(temp_rows)*slots1*slots2).reshape(-1, 1, 1, 1, 1, 1, 1)
+            temp_weights = temp_weight1[:, :, :, None, :, :, None]*temp_weight2[:, :, None, :, :, None, :]
+            temp_counts[temp_part] = np.bincount(temp_keys.ravel(), weights=temp_weights.ravel(), minlength=temp_rows*slots1*slots2).reshape(temp_rows, slots1, slots2)
+        else:
+            # weighted counting: marginal counts of every (time index, class, window position) [T x (g W) x slots]; the joint counts are their products
+            temp_cells = (np.arange(temp_rows*temp_g*temp_w).reshape(temp_rows, temp_g, 1, temp_w, 1))
+            temp_counts1 = np.bincount((temp_cells*slots1 + temp_index1).ravel(), weights=temp_weight1.ravel(), minlength=temp_rows*temp_g*temp_w*slots1)
+            temp_counts2 = np.bincount((temp_cells*slots2 + temp_index2).ravel(), weights=temp_weight2.ravel(), minlength=temp_rows*temp_g*temp_w*slots2)
+            temp_counts1 = temp_counts1.reshape(temp_rows, temp_g*temp_w, slots1)
+            temp_counts2 = temp_counts2.reshape(temp_rows, temp_g*temp_w, slots2)
+            temp_counts[temp_part] = np.matmul(temp_counts1.swapaxes(1, 2), temp_counts2)
+
+    return temp_counts
+
+# 2D density of the tiled channel pairing (see above); data1 [T x C1 x W], data2 [T x C2 x W]
+def tiled_density2d(data1, data2, range1_lo, range1_hi, range2_lo, range2_hi, temp_binsx, temp_binsy, density, ash_shifts, int_kernel, int_bw):
+    range1_lo, range1_hi = batch_range(range1_lo, range1_hi)
+    range2_lo, range2_hi = batch_range(range2_lo, range2_hi)
+    range1_lo, range1_hi = np.broadcast_to(range1_lo, (data1.shape[0],)), np.broadcast_to(range1_hi, (data1.shape[0],))
+    range2_lo, range2_hi = np.broadcast_to(range2_lo, (data1.shape[0],)), np.broadcast_to(range2_hi, (data1.shape[0],))
+    temp_fine = ash_shifts if density=='ash' else 1
+
+    temp_axes = []
+    for temp_data, temp_lo, temp_hi, temp_bins in ((data1, range1_lo, range1_hi, temp_binsx), (data2, range2_lo, range2_hi, temp_binsy)):
+        temp_data = temp_data.reshape(temp_data.shape[0], temp_data.shape[1], -1)
+        if density=='kde':
+            temp_index, temp_fraction, temp_keep = linear_position(temp_data, temp_lo, temp_hi, temp_bins)
+            temp_index = np.stack((temp_index, temp_index + 1), axis=-1)
+            temp_weight = np.stack((1 - temp_fraction, temp_fraction), axis=-1)*temp_keep[..., None]
+            temp_slots = temp_bins + 1
+        else:
+            temp_index = batch_bin_indices(temp_data, temp_lo, temp_hi, temp_bins*temp_fine)[..., None]
+            temp_weight = (temp_index >= 0).astype(float)
+            temp_index = np.maximum(temp_index, 0)
+            temp_slots = temp_bins*temp_fine
+        temp_axes.append((temp_index, temp_weight, temp_slots, (temp_hi - temp_lo)/(temp_bins*temp_fine)))
+
+    (temp_index1, temp_weight1, temp_slots1, temp_dx), (temp_index2, temp_weight2, temp_slots2, temp_dy) = temp_axes
+    temp_counts = tiled_pair_counts(temp_index1, temp_weight1, temp_index2, temp_weight2, temp_slots1, temp_slots2)
+
+    if density=='ash':
+        temp_counts = ash_smooth(ash_smooth(temp_counts, ash_shifts, axis=1), ash_shifts, axis=2)
+    elif density=='kde':
+        temp_counts = temp_counts[:, :temp_binsx, :temp_binsy]
+        # every channel of data1 is tiled C2 times (and data2 C1 times) in the pairing
+        temp_bw1 = kde_bandwidth(data1.reshape(data1.shape[0], -1), int_bw, dims=2, repeats=data2.shape[1])
+        temp_bw2 = kde_bandwidth(data2.reshape(data2.shape[0], -1), int_bw, dims=2, repeats=data1.shape[1])
+        temp_counts = kde_smooth(temp_counts, kde_weights(int_kernel, temp_bw1, temp_dx, temp_binsx), axis=1)
+        temp_counts = kde_smooth(temp_counts, kde_weights(int_kernel, temp_bw2, temp_dy, temp_binsy), axis=2)
+        temp_counts = np.maximum(temp_counts, 0) # round-off of the FFT
+
+    return normalize_pdf(temp_counts, temp_dx*temp_dy, pdf_dtype(data1, data2)), temp_dx, temp_dy
+
+# PDF of the counts (float64) in the given dtype
+def normalize_pdf(counts, volume, dtype=np.float64):
+    temp_axes = tuple(range(1, counts.ndim))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (counts/np.sum(counts, axis=temp_axes, keepdims=True)/volume.reshape((-1,) + (1,)*(counts.ndim - 1))).astype(dtype, copy=False)
+
+def batch_density(data, range_lo, range_hi, int_bins, density='histogram', ash_shifts=5, int_kernel='biweight', int_bw='scott'):
+    data = np.asarray(data)
+    check_density(density)
+    assert data.ndim >= 2, 'data: given data should have at least 2 dimensions; Tx..., T=window index.'
+    assert isinstance(ash_shifts, int) and (ash_shifts > 0), 'ash_shifts: number of the shifted histograms. Integer is expected; default is 5.'
+
+    if density=='histogram':
+        return batch_histogram_func(data, range_lo, range_hi, int_bins)
+
+    range_lo, range_hi = batch_range(range_lo, range_hi)
+    range_lo = np.broadcast_to(range_lo, (data.shape[0],))
+    range_hi = np.broadcast_to(range_hi, (data.shape[0],))
+
+    if density=='ash':
+        temp_dx = (range_hi - range_lo)/(int_bins*ash_shifts)
+        temp_counts = batch_bin_counts(batch_bin_indices(data, range_lo, range_hi, int_bins*ash_shifts), int_bins*ash_shifts)
+        temp_counts = ash_smooth(temp_counts, ash_shifts, axis=-1)
+    elif density=='kde':
+        temp_dx = (range_hi - range_lo)/int_bins
+        temp_index, temp_fraction, temp_keep = linear_position(data, range_lo, range_hi, int_bins)
+        temp_counts = linear_counts(temp_index, 1 - temp_fraction, temp_keep, int_bins + 1)
+        temp_counts += linear_counts(temp_index + 1, temp_fraction, temp_keep, int_bins + 1)
+        temp_bw = kde_bandwidth(data.reshape(data.shape[0], -1), int_bw, dims=1)
+        temp_counts = kde_smooth(temp_counts[:, :int_bins], kde_weights(int_kernel, temp_bw, temp_dx, int_bins), axis=1)
+        temp_counts = np.maximum(temp_counts, 0) # round-off of the FFT
+
+    return normalize_pdf(temp_counts, temp_dx, pdf_dtype(data)), temp_dx
+
+def batch_density2d(data1, data2, range1_lo, range1_hi, range2_lo, range2_hi, int_bins, density='histogram', ash_shifts=5, int_kernel='biweight', int_bw='scott'):
+    data1 = np.asarray(data1)
+    data2 = np.asarray(data2)
+    check_density(density)
+    assert (data1.shape[0] == data2.shape[0]) and (data1.shape[2:] == data2.shape[2:]), 'BOTH data1 and data2 should have the same shape (except the channels [T x C x ...]); the samples are paired one by one.'
+    assert data1.ndim >= 2, 'data1: given data should have at least 2 dimensions; Tx..., T=window index.'
+    assert (data1.shape == data2.shape) or (data1.ndim >= 3), 'data1: given data should have 3 dimensions [T x C x ...] to pair the different number of channels.'
+    assert isinstance(ash_shifts, int) and (ash_shifts > 0), 'ash_shifts: number of the shifted histograms. Integer is expected; default is 5.'
+
+    if (type(int_bins)==tuple) or (type(int_bins)==list):
+        temp_binsx, temp_binsy = int_bins[0], int_bins[1]
+    else:
+        temp_binsx, temp_binsy = int_bins, int_bins
+
+    # different number of channels: tiled pairing without the copies
+    if data1.shape != data2.shape:
+        return tiled_density2d(data1, data2, range1_lo, range1_hi, range2_lo, range2_hi, temp_binsx, temp_binsy, density, ash_shifts, int_kernel, int_bw)
+
+    if density=='histogram':
+        return batch_histogram2d_func(data1, data2, range1_lo, range1_hi, range2_lo, range2_hi, int_bins)
+
+    range1_lo, range1_hi = batch_range(range1_lo, range1_hi)
+    range2_lo, range2_hi = batch_range(range2_lo, range2_hi)
+    range1_lo, range1_hi = np.broadcast_to(range1_lo, (data1.shape[0],)), np.broadcast_to(range1_hi, (data1.shape[0],))
+    range2_lo, range2_hi = np.broadcast_to(range2_lo, (data1.shape[0],)), np.broadcast_to(range2_hi, (data1.shape[0],))
+
+    if density=='ash':
+        temp_binsx, temp_binsy = temp_binsx*ash_shifts, temp_binsy*ash_shifts
+        temp_dx = (range1_hi - range1_lo)/temp_binsx
+        temp_dy = (range2_hi - range2_lo)/temp_binsy
+        temp_indices1 = batch_bin_indices(data1, range1_lo, range1_hi, temp_binsx)
+        temp_indices2 = batch_bin_indices(data2, range2_lo, range2_hi, temp_binsy)
+        temp_indices = np.where((temp_indices1 < 0) | (temp_indices2 < 0), -1, temp_indices1*temp_binsy + temp_indices2)
+        temp_counts = batch_bin_counts(temp_indices, temp_binsx*temp_binsy).reshape(-1, temp_binsx, temp_binsy)
+        temp_counts = ash_smooth(ash_smooth(temp_counts, ash_shifts, axis=1), ash_shifts, axis=2)
+    elif density=='kde':
+        temp_dx = (range1_hi - range1_lo)/temp_binsx
+        temp_dy = (range2_hi - range2_lo)/temp_binsy
+        temp_index1, temp_fraction1, temp_keep1 = linear_position(data1, range1_lo, range1_hi, temp_binsx)
+        temp_index2, temp_fraction2, temp_keep2 = linear_position(data2, range2_lo, range2_hi, temp_binsy)
+        temp_keep = temp_keep1 & temp_keep2
+        temp_slots = (temp_binsx + 1)*(temp_binsy + 1)
+
+        # linear binning on the four corners of the cell
+        temp_counts = 0
+        for temp_shift1, temp_weight1 in ((0, 1 - temp_fraction1), (1, temp_fraction1)):
+            for temp_shift2, temp_weight2 in ((0, 1 - temp_fraction2), (1, temp_fraction2)):
+                temp_index = (temp_index1 + temp_shift1)*(temp_binsy + 1) + temp_index2 + temp_shift2
+                temp_counts = temp_counts + linear_counts(temp_index, temp_weight1*temp_weight2, temp_keep, temp_slots)
+        temp_counts = temp_counts.reshape(-1, temp_binsx + 1, temp_binsy + 1)[:, :temp_binsx, :temp_binsy]
+
+        # product kernel; one convolution for each of the axis
+        temp_bw1 = kde_bandwidth(data1.reshape(data1.shape[0], -1), int_bw, dims=2)
+        temp_bw2 = kde_bandwidth(data2.reshape(data2.shape[0], -1), int_bw, dims=2)
+        temp_counts = kde_smooth(temp_counts, kde_weights(int_kernel, temp_bw1, temp_dx, temp_binsx), axis=1)
+        temp_counts = kde_smooth(temp_counts, kde_weights(int_kernel, temp_bw2, temp_dy, temp_binsy), axis=2)
+        temp_counts = np.maximum(temp_counts, 0) # round-off of the FFT
+
+    return normalize_pdf(temp_counts, temp_dx*temp_dy, pdf_dtype(data1, data2)), temp_dx, temp_dy
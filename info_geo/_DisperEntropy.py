@@ -7,30 +7,71 @@ Created on Mon Sep 23 16:50:10 2024
 
 calculation of Dispersion Entropy.
 
+Every m-length dispersion pattern is encoded as one integer (base of the number of classes) and the 
+patterns are counted by bincount (or by sorting the integers for large number of patterns) instead of 
+sorting the rows of the patterns. disper_entropy_multi() computes the Dispersion Entropy of many series 
+(NxT, N=channels # or windows #) in one call, and the multiscale Dispersion Entropy by coarse-graining the 
+series; the normal cumulative distribution function uses the mean and standard deviation of the original 
+series (scale of 1) for all the scales. 
+
 parameters: 
-    time_series: given time series should be 1D.
+    time_series: given time series should be 1D; 2D (NxT) is expected for disper_entropy_multi().
     d_val: the delay of embedding should be integer; default is 1.
     m_val: the dimension of embedding should be integer; default is 2.
     c_val: the linear algorithm mapping C value should be integer or float; default is 3.
     norm: normalization of the Shannon entropy. Only accept boolean; True for normalization (default).
+    scales: scales of the coarse-graining for disper_entropy_multi(). Integer (1 to scales) or list is expected; default is 1.
     
 return: 
     temp_entropy: float; Dispersion Entropy. 
+    disper_entropy_multi(): numpy.ndarray; Dispersion Entropy [N x scales].
 """
 
 import numpy as np
-import scipy.stats as ss
 
 from numpy.lib.stride_tricks import sliding_window_view
-from scipy.stats import entropy
+from scipy.special import ndtr
 
 
 def map_func(x, c):
     temp_x = np.round(c*x + 0.5)
     return temp_x
 
+# Shannon entropy of the dispersion patterns of every row of z_list (NxT); the pattern is encoded as one integer. 
+def disper_pattern_entropy(z_list, int_d=1, int_m=2, int_base=None):
+    z_list = np.atleast_2d(z_list)
+    z_list = (z_list - np.min(z_list)).astype(np.int64)
+    temp_classes = int(np.max(z_list)) + 1
+    assert temp_classes**int_m < 2**62, 'm_val: the number of the dispersion patterns is too large to be encoded as integer.'
+
+    #embedding with the sliding window and encoding the pattern as integer.
+    pi_pattern = sliding_window_view(z_list, window_shape=int_m, axis=-1)
+    pi_pattern = pi_pattern[:, ::int_d, :]
+    pi_code = pi_pattern @ (temp_classes**np.arange(int_m - 1, -1, -1, dtype=np.int64))
+
+    #count the number of the repeated combination.
+    temp_slots = temp_classes**int_m
+    if z_list.shape[0]*temp_slots <= 2**24:
+        temp_counts = np.bincount((pi_code + temp_slots*np.arange(z_list.shape[0])[:, None]).ravel(), minlength=z_list.shape[0]*temp_slots)
+        temp_rows, _ = np.nonzero(temp_counts.reshape(z_list.shape[0], temp_slots))
+        temp_counts = temp_counts[temp_counts > 0]
+    else:
+        pi_code = np.sort(pi_code, axis=-1)
+        temp_new = np.ones(pi_code.shape, dtype=bool)
+        temp_new[:, 1:] = pi_code[:, 1:] != pi_code[:, :-1]
+        temp_counts = np.bincount(np.cumsum(temp_new.ravel()) - 1)
+        temp_rows, _ = np.nonzero(temp_new)
+
+    #Shannon entropy of the PMF; H = log(n) - sum(c*log(c))/n
+    pmf_deno = pi_pattern.shape[1] #denominator of the PDF counting
+    temp_entropy = np.log(pmf_deno) - np.bincount(temp_rows, weights=temp_counts*np.log(temp_counts), minlength=z_list.shape[0])/pmf_deno
+    if int_base is not None:
+        temp_entropy = temp_entropy/np.log(int_base)
+
+    return temp_entropy
+
 def disper_entropy(time_series, d_val=1, m_val=2, c_val=3, norm=True):
-    time_series = np.array(time_series)
+    time_series = np.asarray(time_series)
     time_series = np.squeeze(time_series) 
     assert len(time_series.shape) == 1, 'time_series: given time series should be 1D.'
     assert isinstance(d_val, (int)), 'd_val: the delay of embedding should be integer; default is 1.'
@@ -45,27 +86,51 @@ def disper_entropy(time_series, d_val=1, m_val=2, c_val=3, norm=True):
     int_m = m_val 
     int_c = c_val 
 
-    cdf_y = ss.norm.cdf(x_list, loc=np.mean(x_list), scale=np.std(x_list)) #normal cumulative distribution function
+    cdf_y = ndtr((x_list - np.mean(x_list))/np.std(x_list)) #normal cumulative distribution function; same as scipy.stats.norm.cdf() without loading scipy.stats
     z_list = map_func(cdf_y, int_c) #linear algorithm. CHECK the map_func(); one can modify it if needed. 
 
-    #embedding with the sliding window.
-    pi_pattern = sliding_window_view(z_list, window_shape=int_m)
-    pi_pattern = pi_pattern[::int_d, :]
+    #count the dispersion patterns and form the PMF for the Shannon entropy calculation. 
+    if norm:
+        temp_entropy = disper_pattern_entropy(z_list, int_d=int_d, int_m=int_m, int_base=(int_c**(int_m)))[0]
+    else: 
+        temp_entropy = disper_pattern_entropy(z_list, int_d=int_d, int_m=int_m)[0]
 
-    #count the number of the repeated combination.
-    unique_rows, counts = np.unique(pi_pattern, axis=0, return_counts=True)
+    return temp_entropy
 
-    #forming the PMF for the Shannon entropy calculation. 
-    pmf_deno = pi_pattern.shape[0] #denominator of the PDF counting 
-    remain_pi_pattern_dim = pi_pattern.shape[0] - counts.shape[0] #count how many does not have the patterns from the combination.
-    remain_count = np.zeros(remain_pi_pattern_dim) #form zeros array for those that are not counted. 
-    pmf_nume = np.concatenate((counts, remain_count)) #numerator of the PDF counting
+def disper_entropy_multi(time_series, d_val=1, m_val=2, c_val=3, norm=True, scales=1):
+    time_series = np.asarray(time_series)
+    time_series = np.atleast_2d(np.squeeze(time_series))
+    assert len(time_series.shape) == 2, 'time_series: given time series should be 2D; NxT, N=channels # or windows #, T=time index.'
+    assert isinstance(d_val, (int)), 'd_val: the delay of embedding should be integer; default is 1.'
+    assert isinstance(m_val, (int)), 'm_val: the dimension of embedding should be integer; default is 2.'
+    assert isinstance(c_val, (int, float)), 'c_val: the linear algorithm mapping C value should be integer or float; default is 3.'
+    assert isinstance(norm, (bool)), 'norm: normalization of the Shannon entropy. Only accept boolean; True for normalization (default).'
+    assert isinstance(scales, (int, list, tuple)), 'scales: scales of the coarse-graining. Integer or list is expected; default is 1.'
 
-    pmf = pmf_nume/pmf_deno #probability mass function (PMF). 
+    if isinstance(scales, int):
+        scales = list(range(1, scales + 1))
 
-    if norm:
-        temp_entropy = entropy(pmf, base=(int_c**(int_m)))
-    else: 
-        temp_entropy = entropy(pmf)
+    x_list = time_series
+    int_d = d_val
+    int_m = m_val
+    int_c = c_val
+
+    #mean and standard deviation of the original series are shared by all the scales.
+    temp_mean = np.mean(x_list, axis=-1, keepdims=True)
+    temp_std = np.std(x_list, axis=-1, keepdims=True)
+
+    temp_entropy = np.zeros((x_list.shape[0], len(scales)))
+    for i, temp_scale in enumerate(scales):
+        assert isinstance(temp_scale, int) and (temp_scale > 0), 'scales: scale of the coarse-graining should be integer > 0.'
+        temp_len = x_list.shape[-1]//temp_scale
+        coarse_x = x_list[:, :temp_len*temp_scale].reshape(x_list.shape[0], temp_len, temp_scale).mean(axis=-1)
+
+        cdf_y = ndtr((coarse_x - temp_mean)/temp_std) #normal cumulative distribution function
+        z_list = map_func(cdf_y, int_c) #linear algorithm. CHECK the map_func(); one can modify it if needed.
+
+        if norm:
+            temp_entropy[:, i] = disper_pattern_entropy(z_list, int_d=int_d, int_m=int_m, int_base=(int_c**(int_m)))
+        else:
+            temp_entropy[:, i] = disper_pattern_entropy(z_list, int_d=int_d, int_m=int_m)
 
     return temp_entropy
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:39:12 2026
+
+@author: agent
+
+Package-wide execution configuration of the parallel functions (joblib) and of the floating point
+precision. It is set globally with set_execution() or for a block of code with the execution() context
+manager; the context manager overrides the global setting within the block (and within the current
+thread/task only). Every parallel entry point of info_geo runs its jobs through parallel_run(), which
+gives the precision (dtype) and jit of the caller to the jobs (the workers do not see the context of the caller).
+
+The functions with large inputs (leading eigenvector, blocked distances, 2D information rate, connectivity) run
+through shared_run() instead: with the process backend, the input arrays are placed in shared memory once
+(multiprocessing.shared_memory) and every job gets views of them (no copy, no pickling of the arrays per task);
+the jobs write their results straight into a preallocated shared output array. A strided view (e.g. the
+sliding windows) is shared as the memory it spans (its base signal), not as the expanded windows. With the
+serial and thread backends the jobs get the arrays themselves (no shared memory is needed).
+
+options:
+    backend: 'serial', 'thread' or 'process' (loky). Default is 'process'.
+    n_jobs: number of workers; -1 is all the cores. Integer is expected; default is -1.
+    batch_size: number of tasks given to a worker at once; integer or 'auto'. Default is 'auto'.
+    blas_threads: cap of the BLAS threads (e.g. inside eigh()) in every worker; integer or None (no cap). Default is None.
+        For 'process', it is given to the workers by joblib (inner_max_num_threads); for 'serial' and
+        'thread', it is applied with threadpoolctl (optional; ignored if it is not installed).
+    dtype: floating point type of the data, the windows, the PDFs and the matrices; numpy.float64 or numpy.float32.
+        Default is numpy.float64 (reference). The given signals are cast to dtype at the entry of the functions
+        (as_working()); the time is kept in float64. With numpy.float32 (half of the memory and memory bandwidth):
+            the bin index of every sample is computed in float64 (same bins as numpy.histogram() of the float32 data);
+            the sums over the bins and windows (information rate, variance, 2x2 eigen problem) accumulate in float64
+            and the results are returned in float32;
+            the hilbert phase is unwrapped in float64 (it grows with the time) and its cos/sin are cast to float32;
+            the eigenvectors are computed by the float32 LAPACK routines.
+        The error against the float64 reference (measured on random walk signals of O(1), 8 channels, windows of 200):
+            information rate square (histogram, ash, N-D, connectivity): about 1e-7 relative (kde: about 1e-6);
+                it is larger when two consecutive distributions barely change, since the difference of sqrt(PDF)
+                of the two windows cancels (absolute error of about 2e-7 x information rate / dt);
+            Hjorth parameters: about 1e-6 relative (hjorth_paras_raw(): about 1e-5, the derivatives of float32 samples);
+            phase lock matrix, leading eigenvectors: about 1e-7 absolute (eigenvector: about 1e-7 x |eigenvalue| /
+                eigenvalue gap in general); analytic signal: about 1e-6 absolute.
+        The float32 rounding of a sample very close to a bin edge can move it to the next bin (one count of
+        difference); this is the same for any float32 input. The other functions (phase entropy, STFT, dispersion
+        entropy, streams) compute in float64.
+    jit: compiled (numba) kernels of the [information rate] histogram path (see _NumbaKernels); boolean. Default is False.
+        The kernels go from the windows to the [information rate] without the PDF arrays. If numba is not installed,
+        the functions run the NumPy path (same results up to rounding).
+
+usage:
+    ig.set_execution(backend='thread', n_jobs=4)
+    with ig.execution(backend='serial', blas_threads=1):
+        ig.lead_eigvec_cal(matrix_data)
+    with ig.execution(dtype=np.float32):
+        ig.fix_collect_inforate_square(data, time_data)
+
+"""
+
+import numpy as np
+
+from numpy.lib.stride_tricks import as_strided
+
+from contextlib import contextmanager, nullcontext, ExitStack
+from contextvars import ContextVar
+
+_BACKENDS = {'serial': 'sequential', 'thread': 'threading', 'process': 'loky'}
+_GLOBAL_EXECUTION = {'backend': 'process', 'n_jobs': -1, 'batch_size': 'auto', 'blas_threads': None, 'dtype': np.float64, 'jit': False}
+_LOCAL_EXECUTION = ContextVar('info_geo_execution', default={})
+_WORKER_OPTIONS = ('dtype', 'jit') # options given to the jobs of parallel_run()
+
+def check_execution(options):
+    for temp_key in options:
+        assert temp_key in _GLOBAL_EXECUTION, f'{temp_key}: unknown option; backend, n_jobs, batch_size, blas_threads, dtype, or jit is expected.'
+    if 'backend' in options:
+        assert options['backend'] in _BACKENDS, 'backend: serial, thread, or process is expected; default is process.'
+    if 'n_jobs' in options:
+        assert isinstance(options['n_jobs'], int) and (options['n_jobs'] != 0), 'n_jobs: number of workers. Non-zero integer is expected; default is -1.'
+    if 'batch_size' in options:
+        assert (options['batch_size'] == 'auto') or (isinstance(options['batch_size'], int) and (options['batch_size'] > 0)), 'batch_size: tasks given to a worker at once. Integer or auto is expected; default is auto.'
+    if 'blas_threads' in options:
+        assert (options['blas_threads'] is None) or (isinstance(options['blas_threads'], int) and (options['blas_threads'] > 0)), 'blas_threads: cap of the BLAS threads. Integer or None is expected; default is None.'
+    if 'dtype' in options:
+        assert np.dtype(options['dtype']) in (np.float32, np.float64), 'dtype: numpy.float64 or numpy.float32 is expected; default is numpy.float64.'
+    if 'jit' in options:
+        assert isinstance(options['jit'], bool), 'jit: compiled (numba) kernels of the information rate. Boolean is expected; default is False.'
+
+def set_execution(**options):
+    check_execution(options)
+    _GLOBAL_EXECUTION.update(options)
+
+def get_execution():
+    temp_execution = dict(_GLOBAL_EXECUTION)
+    temp_execution.update(_LOCAL_EXECUTION.get())
+    return temp_execution
+
+@contextmanager
+def execution(**options):
+    check_execution(options)
+    temp_options = dict(_LOCAL_EXECUTION.get())
+    temp_options.update(options)
+    temp_token = _LOCAL_EXECUTION.set(temp_options)
+    try:
+        yield get_execution()
+    finally:
+        _LOCAL_EXECUTION.reset(temp_token)
+
+# floating point type of the computation; the given dtype, or the dtype of the execution configuration
+def working_dtype(dtype=None):
+    return np.dtype(get_execution()['dtype'] if dtype is None else dtype)
+
+# given data as numpy.array of the working dtype (no copy if it is already of the dtype)
+def as_working(data, dtype=None):
+    data = np.asarray(data)
+    temp_dtype = working_dtype(dtype)
+    return data if data.dtype == temp_dtype else data.astype(temp_dtype)
+
+# compiled kernels (module) if jit is set and numba is installed; None otherwise (NumPy path)
+def jit_kernels():
+    if not get_execution()['jit']:
+        return None
+    from info_geo import _NumbaKernels
+    return _NumbaKernels if _NumbaKernels.NUMBA_AVAILABLE else None
+
+# job of parallel_run(); run with the options of the caller (e.g. dtype)
+def job_with_execution(options, function, args, kwargs):
+    with execution(**options):
+        return function(*args, **kwargs)
+
+# run the joblib delayed jobs with the current execution configuration; list of the results is returned.
+def parallel_run(jobs):
+    # joblib (and threadpoolctl) are loaded at the first parallel call, not at the import of info_geo.
+    from joblib import Parallel, parallel_config
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        threadpool_limits = None
+
+    temp_execution = get_execution()
+    temp_options = {temp_key: temp_execution[temp_key] for temp_key in _WORKER_OPTIONS}
+    temp_backend = _BACKENDS[temp_execution['backend']]
+    temp_n_jobs = 1 if temp_backend == 'sequential' else temp_execution['n_jobs']
+    temp_blas = temp_execution['blas_threads']
+
+    if temp_backend == 'loky':
+        temp_config = parallel_config(backend=temp_backend, n_jobs=temp_n_jobs, inner_max_num_threads=temp_blas)
+        temp_limits = nullcontext()
+    else:
+        temp_config = parallel_config(backend=temp_backend, n_jobs=temp_n_jobs)
+        temp_limits = threadpool_limits(limits=temp_blas) if (temp_blas is not None) and (threadpool_limits is not None) else nullcontext()
+
+    with temp_config, temp_limits:
+        return Parallel(batch_size=temp_execution['batch_size'])((job_with_execution, (temp_options, temp_function, temp_args, temp_kwargs), {}) for temp_function, temp_args, temp_kwargs in jobs)
+
+# blocks of the task index (start, stop); about 4 blocks per worker, so every job of shared_run() has enough work
+def task_blocks(n_tasks, min_block=1):
+    from joblib import effective_n_jobs
+
+    temp_execution = get_execution()
+    temp_n_jobs = 1 if temp_execution['backend'] == 'serial' else effective_n_jobs(temp_execution['n_jobs'])
+    temp_size = max(min_block, -(-n_tasks//(4*temp_n_jobs)))
+    return [(temp_start, min(temp_start + temp_size, n_tasks)) for temp_start in range(0, n_tasks, temp_size)]
+
+# array in a new shared memory block (closed and unlinked by the stack); (name, shape, dtype, strides) is returned.
+def share_array(data, stack):
+    from multiprocessing.shared_memory import SharedMemory
+
+    data = np.asarray(data)
+    if (data.size == 0) or any((temp_stride < 0) or (temp_stride % data.itemsize) for temp_stride in data.strides):
+        data = np.ascontiguousarray(data)
+
+    # items spanned by the (strided) view from its first element; a sliding window view spans its signal once.
+    # A view that spans much more than its own elements (e.g. a column of a [L x N] array) is shared as a copy.
+    temp_items = 1 + sum((temp_n - 1)*temp_stride for temp_n, temp_stride in zip(data.shape, data.strides))//data.itemsize if data.size > 0 else 0
+    if temp_items*data.itemsize > 2*data.nbytes:
+        data = np.ascontiguousarray(data)
+        temp_items = data.size
+    temp_shm = SharedMemory(create=True, size=max(temp_items*data.itemsize, 1))
+    stack.callback(temp_shm.unlink)
+    stack.callback(close_shared, temp_shm)
+
+    temp_flat = np.ndarray((temp_items,), dtype=data.dtype, buffer=temp_shm.buf)
+    if temp_items > 0:
+        temp_flat[:] = as_strided(data, shape=(temp_items,), strides=(data.itemsize,))
+    del temp_flat
+
+    return temp_shm.name, data.shape, data.dtype.str, data.strides
+
+# closing of the attached shared memory; if a view is still referenced (e.g. by the traceback of an error),
+# the memory is unmapped when the view is released.
+def close_shared(shm):
+    try:
+        shm.close()
+    except BufferError:
+        pass
+
+# view of the shared array (name, shape, dtype, strides); the shared memory is attached to the stack
+def attach_array(shared, stack):
+    from multiprocessing.shared_memory import SharedMemory
+
+    temp_name, temp_shape, temp_dtype, temp_strides = shared
+    temp_shm = SharedMemory(name=temp_name)
+    stack.callback(close_shared, temp_shm)
+    return np.ndarray(temp_shape, dtype=temp_dtype, buffer=temp_shm.buf, strides=temp_strides)
+
+# job of shared_run() with the process backend; the views are released before the shared memory is closed
+def job_shared(function, out, inputs, task):
+    with ExitStack() as temp_stack:
+        temp_out = attach_array(out, temp_stack)
+        temp_inputs = [None if temp_shared is None else attach_array(temp_shared, temp_stack) for temp_shared in inputs]
+        try:
+            function(temp_out, *temp_inputs, *task)
+        finally:
+            del temp_out, temp_inputs
+
+# run function(out, *inputs, *task) for every task with the current execution configuration; every job writes its
+# result into out (preallocated output [out_shape] of out_dtype, filled with fill) and out is returned.
+# inputs are numpy.arrays (or None) shared by all the jobs; task is a tuple of the small arguments of the job.
+def shared_run(function, tasks, inputs, out_shape, out_dtype, fill=np.nan):
+    temp_tasks = [tuple(temp_task) for temp_task in tasks]
+    if get_execution()['backend'] != 'process':
+        temp_out = np.full(out_shape, fill, dtype=out_dtype)
+        parallel_run((function, (temp_out, *inputs, *temp_task), {}) for temp_task in temp_tasks)
+        return temp_out
+
+    with ExitStack() as temp_stack:
+        temp_shared = share_array(np.full(out_shape, fill, dtype=out_dtype), temp_stack)
+        temp_inputs = [None if temp_input is None else share_array(temp_input, temp_stack) for temp_input in inputs]
+        parallel_run((job_shared, (function, temp_shared, temp_inputs, temp_task), {}) for temp_task in temp_tasks)
+
+        temp_view = attach_array(temp_shared, temp_stack)
+        temp_out = temp_view.copy()
+        del temp_view
+
+    return temp_out
@@ -19,8 +19,8 @@ import numpy as np
 
 
 def fft_power(fft_amp, fft_freq, freq_range):
-    fft_amp = np.array(fft_amp) #make the fft_amp to numpy.array
-    fft_freq = np.array(fft_freq) #make the fft_freq to numpy.array
+    fft_amp = np.asarray(fft_amp) #make the fft_amp to numpy.array
+    fft_freq = np.asarray(fft_freq) #make the fft_freq to numpy.array
     
     assert len(fft_amp.shape) == 2, 'fft_amp: magnitude of the fft spectrum needs to be 2D array; Nxf, N=number of channels, f=frequency index. '
     assert len(fft_freq.shape) == 1, 'fft_freq: frequency fo the fft spectrum ONLY has 1D array.'
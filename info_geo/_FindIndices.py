@@ -9,8 +9,8 @@ Created on Thu Jul 25 17:20:23 2024
 import numpy as np 
 
 def find_indices(original, subset):
-    original_array = np.array(original)
-    subset_array = np.array(subset)
+    original_array = np.asarray(original)
+    subset_array = np.asarray(subset)
     
     # Create a sorted version of the original array and get the sorting indices
     sorted_indices = np.argsort(original_array)
@@ -16,6 +16,8 @@ parameters:
     entro_bins: bins size of the distribution for shannon entropy calculation. Integer is expected; default is 10.
     base: base for the shannon entropy calculation. Integer or float is expected; default is 2.
     norm: normalization of the shannon entropy. Boolean is expected; default is True.
+    density: density estimator for the information rate calculation; histogram, ash, or kde. Default is histogram.
+    block_size: block size of the blockwise hilbert transform (see unwrapped_phase()). Integer or None (whole signal) is expected; default is None.
     
 return: 
     float: temp_infoentropy; 2D information rate Shannon entropy.
@@ -27,14 +29,49 @@ return:
 import numpy as np
 import info_geo as ig
 
-from scipy.signal import hilbert 
 from scipy.stats import entropy
 from numpy.lib.stride_tricks import sliding_window_view
+from info_geo._Profiling import stage
+from info_geo._DensityEstimator import check_density
+from info_geo._Cache import cached_stage
+from info_geo._AnalyticSignal import unwrapped_phase
+from info_geo._ExecConfig import working_dtype
 
-def fix2d_phase_inforate_shannon_entro(sig1, sig2, time, win=10, sld=2, bins=50, int_range=1.05, entro_bins=10, base=2, norm=True):
-    sig1 = np.array(sig1)
-    sig2 = np.array(sig2)
-    time = np.array(time)
+# cos of the hilbert phase of both signals (cached stage; see cache_stages())
+def fix2d_phase_angle(sig1, sig2, block_size=None):
+    with stage('hilbert', 'fix2d_phase_inforate_shannon_entro', 2*sig1.shape[0]):
+        # both signals are transformed in one batch
+        instance_phase = unwrapped_phase(np.stack((sig1, sig2)), block_size=block_size)
+
+        # the phase is unwrapped in float64 (it grows with the time); cos is given in the working dtype
+        instance_phase_angle1 = np.cos(instance_phase[0]).astype(working_dtype(), copy=False)
+        instance_phase_angle2 = np.cos(instance_phase[1]).astype(working_dtype(), copy=False)
+
+    return instance_phase_angle1, instance_phase_angle2
+
+# 2D information rate series of the phase (cached stage; see cache_stages())
+def fix2d_phase_inforate(sig1, sig2, time, win, sld, bins, int_range, density, block_size=None):
+    instance_phase_angle1, instance_phase_angle2 = cached_stage('fix2d_phase_angle', lambda: fix2d_phase_angle(sig1, sig2, block_size=block_size), [sig1, sig2], dict(block_size=block_size))
+
+    int_win = win
+    int_sld = sld
+
+    with stage('windowing', 'fix2d_phase_inforate_shannon_entro', 2*sig1.shape[0]):
+        instance_phase_angle_slide1 = sliding_window_view(instance_phase_angle1, window_shape=int_win)
+        instance_phase_angle_slide2 = sliding_window_view(instance_phase_angle2, window_shape=int_win)
+
+        instance_phase_angle_slide1 = instance_phase_angle_slide1[::int_sld, :]
+        instance_phase_angle_slide2 = instance_phase_angle_slide2[::int_sld, :]
+
+        time_slide = sliding_window_view(time, window_shape=int_win)
+        time_slide = time_slide[::int_sld, :]
+
+    return ig.fix_double_inforate_square(np.expand_dims(instance_phase_angle_slide1, axis=0), np.expand_dims(instance_phase_angle_slide2, axis=0), time_slide, int_bins=bins, int_range=int_range, density=density)
+
+def fix2d_phase_inforate_shannon_entro(sig1, sig2, time, win=10, sld=2, bins=50, int_range=1.05, entro_bins=10, base=2, norm=True, density='histogram', block_size=None):
+    sig1 = np.asarray(sig1)
+    sig2 = np.asarray(sig2)
+    time = np.asarray(time)
 
     sig1 = np.squeeze(sig1)
     sig2 = np.squeeze(sig2)
@@ -52,29 +89,12 @@ def fix2d_phase_inforate_shannon_entro(sig1, sig2, time, win=10, sld=2, bins=50,
     assert isinstance(entro_bins, int), 'entro_bins: bins size of the distribution for shannon entropy calculation. Integer is expected; default is 10.'
     assert isinstance(base, (int, float)), 'base: base for the shannon entropy calculation. Integer or float is expected; default is 2.'
     assert isinstance(norm, bool), 'norm: normalization of the shannon entropy. Boolean is expected; default is True.'
+    check_density(density)
+    assert (block_size is None) or (isinstance(block_size, int) and (block_size > 0)), 'block_size: block size of the blockwise hilbert transform. Integer or None is expected; default is None.'
 
-    analy_sig1 = hilbert(sig1)
-    analy_sig2 = hilbert(sig2)
-
-    instance_phase1 = np.unwrap(np.angle(analy_sig1, deg=False))
-    instance_phase2 = np.unwrap(np.angle(analy_sig2, deg=False))
-
-    instance_phase_angle1 = np.cos(instance_phase1)
-    instance_phase_angle2 = np.cos(instance_phase2)
-
-    int_win = win
-    int_sld = sld
-
-    instance_phase_angle_slide1 = sliding_window_view(instance_phase_angle1, window_shape=int_win)
-    instance_phase_angle_slide2 = sliding_window_view(instance_phase_angle2, window_shape=int_win)
-
-    instance_phase_angle_slide1 = instance_phase_angle_slide1[::int_sld, :]
-    instance_phase_angle_slide2 = instance_phase_angle_slide2[::int_sld, :]
-
-    time_slide = sliding_window_view(time, window_shape=int_win)
-    time_slide = time_slide[::int_sld, :]
-
-    temp_infosquare, temp_infotime = ig.fix_double_inforate_square(np.expand_dims(instance_phase_angle_slide1, axis=0), np.expand_dims(instance_phase_angle_slide2, axis=0), time_slide, int_bins=bins, int_range=int_range)
+    # the information rate series depends on the signals, win, sld, bins, int_range, density and block_size only;
+    # it is reused from the cache (if active) when only entro_bins, base or norm are changed.
+    temp_infosquare, temp_infotime = cached_stage('fix2d_phase_inforate', lambda: fix2d_phase_inforate(sig1, sig2, time, win, sld, bins, int_range, density, block_size=block_size), [sig1, sig2, time], dict(win=win, sld=sld, bins=bins, int_range=int_range, density=density, block_size=block_size))
 
     '''rice_bins_info = int(np.ceil(2 * temp_infosquare.shape[0]**(1/3)))
     print(f'rice rule: {rice_bins_info}')'''
@@ -87,7 +107,6 @@ def fix2d_phase_inforate_shannon_entro(sig1, sig2, time, win=10, sld=2, bins=50,
         temp_infoentropy = entropy(pmf_info, base=base)/(entropy(np.ones(pmf_info.shape[0])/pmf_info.shape[0], base=base))
     elif norm==False:
         temp_infoentropy = entropy(pmf_info, base=base)
-    print(f'inforate_entropy: {temp_infoentropy}')
 
     inforate_all_data = np.vstack((temp_infosquare, temp_infotime)).T
     inforate_all_pmf = np.vstack((pmf_info, range_info)).T
@@ -8,6 +8,7 @@ Created on Wed Jul 10 15:07:25 2024
 This code compute the information rate square for 2D distribution at the fix range. 
 This code can accommodate two data with different shapes. 
 The bins size and the range of the distribution allow two different value instead of just one single bins size or range of distribution. 
+All the windows share the same bin edges (fix range), so they are binned in one batched call instead of one job per window. 
 
 Return the information rate square for 2D distribution. 
 
@@ -17,6 +18,7 @@ parameters:
     time: array of time data with 2 dimensions; TxW, T=time index, W=window of data. 
     int_bins: bins size of the distribution estimation; it should be integer, 2-tuple, 2-list. Default is 30.
     int_range: range of the distribution estimationl; it should be integer, 2-tuple, 2-list. Default is 1.05.
+    density: density estimator of the distribution; histogram, ash (averaged shifted histogram), or kde (binned FFT-KDE). Default is histogram.
     
 return: 
     numpy.ndarray: information rate square
@@ -26,43 +28,15 @@ return:
 
 import numpy as np
 
-from joblib import Parallel, delayed
-
-# PDF estimation through histogram
-def histogram2d_func(data1, data2, int_range=1.05, int_bins=30):
-    assert isinstance(data1, (np.ndarray)), 'data1: given data should be in numpy.array.'
-    assert len(data1.shape) == 2, 'data1: given data should have two dimensions of sampled data; CxW, C=channel, W=window of data.'
-    assert isinstance(data2, (np.ndarray)), 'data2: given data should be in numpy.array.'
-    assert len(data2.shape) == 2, 'data2: given data should have two dimensions of sampled data; CxW, C=channel, W=window of data.'
-    assert (type(int_range)==int) or (type(int_range)==float) or (type(int_range)==tuple) or (type(int_range)==list), 'int_range: range of the distribution should be in integer, float, tuple, or list; default is 1.05.'
-    assert (type(int_bins)==int) or (type(int_bins)==tuple) or (type(int_bins)==list), 'int_bins: bins size of the distribution can be integer, tuple, or list; default is 30.'
-
-    # make the data to be same size by duplicate the data till it has same size. 
-    if data1.shape != data2.shape: 
-        temp_data1 = np.tile(data1, (data2.shape[0], 1))
-        temp_data2 = np.tile(data2, (data1.shape[0], 1))
-    else: 
-        temp_data1 = data1 
-        temp_data2 = data2
-
-    if (type(int_range)==tuple) or (type(int_range)==list): 
-        int_range1 = int_range[0]
-        int_range2 = int_range[1]
-    else: 
-        int_range1 = int_range 
-        int_range2 = int_range
-
-    temp_pdf, temp_rangex, temp_rangey = np.histogram2d(temp_data1.flatten(), temp_data2.flatten(), range=((-1*int_range1, int_range1), (-1*int_range2, int_range2)), bins=int_bins, density=True)
-    temp_rangex = (temp_rangex[1:] + temp_rangex[:-1])/2
-    temp_rangey = (temp_rangey[1:] + temp_rangey[:-1])/2
-    
-    return temp_pdf, temp_rangex, temp_rangey
+from info_geo._DensityEstimator import batch_density2d, check_density
+from info_geo._Profiling import stage
+from info_geo._ExecConfig import as_working, jit_kernels
 
 # Compute the [information rate]
-def fix_double_inforate_square(data1, data2, time_data, int_bins=30, int_range=1.05):
-    data1 = np.array(data1)
-    data2 = np.array(data2)
-    time_data = np.array(time_data)
+def fix_double_inforate_square(data1, data2, time_data, int_bins=30, int_range=1.05, density='histogram'):
+    data1 = as_working(data1)
+    data2 = as_working(data2)
+    time_data = np.asarray(time_data)
     
     assert isinstance(data1, (np.ndarray)), 'data1: given data should be in numpy.array.'
     assert len(data1.shape) == 3, 'data1: given data should have 3 dimensions; CxTxW, C=channel, T=time index, W=window of data.'
@@ -76,26 +50,41 @@ def fix_double_inforate_square(data1, data2, time_data, int_bins=30, int_range=1
     assert data2.shape[2]==time_data.shape[1], 'BOTH data2 and time_data should have the same sliding window.'
     assert (type(int_bins)==int) or (type(int_bins)==tuple) or (type(int_bins)==list), 'int_bins: bins size of the distribution; integer, tuple, or list is expected.'
     assert (type(int_range)==float) or (type(int_range)==int) or (type(int_range)==tuple) or (type(int_range)==list), 'int_range: range of the distribution; float, integer, tuple, or list is expected. Default is 1.05.'
+    check_density(density)
 
-    # estimate the series of distribution 
-    '''
-    given data1 and data2 need to have the same sliding window.
-    '''
-    if data1.shape[1] == data2.shape[1]: 
-        temp_pdf2d_array, temp_rangex_array, temp_rangey_array = zip(*Parallel(n_jobs=-1)(delayed(histogram2d_func)(data1[:, i, :], data2[:, i, :], int_range=int_range, int_bins=int_bins) for i in range(data1.shape[1])))
-    else: 
-        print('Sliding window of two signals must be the same.')
+    if (type(int_range)==tuple) or (type(int_range)==list):
+        int_range1 = int_range[0]
+        int_range2 = int_range[1]
+    else:
+        int_range1 = int_range
+        int_range2 = int_range
 
-    temp_pdf2d_array = np.array(temp_pdf2d_array)
-    temp_rangex_array = np.array(temp_rangex_array)
-    temp_rangey_array = np.array(temp_rangey_array)
+    # compiled kernel (jit, see set_execution()): from the windows to the information rate, no PDF array.
+    # The different number of channels (tiled pairing) runs the NumPy path.
+    temp_kernels = jit_kernels()
+    if (temp_kernels is not None) and (density=='histogram') and (data1.shape == data2.shape):
+        temp_binsx, temp_binsy = (int_bins[0], int_bins[1]) if (type(int_bins)==tuple) or (type(int_bins)==list) else (int_bins, int_bins)
+        with stage('fused', 'fix_double_inforate_square', data1.size + data2.size):
+            temp_lo1, temp_hi1 = temp_kernels.kernel_ranges(-1*int_range1, int_range1, data1.shape[1] - 1)
+            temp_lo2, temp_hi2 = temp_kernels.kernel_ranges(-1*int_range2, int_range2, data1.shape[1] - 1)
+            temp_sum = temp_kernels.inforate2d_sqrt_diff(data1, data2, temp_lo1, temp_hi1, temp_lo2, temp_hi2, temp_binsx, temp_binsy)
+        delta_time_array = np.diff(time_data, axis=0)[0][0]
+        return (4 * temp_sum / (delta_time_array**2)).astype(np.result_type(data1.dtype, data2.dtype), copy=False), time_data[:-1, 0]
+
+    # estimate the series of distribution; all the windows share the same bin edges (fix range),
+    # so every window is binned at once into [T x binsx x binsy]. The different number of channels is
+    # paired as numpy.tile() does, without the tiled copies (see batch_density2d()).
+    with stage('histogram', 'fix_double_inforate_square', data1.size + data2.size):
+        temp_pdf2d_array, temp_dx, temp_dy = batch_density2d(np.moveaxis(data1, 1, 0), np.moveaxis(data2, 1, 0), -1*int_range1, int_range1, -1*int_range2, int_range2, int_bins, density=density)
 
     # information rate square calculation
-    diff_pdf2d_array = np.diff((temp_pdf2d_array)**(0.5), axis=0)
-    delta_rangex_array = np.diff(temp_rangex_array, axis=-1)[0][0]
-    delta_rangey_array = np.diff(temp_rangey_array, axis=-1)[0][0]
-    delta_time_array = np.diff(time_data, axis=0)[0][0]
-
-    temp_inforate_square2d = 4 * np.sum(diff_pdf2d_array**(2), axis=(1, 2)) * ((delta_rangex_array*delta_rangey_array)/(delta_time_array**2))
+    with stage('reduction', 'fix_double_inforate_square', temp_pdf2d_array.size):
+        diff_pdf2d_array = np.diff((temp_pdf2d_array)**(0.5), axis=0)
+        delta_rangex_array = temp_dx[0]
+        delta_rangey_array = temp_dy[0]
+        delta_time_array = np.diff(time_data, axis=0)[0][0]
+
+        temp_inforate_square2d = 4 * np.sum(diff_pdf2d_array**(2), axis=(1, 2), dtype=np.float64) * ((delta_rangex_array*delta_rangey_array)/(delta_time_array**2))
+        temp_inforate_square2d = temp_inforate_square2d.astype(temp_pdf2d_array.dtype, copy=False)
 
     return temp_inforate_square2d, time_data[:-1, 0]
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:28:35 2026
+
+@author: agent
+
+Streaming [information rate] for a live signal at the fix range. The raw samples are given chunk
+by chunk and the information rate square is returned once the windows are completed. It gives
+the same values as fix_single_inforate_square() (one channel) or fix_collect_inforate_square()
+(collective channels) on sliding_window_view(signal, win)[::sld].
+
+Since the range is fixed, the bin index of every sample is computed once when it enters. The bin
+counts of the window are updated by adding the entering samples and removing the leaving samples,
+so one chunk costs O(C x chunk) for the counts and O(bins) for every completed window.
+
+parameters:
+    win: window size of the sliding window. Integer is expected; default is 10.
+    sld: sliding of the sliding window. Integer is expected; default is 2.
+    int_bins: bins size of the distribution estimation; it should be integer. Default is 30.
+    int_range: range of the distribution estimation; integer, float (-int_range to int_range), 2-tuple or 2-list. Default is 1.05.
+    n_channels: number of channels; the distribution is sampled at the ensemble of channels. Integer is expected; default is 1.
+
+update() parameters:
+    chunk: array of the new samples; CxS or S, C=# channels, S=samples.
+    time_chunk: array of time for the new samples in 1 dimension; S.
+
+update() return:
+    numpy.ndarray: information rate square of the completed windows
+    numpy.ndarray: time
+
+"""
+
+import numpy as np
+
+from info_geo._BatchHistogram import batch_bin_indices
+
+class FixInforateStream:
+    def __init__(self, win=10, sld=2, int_bins=30, int_range=1.05, n_channels=1):
+        assert isinstance(win, int) and (win > 0), 'win: window size of the sliding window. Integer is expected; default is 10.'
+        assert isinstance(sld, int) and (sld > 0), 'sld: sliding of the sliding window. Integer is expected; default is 2.'
+        assert isinstance(int_bins, int), 'int_bins: bin size of the distribution; integer is expected.'
+        assert (type(int_range)==int) or (type(int_range)==float) or (type(int_range)==tuple) or (type(int_range)==list), 'int_range: range of the distribution should be in integer, float, tuple, or list; default is 1.05.'
+        assert isinstance(n_channels, int) and (n_channels > 0), 'n_channels: number of channels. Integer is expected; default is 1.'
+
+        if (type(int_range)==list) or (type(int_range)==tuple):
+            self.range_lo = np.min(int_range)
+            self.range_hi = np.max(int_range)
+        else:
+            self.range_lo = -1*int_range
+            self.range_hi = int_range
+
+        self.win = win
+        self.sld = sld
+        self.int_bins = int_bins
+        self.n_channels = n_channels
+        self.reset()
+
+    def reset(self):
+        # the extra bin (last bin) collects the samples outside the range and the empty start of the window.
+        self._tail = np.full((self.n_channels, self.win), self.int_bins, dtype=np.intp)
+        self._counts = np.zeros(self.int_bins + 1, dtype=np.int64)
+        self._position = 0 # number of samples received
+        self._next_window = 0 # index of the next window to be completed
+        self._starts = np.zeros(0) # start time of the windows; index 0 is the window [_first_start]
+        self._first_start = 0
+        self._last_pdf = None # square root of the PDF of the last completed window
+
+    def update(self, chunk, time_chunk):
+        chunk = np.asarray(chunk)
+        time_chunk = np.asarray(time_chunk)
+        if chunk.ndim == 1:
+            chunk = chunk[None, :]
+
+        assert chunk.ndim == 2, 'chunk: given chunk should have 2 dimensions; CxS, C=# channels, S=samples.'
+        assert chunk.shape[0] == self.n_channels, 'chunk: given chunk should have the same number of channels as n_channels.'
+        assert time_chunk.ndim == 1, 'time_chunk: given time should have 1 dimension; S=samples.'
+        assert chunk.shape[1] == time_chunk.shape[0], 'BOTH chunk and time_chunk should have the same number of samples.'
+
+        temp_n = chunk.shape[1]
+        temp_slots = self.int_bins + 1
+
+        # bin index of the entering samples
+        temp_enter = batch_bin_indices(chunk, self.range_lo, self.range_hi, self.int_bins)
+        temp_enter[temp_enter < 0] = self.int_bins
+        temp_full = np.concatenate((self._tail, temp_enter), axis=1)
+        temp_leave = temp_full[:, :temp_n]
+
+        # start time of the windows starting within this chunk
+        temp_position = self._position + np.arange(temp_n)
+        self._starts = np.concatenate((self._starts, time_chunk[temp_position % self.sld == 0]))
+
+        # chunk offset at which the windows are completed
+        temp_total = self._position + temp_n
+        temp_num = max(0, (temp_total - self.win)//self.sld + 1 - self._next_window)
+        temp_ends = (self._next_window + np.arange(temp_num))*self.sld + self.win - self._position
+
+        # counts of every completed window: the running counts plus the entering minus the leaving samples before its end
+        temp_segment = np.broadcast_to(np.searchsorted(temp_ends, np.arange(temp_n), side='right'), chunk.shape)
+        temp_delta = np.bincount((temp_segment*temp_slots + temp_enter).ravel(), minlength=(temp_num + 1)*temp_slots)
+        temp_delta = temp_delta - np.bincount((temp_segment*temp_slots + temp_leave).ravel(), minlength=(temp_num + 1)*temp_slots)
+        temp_counts = self._counts + np.cumsum(temp_delta.reshape(temp_num + 1, temp_slots), axis=0)
+
+        self._counts = temp_counts[-1]
+        self._tail = temp_full[:, -self.win:]
+        self._position = temp_total
+
+        if temp_num == 0:
+            return np.zeros(0), np.zeros(0)
+
+        # PDF of the completed windows
+        temp_counts = temp_counts[:-1, :-1]
+        temp_dx = (self.range_hi - self.range_lo)/self.int_bins
+        with np.errstate(divide='ignore', invalid='ignore'):
+            temp_pdf_square = np.sqrt(temp_counts/np.sum(temp_counts, axis=-1, keepdims=True)/temp_dx)
+
+        if self._last_pdf is not None:
+            temp_pdf_square = np.concatenate((self._last_pdf[None, :], temp_pdf_square), axis=0)
+            temp_first = self._next_window - 1
+        else:
+            temp_first = self._next_window
+
+        temp_time = self._starts[temp_first - self._first_start: self._next_window + temp_num - self._first_start]
+
+        self._last_pdf = temp_pdf_square[-1]
+        self._next_window += temp_num
+        self._starts = self._starts[self._next_window - 1 - self._first_start:]
+        self._first_start = self._next_window - 1
+
+        #information rate square calculation
+        diff_pdf_square = np.diff(temp_pdf_square, axis=0)
+        diff_time = np.diff(temp_time)
+        inforate_data = 4 * np.sum(diff_pdf_square**(2), axis=-1) * (temp_dx / (diff_time**2))
+
+        return inforate_data, temp_time[:-1]
@@ -14,6 +14,7 @@ parameters:
     time: array of time data with 2 dimensions; TxW, T=time index, W=window of data. 
     int_bins: bins size of the distribution estimation; it should be integer, 2-tuple, 2-list. Default is 30.
     int_range: range of the distribution estimationl; it should be integer, 2-tuple, 2-list. Default is 1.05.
+    density: density estimator of the distribution; histogram, ash (averaged shifted histogram), or kde (binned FFT-KDE). Default is histogram.
     
 return: 
     numpy.ndarray: information rate square
@@ -23,22 +24,14 @@ return:
 
 import numpy as np
 
-# PDF estimation through histogram
-def histogram_func(data, int_range=1.05, int_bins=30):
-    assert isinstance(data, (np.ndarray)), 'data: given data should be in numpy.array.'
-    assert len(data.shape) == 1, 'data: given data should only have one dimension of sampled data.'
-    assert isinstance(int_range, (int, float)), 'int_range: range of the distribution should be in integer or float number; default is 1.05.'
-    assert isinstance(int_bins, (int)), 'int_bins: bins size of the distribution should be in integer; default is 30.'
-
-    temp_pdf, temp_range = np.histogram(data, range=(-1*int_range, int_range), bins=int_bins, density=True)
-    temp_range = (temp_range[1:] + temp_range[:-1])/2
-    
-    return temp_pdf, temp_range
+from info_geo._Profiling import stage
+from info_geo._DensityEstimator import batch_density, check_density
+from info_geo._ExecConfig import as_working, jit_kernels
 
 # Compute the [information rate]
-def fix_single_inforate_square(data, time_data, int_bins=30, int_range=1.05):
-    data = np.array(data)
-    time_data = np.array(time_data)
+def fix_single_inforate_square(data, time_data, int_bins=30, int_range=1.05, density='histogram'):
+    data = as_working(data)
+    time_data = np.asarray(time_data)
     
     assert isinstance(data, (np.ndarray)), 'data: given data should be in numpy.array.'
     assert len(data.shape) == 2, 'data: given data should have 2 dimensions; TxW.'
@@ -48,17 +41,28 @@ def fix_single_inforate_square(data, time_data, int_bins=30, int_range=1.05):
     #assert data.shape[1]==time_data.shape[1], 'BOTH data and time_data should have the same sliding window.'
     assert isinstance(int_bins, (int)), 'int_bins: bin size of the distribution; integer is expected.'
     assert isinstance(int_range, (float, int)), 'int_range: range of the distribution; float or integer is expected. Default is 1.05.'
+    check_density(density)
+
+    # compiled kernel (jit, see set_execution()): from the windows to the information rate, no PDF array
+    temp_kernels = jit_kernels()
+    if (temp_kernels is not None) and (density=='histogram'):
+        with stage('fused', 'fix_single_inforate_square', data.size):
+            temp_lo, temp_hi = temp_kernels.kernel_ranges(-1*int_range, int_range, data.shape[0] - 1)
+            temp_sum = temp_kernels.inforate_sqrt_diff(data[None], temp_lo, temp_hi, int_bins)
+        diff_time = np.diff(time_data, axis=0)[0][0]
+        return (4 * temp_sum / (diff_time**2)).astype(data.dtype, copy=False), time_data[:-1, 0]
 
     #Probability distribution estimation
-    temp_pdf_chnl, temp_range_chnl = zip(*np.apply_along_axis(histogram_func, axis=-1, arr=data, int_range=int_range, int_bins=int_bins))
-    temp_pdf_chnl = np.array(temp_pdf_chnl)
-    temp_range_chnl = np.array(temp_range_chnl)
+    with stage('histogram', 'fix_single_inforate_square', data.size):
+        temp_pdf_chnl, temp_dx = batch_density(data, -1*int_range, int_range, int_bins, density=density)
     
     #information rate square calculation 
-    temp_pdf_chnl_square = np.sqrt(temp_pdf_chnl)
-    diff_pdf_chnl_square = np.diff(temp_pdf_chnl_square, axis=0)
-    diff_range = np.diff(temp_range_chnl, axis=1)[0][0]
-    diff_time = np.diff(time_data, axis=0)[0][0]
-    inforate_data = 4 * np.sum(diff_pdf_chnl_square**(2), axis=-1) * (diff_range / (diff_time**2))
+    with stage('reduction', 'fix_single_inforate_square', temp_pdf_chnl.size):
+        temp_pdf_chnl_square = np.sqrt(temp_pdf_chnl)
+        diff_pdf_chnl_square = np.diff(temp_pdf_chnl_square, axis=0)
+        diff_range = temp_dx[0]
+        diff_time = np.diff(time_data, axis=0)[0][0]
+        inforate_data = 4 * np.sum(diff_pdf_chnl_square**(2), axis=-1, dtype=np.float64) * (diff_range / (diff_time**2))
+        inforate_data = inforate_data.astype(temp_pdf_chnl.dtype, copy=False)
     
     return inforate_data, time_data[:-1, 0]
@@ -9,11 +9,30 @@ Hjorth parameters calculation for window slided signals.
 
 Return Hjorth parameters for the window slided signals. 
 
+hjorth_paras() computes the first and second derivatives and their variances once, and the activity, 
+mobility and complexity are formed from these three variances. 
+
+hjorth_paras_raw() works directly on the raw signal [N x L] with the window and slide, same as 
+sliding_window_view(signal, win)[::sld]. The sums of x, x', x'' and their squares over every window 
+are taken from the prefix sums, so the sliding window tensor is not needed. Same as hjorth_paras(), 
+the derivatives are divided by the time between two consecutive windows. The signal is centered by 
+its mean before the prefix sums; the relative error of the variances is about 1e-16 x (L/win) x 
+(variance of the whole signal / variance of the window). 
+
+The derivatives are in the floating point type of the data (see the dtype option of set_execution()); 
+the variances and the prefix sums accumulate in float64. 
+
 parameters:
     data: data of the signal 
     time: data of the time 
     axis_data: axis at which the data is evaluated. Mainly for the numpy.diff(); default is -1.
     axis_time: axis at which the time is evaluated. Mainly for the numpy.diff(); default is 0.
+    
+hjorth_paras_raw() parameters:
+    signal: raw signal in 2 dimensions [N x L] (or 1 dimension [L]); N=# channels, L=samples.
+    time: raw time in 1 dimension [L].
+    win: window size of the sliding window. Integer is expected.
+    sld: sliding of the sliding window. Integer is expected; default is 1.
 
 return: 
     numpy.ndarray: complexity 
@@ -25,6 +44,8 @@ return:
 
 import numpy as np
 
+from info_geo._ExecConfig import as_working
+
 def hjorth_act(data, time, axis_data=-1, axis_time=0):
     assert isinstance(data, np.ndarray), 'data: given data should be in numpy.array'
     assert len(data.shape) == 3, 'data: given data should be in 3 dimensions; CxTxW, C=# channels, T=time index, W=window of data.'
@@ -35,7 +56,8 @@ def hjorth_act(data, time, axis_data=-1, axis_time=0):
     assert isinstance(axis_data, int), 'axis_data: axis that evaluate the parameter for DATA. Integer is needed; default is -1.'
     assert isinstance(axis_time, int), 'axis_time: axis that evaluate the parameter for TIME. Integer is needed; default is 0.'
 
-    temp_activity = np.var(data, axis=axis_data) 
+    data = as_working(data)
+    temp_activity = np.var(data, axis=axis_data, dtype=np.float64).astype(data.dtype, copy=False)
 
     return temp_activity, time[:, 0]
 
@@ -49,7 +71,8 @@ def hjorth_mob(data, time, axis_data=-1, axis_time=0):
     assert isinstance(axis_data, int), 'axis_data: axis that evaluate the parameter for DATA. Integer is needed; default is -1.'
     assert isinstance(axis_time, int), 'axis_time: axis that evaluate the parameter for TIME. Integer is needed; default is 0.'
 
-    temp_nume, _ = hjorth_act(data=(np.diff(data, axis=axis_data))/(np.diff(time, axis=axis_time)[0][0]), time=time, axis_data=axis_data, axis_time=axis_time)
+    data = as_working(data)
+    temp_nume, _ = hjorth_act(data=(np.diff(data, axis=axis_data))/data.dtype.type(np.diff(time, axis=axis_time)[0][0]), time=time, axis_data=axis_data, axis_time=axis_time)
     temp_deno, _ = hjorth_act(data, time, axis_data=axis_data, axis_time=axis_time)
 
     temp_mobility = np.sqrt((temp_nume)/(temp_deno))
@@ -66,13 +89,35 @@ def hjorth_com(data, time, axis_data=-1, axis_time=0):
     assert isinstance(axis_data, int), 'axis_data: axis that evaluate the parameter for DATA. Integer is needed; default is -1.'
     assert isinstance(axis_time, int), 'axis_time: axis that evaluate the parameter for TIME. Integer is needed; default is 0.'
 
-    temp_nume, _ = hjorth_mob(data=(np.diff(data, axis=axis_data))/(np.diff(time, axis=axis_time)[0][0]), time=time, axis_data=axis_data, axis_time=axis_time)
+    data = as_working(data)
+    temp_nume, _ = hjorth_mob(data=(np.diff(data, axis=axis_data))/data.dtype.type(np.diff(time, axis=axis_time)[0][0]), time=time, axis_data=axis_data, axis_time=axis_time)
     temp_deno, _ = hjorth_mob(data, time, axis_data=axis_data, axis_time=axis_time)
 
     temp_complexity = (temp_nume)/(temp_deno)
 
     return temp_complexity, time[:, 0]
 
+# variances of the signal, the first derivative, and the second derivative; accumulated in float64, given in the dtype of the data
+def hjorth_moments(data, time, axis_data=-1, axis_time=0):
+    temp_dt = data.dtype.type(np.diff(time, axis=axis_time)[0][0])
+    temp_diff1 = np.diff(data, axis=axis_data)/temp_dt
+    temp_diff2 = np.diff(temp_diff1, axis=axis_data)/temp_dt
+
+    return tuple(np.var(temp_data, axis=axis_data, dtype=np.float64).astype(data.dtype, copy=False) for temp_data in (data, temp_diff1, temp_diff2))
+
+# sums of the data and the square of the data over every window [start, start + win) from the prefix sums (float64)
+def window_moments(data, temp_start, temp_win):
+    temp_data = data - np.mean(data, axis=-1, keepdims=True, dtype=np.float64).astype(data.dtype)
+    temp_cum1 = np.zeros((data.shape[0], data.shape[1] + 1))
+    temp_cum2 = np.zeros((data.shape[0], data.shape[1] + 1))
+    np.cumsum(temp_data, axis=-1, dtype=np.float64, out=temp_cum1[:, 1:])
+    np.cumsum(temp_data**2, axis=-1, dtype=np.float64, out=temp_cum2[:, 1:])
+
+    temp_sum1 = temp_cum1[:, temp_start + temp_win] - temp_cum1[:, temp_start]
+    temp_sum2 = temp_cum2[:, temp_start + temp_win] - temp_cum2[:, temp_start]
+
+    return np.maximum(temp_sum2/temp_win - (temp_sum1/temp_win)**2, 0).astype(data.dtype, copy=False)
+
 def hjorth_paras(data, time, axis_data=-1, axis_time=0): 
     assert isinstance(data, np.ndarray), 'data: given data should be in numpy.array.'
     assert len(data.shape) == 3, 'data: given data should be in 3 dimensions; CxTxW, C=# channels, T=time index, W=window of data.'
@@ -83,9 +128,34 @@ def hjorth_paras(data, time, axis_data=-1, axis_time=0):
     assert isinstance(axis_data, int), 'axis_data: axis that evaluate the parameter for DATA. Integer is needed; default is -1.'
     assert isinstance(axis_time, int), 'axis_time: axis that evaluate the parameter for TIME. Integer is needed; default is 0.'
     
-    temp_complexity, _ = hjorth_com(data, time, axis_data=axis_data, axis_time=axis_time)
-    temp_mobility, _ = hjorth_mob(data, time, axis_data=axis_data, axis_time=axis_time)
-    temp_activity, _ = hjorth_act(data, time, axis_data=axis_data, axis_time=axis_time)
+    data = as_working(data)
+    temp_activity, temp_var1, temp_var2 = hjorth_moments(data, time, axis_data=axis_data, axis_time=axis_time)
+    temp_mobility = np.sqrt((temp_var1)/(temp_activity))
+    temp_complexity = np.sqrt((temp_var2)/(temp_var1))/(temp_mobility)
     
     return temp_complexity, temp_mobility, temp_activity, time[:, 0]
+
+def hjorth_paras_raw(signal, time, win, sld=1):
+    signal = np.atleast_2d(as_working(signal))
+    time = np.asarray(time)
+    assert len(signal.shape) == 2, 'signal: given signal should be in 2 dimensions; NxL, N=# channels, L=samples.'
+    assert len(time.shape) == 1, 'time: given time data should be in 1 dimension; L=samples.'
+    assert signal.shape[1] == time.shape[0], 'BOTH signal and time should have the same number of samples.'
+    assert isinstance(win, int) and (win > 2), 'win: window size of the sliding window. Integer larger than 2 is expected.'
+    assert isinstance(sld, int) and (sld > 0), 'sld: sliding of the sliding window. Integer is expected; default is 1.'
+    assert signal.shape[1] >= win, 'signal: given signal should be longer than the window size.'
+
+    temp_start = np.arange(0, signal.shape[1] - win + 1, sld)
+    temp_dt = signal.dtype.type(time[sld] - time[0] if temp_start.shape[0] > 1 else time[1] - time[0])
+
+    # the window of [win] samples has [win-1] first derivatives and [win-2] second derivatives
+    temp_diff1 = np.diff(signal, axis=-1)/temp_dt
+    temp_activity = window_moments(signal, temp_start, win)
+    temp_var1 = window_moments(temp_diff1, temp_start, win - 1)
+    temp_var2 = window_moments(np.diff(temp_diff1, axis=-1)/temp_dt, temp_start, win - 2)
+
+    temp_mobility = np.sqrt((temp_var1)/(temp_activity))
+    temp_complexity = np.sqrt((temp_var2)/(temp_var1))/(temp_mobility)
+
+    return temp_complexity, temp_mobility, temp_activity, time[temp_start]
     
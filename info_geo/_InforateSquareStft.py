@@ -11,44 +11,149 @@ case is fixed based on the interested frequency range.
 
 return information rate square for 1D distribution based on the frequency spectrum. 
 
+The N channels (NxT) are transformed in one batched stft. InforateStftStream computes the same 
+information rate square chunk by chunk for long or live recordings; the samples of the unfinished 
+segment and the PDF of the last segment are carried between the calls, so the memory is bounded 
+by the chunk size. 
+
 parameters: 
-    int_signal: array of data in 1 dimension; T, T=time index. 
+    int_signal: array of data in 1 dimension; T, T=time index. Or 2 dimensions; NxT, N=# channels.
     int_time: array of time in 1 dimension; T, T=time index.
     win_size: window size for the stft. It should be integer, default is 150.
     overlap: number of points of overlapping. It should be integer, default is None=(win_size/2).
     int_freq_range: range of interested frequency. It should be in list or tuple, default is [0, 300].
     
 return: 
-    numpy.ndarray: information rate square 
+    numpy.ndarray: information rate square [S-1] or [N x S-1], S=segments #
     numpy.ndarray: time
+
+InforateStftStream parameters: 
+    int_fs: sampling frequency of the signal. Integer or float is expected.
+    win_size, overlap, int_freq_range: same as inforate_square_stft().
+    n_channels: number of channels. Integer is expected; default is 1.
+
+InforateStftStream.update(chunk) gives the information rate square of the completed segments of the 
+new samples (S or NxS); InforateStftStream.flush() completes the last segments at the end of the recording 
+(zero padding, same as stft()). 
 """
 
 import numpy as np 
 
-from scipy.signal import stft
+from scipy.signal import stft, get_window
+from numpy.lib.stride_tricks import sliding_window_view
+from info_geo._Profiling import stage
 
+# PDF of the interested frequency range; the frequency index is at axis=-2. 
+def stft_pdf(stft_abs, stft_freq, int_freq_range):
+    int_minfreq = np.where(stft_freq <= np.min(int_freq_range))[0][-1]
+    int_maxfreq = np.where(stft_freq <= np.max(int_freq_range))[0][-1]
+
+    pmf_stft = stft_abs[..., int_minfreq: int_maxfreq, :]/np.sum(stft_abs[..., int_minfreq: int_maxfreq, :], axis=-2, keepdims=True) #probability mass function; index is [frequency, time]
+    pdf_stft = pmf_stft/np.diff(stft_freq)[0] #probability density function; index is [frequency, time]
+
+    return pdf_stft
 
 def inforate_square_stft(int_signal, int_time, win_size=150, overlap=None, int_freq_range=[0, 300]):
-    assert len(int_signal.shape)==1, 'int_signal: given data should be in numpy.array format.'
+    assert len(int_signal.shape) in (1, 2), 'int_signal: given data should be in numpy.array format; T or NxT.'
     assert len(int_time.shape)==1, 'int_time: given time data should be in numpy.array format.'
     assert isinstance(win_size, int), 'win_size: window size should be in integer; default is 150.'
     assert (overlap==None) or type(overlap)==int, 'overlap: number of overlapping; default is [win_size/2].'
     assert type(int_freq_range)==list or type(int_freq_range)==tuple, 'int_freq_range: range of the interested frequency. List or tuple is expected.'
     assert len(int_freq_range)==2, 'int_freq_range: range of interested frequency should only have TWO elements. ONLY minimum and maximum of the range.'
 
-    stft_freq, stft_time, stft_z = stft(int_signal, fs=1/np.diff(int_time)[0], nperseg=win_size, noverlap=overlap)
-    int_minfreq = np.where(stft_freq <= np.min(int_freq_range))[0][-1]
-    int_maxfreq = np.where(stft_freq <= np.max(int_freq_range))[0][-1]
+    with stage('stft', 'inforate_square_stft', int_signal.size):
+        stft_freq, stft_time, stft_z = stft(int_signal, fs=1/np.diff(int_time)[0], nperseg=win_size, noverlap=overlap, axis=-1)
 
-    pmf_stft = np.abs(stft_z)[int_minfreq: int_maxfreq, :]/np.sum(np.abs(stft_z)[int_minfreq: int_maxfreq, :], axis=0) #probability mass function; index is [frequency, time]
-    pdf_stft = pmf_stft/np.diff(stft_freq)[0] #probability density function; index is [frequency, time]
-    range_stft = stft_freq #range of the distribution. It is the same as the frequency range.
+        pdf_stft = stft_pdf(np.abs(stft_z), stft_freq, int_freq_range)
+        range_stft = stft_freq #range of the distribution. It is the same as the frequency range.
 
     # information rate calculation
-    diff_pdf = np.diff(np.sqrt(pdf_stft), axis=-1)
-    diff_time = np.diff(stft_time)[0]
-    diff_range = np.diff(range_stft)[0]
+    with stage('reduction', 'inforate_square_stft', pdf_stft.size):
+        diff_pdf = np.diff(np.sqrt(pdf_stft), axis=-1)
+        diff_time = np.diff(stft_time)[0]
+        diff_range = np.diff(range_stft)[0]
 
-    inforate_stft = 4 * np.sum(diff_pdf, axis=0)**(2) * (diff_range/(diff_time**2))
+        inforate_stft = 4 * np.sum(diff_pdf, axis=-2)**(2) * (diff_range/(diff_time**2))
 
     return inforate_stft, stft_time[:-1]
+
+class InforateStftStream:
+    def __init__(self, int_fs, win_size=150, overlap=None, int_freq_range=[0, 300], n_channels=1):
+        assert isinstance(int_fs, (int, float)) and (int_fs > 0), 'int_fs: sampling frequency of the signal. Integer or float is expected.'
+        assert isinstance(win_size, int), 'win_size: window size should be in integer; default is 150.'
+        assert (overlap==None) or type(overlap)==int, 'overlap: number of overlapping; default is [win_size/2].'
+        assert type(int_freq_range)==list or type(int_freq_range)==tuple, 'int_freq_range: range of the interested frequency. List or tuple is expected.'
+        assert len(int_freq_range)==2, 'int_freq_range: range of interested frequency should only have TWO elements. ONLY minimum and maximum of the range.'
+        assert isinstance(n_channels, int) and (n_channels > 0), 'n_channels: number of channels. Integer is expected; default is 1.'
+
+        self.int_fs = int_fs
+        self.win_size = win_size
+        self.overlap = win_size//2 if overlap is None else overlap
+        self.int_freq_range = int_freq_range
+        self.n_channels = n_channels
+
+        self._step = self.win_size - self.overlap
+        self._window = get_window('hann', self.win_size)
+        self._freq = np.fft.rfftfreq(self.win_size, 1/self.int_fs)
+        self.reset()
+
+    def reset(self):
+        # the signal is extended by [win_size/2] zeros at the start (same as the boundary of stft()).
+        self._buffer = np.zeros((self.n_channels, self.win_size//2))
+        self._length = self.win_size//2 # number of samples (with the zeros) received
+        self._segment = 0 # index of the next segment
+        self._last_pdf = None # square root of the PDF of the last segment
+
+    def update(self, chunk):
+        chunk = np.asarray(chunk)
+        temp_squeeze = chunk.ndim == 1
+        chunk = np.atleast_2d(chunk)
+        assert chunk.ndim == 2, 'chunk: given chunk should have 2 dimensions; NxS, N=# channels, S=samples.'
+        assert chunk.shape[0] == self.n_channels, 'chunk: given chunk should have the same number of channels as n_channels.'
+
+        self._buffer = np.concatenate((self._buffer, chunk), axis=-1)
+        self._length += chunk.shape[-1]
+        inforate_stft, stft_time = self.process()
+
+        if temp_squeeze:
+            inforate_stft = inforate_stft[0]
+        return inforate_stft, stft_time
+
+    def flush(self):
+        # zeros at the end (same as the boundary and the padding of stft())
+        temp_length = self._length + self.win_size//2
+        temp_add = self.win_size//2 + (-(temp_length - self.win_size) % self._step) % self.win_size
+        self._buffer = np.concatenate((self._buffer, np.zeros((self.n_channels, temp_add))), axis=-1)
+        self._length += temp_add
+        inforate_stft, stft_time = self.process()
+
+        if self.n_channels == 1:
+            inforate_stft = inforate_stft[0]
+        return inforate_stft, stft_time
+
+    def process(self):
+        temp_num = max(0, (self._buffer.shape[-1] - self.win_size)//self._step + 1)
+        if temp_num == 0:
+            return np.zeros((self.n_channels, 0)), np.zeros(0)
+
+        # segments completed in the buffer; the remaining samples are kept for the next segment.
+        temp_segment = sliding_window_view(self._buffer, self.win_size, axis=-1)[:, :temp_num*self._step:self._step, :]
+        stft_abs = np.abs(np.fft.rfft(temp_segment*self._window, axis=-1))
+        self._buffer = self._buffer[:, temp_num*self._step:]
+
+        pdf_stft = np.sqrt(stft_pdf(np.swapaxes(stft_abs, -1, -2), self._freq, self.int_freq_range))
+        stft_time = (self._segment + np.arange(temp_num))*self._step/self.int_fs
+        if self._last_pdf is not None:
+            pdf_stft = np.concatenate((self._last_pdf, pdf_stft), axis=-1)
+            stft_time = np.concatenate(([(self._segment - 1)*self._step/self.int_fs], stft_time))
+        self._last_pdf = pdf_stft[..., -1:]
+        self._segment += temp_num
+
+        # information rate calculation
+        diff_pdf = np.diff(pdf_stft, axis=-1)
+        diff_time = self._step/self.int_fs
+        diff_range = np.diff(self._freq)[0]
+
+        inforate_stft = 4 * np.sum(diff_pdf, axis=-2)**(2) * (diff_range/(diff_time**2))
+
+        return inforate_stft, stft_time[:-1]
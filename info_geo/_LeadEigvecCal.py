@@ -10,6 +10,7 @@ Note, the leading eigenvectors here has the highest (in term of magnitude) eigen
 
 parameters: 
     matrix_data: given matrix needs to be 3 dimensions array in [N x N x T]; N=dimension, T=time index.
+    progress: show the tqdm progress bar. Boolean is expected; default is False.
     
 return: 
     numpy.ndarray: [leading eigenvector] series with 3 dimensions [T x N]; T=time index, N=dimension. 
@@ -22,10 +23,11 @@ import numpy as np
 
 from scipy.linalg import eigh
 from tqdm import tqdm
-from joblib import Parallel, delayed
+from info_geo._Profiling import stage
+from info_geo._ExecConfig import shared_run, task_blocks, as_working
 
 def job_lead_eigvec_cal(matrix, i):
-    matrix = np.array(matrix) 
+    matrix = np.asarray(matrix) 
     assert len(matrix.shape) == 3, 'matrix: given matrix needs to be 3 dimensions array in [N x N x T]; N=dimension, T=time index.'
     assert isinstance(i, (int)), 'i: time index of the matrix. It should be a integer.'
     
@@ -53,18 +55,24 @@ def job_lead_eigvec_cal(matrix, i):
 
     return high_temp_eigvec 
 
+# [leading eigenvector] of the time index start to stop, written into out [T x N] (see shared_run())
+def job_lead_eigvec_block(out, matrix, start, stop):
+    for i in range(start, stop):
+        out[i] = job_lead_eigvec_cal(matrix, i)
 
 
-def lead_eigvec_cal(matrix_data):
-    matrix_data = np.array(matrix_data)
+
+def lead_eigvec_cal(matrix_data, progress=False):
+    matrix_data = as_working(matrix_data)
     assert len(matrix_data.shape) == 3, 'matrix_data: the matrix needs to be [3 dimensions] numpy.array such that it has dimension for [N x N x T].'
     assert matrix_data.shape[0] == matrix_data.shape[1], 'matrix_data: the matrix should be a square matrix time series.'
+    assert isinstance(progress, bool), 'progress: show the progress bar. Boolean is expected; default is False.'
 
     matrix_hilbert_angle = matrix_data
 
-    high_eigvec = Parallel(n_jobs=-1)(delayed(job_lead_eigvec_cal)(matrix_hilbert_angle, i) for i in tqdm(range(0, matrix_hilbert_angle.shape[2], 1), position=0, leave=False))
-
-    high_eigvec = np.array(high_eigvec) #[leading eigenvector]
+    with stage('dispatch', 'lead_eigvec_cal', matrix_hilbert_angle.shape[2]):
+        # the matrix is shared with the workers once; every job writes its time index into the [leading eigenvector]
+        high_eigvec = shared_run(job_lead_eigvec_block, tqdm(task_blocks(matrix_hilbert_angle.shape[2]), position=0, leave=False, disable=not progress), [matrix_hilbert_angle], (matrix_hilbert_angle.shape[2], matrix_hilbert_angle.shape[0]), matrix_hilbert_angle.dtype)
 
     #return the [leading eigenvector] series [T x N]. 
     return high_eigvec
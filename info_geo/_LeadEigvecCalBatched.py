@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:29:49 2026
+
+@author: agent
+
+Calculation for the [leading eigenvector series] for the square matrix time series in batches. 
+The matrix is transposed once to a stack of [T x N x N] and every batch of time index is decomposed 
+by the stacked numpy.linalg.eigh() instead of one job per time slice. The matrix should be symmetric 
+(only the lower triangle is used, same as scipy.linalg.eigh()). The matrix is decomposed in the dtype of 
+set_execution() (numpy.float32 uses the single precision LAPACK routines). 
+Note, the leading eigenvectors here has the highest (in term of magnitude) eigenvalues and the sign 
+is set the same way as lead_eigvec_cal_optimized(). 
+
+parameters: 
+    matrix_data: given matrix needs to be 3 dimensions array in [N x N x T]; N=dimension, T=time index.
+    batch_size: number of time index decomposed at once. Integer is expected; default is 256.
+    
+return: 
+    numpy.ndarray: [leading eigenvector] series with 2 dimensions [T x N]; T=time index, N=dimension. 
+    numpy.ndarray: [leading eigenvalue] series [T].
+    numpy.ndarray: explained variance ratio of the [leading eigenvalue], |eigenvalue|/sum(|eigenvalues|) [T]; zero for the all-zero matrix.
+    
+"""
+
+import numpy as np
+
+from info_geo._ExecConfig import as_working
+
+def batch_lead_eigvec_cal(matrix_stack):
+    temp_eigval, temp_eigvec = np.linalg.eigh(matrix_stack)
+    temp_rows = np.arange(matrix_stack.shape[0])
+
+    # index of the highest eigenvalue (in term of magnitude) of every slice
+    loc_high_temp_eigval = np.argmax(np.abs(temp_eigval), axis=-1)
+    high_temp_eigval = temp_eigval[temp_rows, loc_high_temp_eigval]
+    high_temp_eigvec = temp_eigvec[temp_rows, :, loc_high_temp_eigval]
+    # the all-zero matrix has no variance to explain; its ratio is zero instead of 0/0
+    temp_sum = np.sum(np.abs(temp_eigval), axis=-1)
+    explained_ratio = np.divide(np.abs(high_temp_eigval), temp_sum, out=np.zeros_like(temp_sum), where=temp_sum > 0)
+
+    # Symmetrize the eigenvector sign to ensure consistency (same as job_lead_eigvec_cal_optimized())
+    temp_flip = np.sum(np.where(high_temp_eigvec > 0, high_temp_eigvec, 0), axis=-1) < np.abs(np.sum(np.where(high_temp_eigvec < 0, high_temp_eigvec, 0), axis=-1))
+    high_temp_eigvec[temp_flip] *= -1
+
+    return high_temp_eigvec, high_temp_eigval, explained_ratio
+
+def lead_eigvec_cal_batched(matrix_data, batch_size=256):
+    matrix_data = as_working(matrix_data)
+    assert len(matrix_data.shape) == 3, 'matrix_data: the matrix needs to be [3 dimensions] numpy.array such that it has dimension for [N x N x T].'
+    assert matrix_data.shape[0] == matrix_data.shape[1], 'matrix_data: the matrix should be a square matrix time series.'
+    assert isinstance(batch_size, int) and (batch_size > 0), 'batch_size: number of time index decomposed at once. Integer is expected; default is 256.'
+
+    # [T x N x N] stack (view, no copy)
+    matrix_stack = np.moveaxis(matrix_data, 2, 0)
+
+    high_eigvec = np.zeros((matrix_stack.shape[0], matrix_stack.shape[1]), dtype=matrix_stack.dtype)
+    high_eigval = np.zeros(matrix_stack.shape[0], dtype=matrix_stack.dtype)
+    explained_ratio = np.zeros(matrix_stack.shape[0], dtype=matrix_stack.dtype)
+    for temp_start in range(0, matrix_stack.shape[0], batch_size):
+        temp_loc = slice(temp_start, temp_start + batch_size)
+        high_eigvec[temp_loc], high_eigval[temp_loc], explained_ratio[temp_loc] = batch_lead_eigvec_cal(np.ascontiguousarray(matrix_stack[temp_loc]))
+
+    #return the [leading eigenvector] series [T x N], [leading eigenvalue] series [T], explained variance ratio [T]
+    return high_eigvec, high_eigval, explained_ratio
@@ -10,6 +10,7 @@ Note, the leading eigenvectors here has the highest (in term of magnitude) eigen
 
 parameters: 
     matrix_data: given matrix needs to be 3 dimensions array in [N x N x T]; N=dimension, T=time index.
+    progress: show the tqdm progress bar. Boolean is expected; default is False.
     
 return: 
     numpy.ndarray: [leading eigenvector] series with 3 dimensions [T x N]; T=time index, N=dimension. 
@@ -20,7 +21,8 @@ import numpy as np
 
 from tqdm import tqdm
 from scipy.linalg import eigh
-from joblib import Parallel, delayed
+from info_geo._Profiling import stage
+from info_geo._ExecConfig import shared_run, task_blocks, as_working
 
 def job_lead_eigvec_cal_optimized(matrix_slice):
     """
@@ -41,22 +43,32 @@ def job_lead_eigvec_cal_optimized(matrix_slice):
 
     return high_temp_eigvec
 
-def lead_eigvec_cal_optimized(matrix_data):
+def job_lead_eigvec_block_optimized(out, matrix_data, start, stop):
+    """
+    Leading eigenvectors of the time slices start to stop, written into the shared output.
+    """
+    for i in range(start, stop):
+        out[i] = job_lead_eigvec_cal_optimized(matrix_data[:, :, i])
+
+def lead_eigvec_cal_optimized(matrix_data, progress=False):
     """
     Optimized function to calculate the leading eigenvector time series.
     """
-    matrix_data = np.asarray(matrix_data)
+    matrix_data = as_working(matrix_data)
     assert len(matrix_data.shape) == 3, 'matrix_data must be a 3D array [N x N x T].'
     assert matrix_data.shape[0] == matrix_data.shape[1], 'matrix_data must contain square matrices.'
+    assert isinstance(progress, bool), 'progress must be a boolean; default is False.'
 
-    # Use Parallel and delayed for efficient computation
-    high_eigvec = Parallel(n_jobs=-1)(
-        delayed(job_lead_eigvec_cal_optimized)(matrix_data[:, :, i]) 
-        for i in tqdm(range(matrix_data.shape[2]), position=0)
-    )
+    # Use the configured execution backend (see set_execution()) for the parallel computation;
+    # the matrix is shared once and the eigenvectors are written into the [T x N] output
+    with stage('dispatch', 'lead_eigvec_cal_optimized', matrix_data.shape[2]):
+        high_eigvec = shared_run(
+            job_lead_eigvec_block_optimized,
+            tqdm(task_blocks(matrix_data.shape[2]), position=0, disable=not progress),
+            [matrix_data], (matrix_data.shape[2], matrix_data.shape[0]), matrix_data.dtype
+        )
 
-    # Convert the result list into a NumPy array
-    return np.array(high_eigvec)
+    return high_eigvec
 
 # Example usage:
 # matrix_data = np.random.rand(100, 100, 200)  # Example input
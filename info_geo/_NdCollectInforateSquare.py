@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 09:01:07 2026
+
+@author: agent
+
+The [information rate] of the joint (N-dimensional) distribution of D regions (D = 3 to 6, or 2), the same as
+fix_double_inforate_square() and adj2d_collect_inforate_square() do for 2 regions. The samples of the D regions
+are paired sample by sample (channel n and sample w of every region form one point in D dimensions), so the PDF of
+every window has NxW points.
+
+The dense histogram (numpy.histogramdd()) has bins**D cells (50**5 ~ 3e8) while only NxW of them can be occupied,
+so the distribution is kept sparse: the bin index of every axis is combined into one integer cell code (mixed radix),
+the occupied cells of every window and their counts are taken by sorting the codes, and the cells of two
+consecutive windows are matched by their codes. With q = count/n (the probability of the cell),
+    [information rate]**2 = 4/dt**2 sum_cells (sqrt(q2) - sqrt(q1))**2
+                          = 4/dt**2 (sum q1 + sum q2 - 2 sum_(cells of both) sqrt(q1 q2)),
+and the sum is taken on the union of the occupied cells only (the bin volume cancels), so the cost grows with
+the samples (sorting NxW codes per window) and not with bins**D. The cells occupied by only one of the windows
+are summed directly (q1 or q2), so the result has no cancellation error.
+
+Histogram only; the samples outside the range (fix range) are dropped, same as numpy.histogramdd(). The counts and
+the sums are exact (integer) or float64; the result has the floating point type of the data (see set_execution()).
+
+parameters (fix_nd_inforate_square):
+    data: D arrays of data with 3 dimensions (list, tuple, or numpy.array [D x N x T x W]); NxTxW, N=signals #, T=time index, W=window of data.
+          All the regions should have the same shape.
+    time_data: array of time data with 2 dimensions; TxW, T=time index, W=window of data.
+    int_bins: bins size of the distribution estimation; integer, or D-tuple or D-list (one per region). Default is 30.
+    int_range: range of the distribution estimation (-int_range to int_range); float, integer, or D-tuple or D-list. Default is 1.05.
+
+parameters (adjnd_collect_inforate_series):
+    data: D arrays of data with 3 dimensions (list, tuple, or numpy.array [D x N x T x W]); NxTxW, N=signals #, T=time index, W=window of data.
+    time: array of time data with 2 dimensions; TxW, T=time index, W=window of data.
+    bins_size: bins size of the distribution estimation; integer, D-tuple, D-list, rice or sturges. Default is 50.
+               rice and sturges are given for the NxW joint samples, and the D-th root is taken for every axis.
+
+return:
+    numpy.ndarray: information rate square [T-1]
+    numpy.ndarray: time [T-1]
+
+"""
+
+import numpy as np
+
+from info_geo._BatchHistogram import batch_bin_indices
+from info_geo._DensityEstimator import density_bins
+from info_geo._Profiling import stage
+from info_geo._ExecConfig import as_working
+
+def check_regions(data, time):
+    assert len(data.shape) == 4, 'data: given data should be D arrays of 3 dimensions (same shape); NxTxW, N=signals #, T=time index, W=window of data.'
+    assert data.shape[0] >= 2, 'data: given data should have 2 or more regions [D >= 2].'
+    assert len(time.shape) == 2, 'time: given time data should have 2 dimensions; TxW, T=time index, W=window of data.'
+    assert data.shape[2] == time.shape[0], 'BOTH data and time should have the same sliding window.'
+    assert data.shape[2] >= 2, 'data: given data should have at least 2 time index to compute the information rate.'
+
+# bins size of every axis (D)
+def region_bins(int_bins, n_regions):
+    if (type(int_bins)==tuple) or (type(int_bins)==list):
+        assert len(int_bins) == n_regions, 'int_bins: one bins size per region is expected.'
+        temp_bins = [int(temp_value) for temp_value in int_bins]
+    else:
+        temp_bins = [int(int_bins)]*n_regions
+
+    assert min(temp_bins) >= 1, 'int_bins: bins size of the distribution should be positive.'
+    assert np.prod(temp_bins, dtype=object) < 2**62, 'int_bins: the number of cells (product of the bins size) should be less than 2**62.'
+    return temp_bins
+
+# integer cell code of every sample (mixed radix of the bin index of every axis); -1 for the samples outside the range.
+def cell_codes(windows, range_lo, range_hi, bins):
+    # windows [D x R x ...], range_lo and range_hi [D] (fix range) or [D x R] (adjacent range)
+    temp_codes = np.zeros(windows.shape[1:], dtype=np.int64)
+    temp_outside = np.zeros(windows.shape[1:], dtype=bool)
+    for d in range(windows.shape[0]):
+        temp_index = batch_bin_indices(windows[d], range_lo[d], range_hi[d], bins[d])
+        temp_outside |= temp_index < 0
+        temp_codes *= bins[d]
+        temp_codes += temp_index
+
+    temp_codes[temp_outside] = -1
+    return temp_codes.reshape(windows.shape[1], -1)
+
+# occupied cells of every row [R x M] of the cell codes: rows, cells and counts, sorted by (row, cell); -1 is not counted.
+def sparse_cell_counts(codes):
+    temp_sorted = np.sort(codes, axis=-1)
+    temp_start = np.ones(temp_sorted.shape, dtype=bool)
+    temp_start[:, 1:] = temp_sorted[:, 1:] != temp_sorted[:, :-1]
+
+    temp_first = np.flatnonzero(temp_start)
+    temp_counts = np.diff(np.append(temp_first, temp_sorted.size))
+    temp_cells = temp_sorted.ravel()[temp_first]
+    temp_rows = temp_first//temp_sorted.shape[1]
+
+    temp_keep = temp_cells >= 0
+    return temp_rows[temp_keep], temp_cells[temp_keep], temp_counts[temp_keep]
+
+# sum of (sqrt(q2) - sqrt(q1))**2 of every row on the union of the occupied cells; rows1 and rows2 are matched row by row.
+def sparse_sqrt_diff(rows1, cells1, counts1, rows2, cells2, counts2, n_rows):
+    temp_total1 = np.bincount(rows1, weights=counts1, minlength=n_rows)
+    temp_total2 = np.bincount(rows2, weights=counts2, minlength=n_rows)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        temp_q1 = counts1/temp_total1[rows1]
+        temp_q2 = counts2/temp_total2[rows2]
+
+    # the cells are renumbered (0 to # occupied cells), so that (row, cell) is one int64 key without overflow
+    temp_unique, temp_ids = np.unique(np.concatenate((cells1, cells2)), return_inverse=True)
+    temp_key1 = rows1*temp_unique.shape[0] + temp_ids[:cells1.shape[0]]
+    temp_key2 = rows2*temp_unique.shape[0] + temp_ids[cells1.shape[0]:]
+    _, temp_match1, temp_match2 = np.intersect1d(temp_key1, temp_key2, assume_unique=True, return_indices=True)
+
+    # cells occupied by only one of the two windows: q1 (or q2); cells of both: (sqrt(q2) - sqrt(q1))**2
+    temp_only1 = np.ones(rows1.shape[0], dtype=bool)
+    temp_only1[temp_match1] = False
+    temp_only2 = np.ones(rows2.shape[0], dtype=bool)
+    temp_only2[temp_match2] = False
+
+    temp_sum = np.bincount(rows1[temp_only1], weights=temp_q1[temp_only1], minlength=n_rows)
+    temp_sum += np.bincount(rows2[temp_only2], weights=temp_q2[temp_only2], minlength=n_rows)
+    temp_sum += np.bincount(rows1[temp_match1], weights=(np.sqrt(temp_q2[temp_match2]) - np.sqrt(temp_q1[temp_match1]))**2, minlength=n_rows)
+
+    # window without sample in the range: the PDF is not defined (same as numpy.histogramdd(density=True))
+    temp_sum[(temp_total1 == 0) | (temp_total2 == 0)] = np.nan
+    return temp_sum
+
+def fix_nd_inforate_square(data, time_data, int_bins=30, int_range=1.05):
+    data = as_working(data)
+    time_data = np.asarray(time_data)
+
+    check_regions(data, time_data)
+    assert data.shape[3] == time_data.shape[1], 'BOTH data and time_data should have the same sliding window.'
+    assert (type(int_bins)==int) or (type(int_bins)==tuple) or (type(int_bins)==list), 'int_bins: bins size of the distribution; integer, tuple, or list is expected.'
+    assert (type(int_range)==float) or (type(int_range)==int) or (type(int_range)==tuple) or (type(int_range)==list), 'int_range: range of the distribution; float, integer, tuple, or list is expected. Default is 1.05.'
+
+    temp_bins = region_bins(int_bins, data.shape[0])
+    if (type(int_range)==tuple) or (type(int_range)==list):
+        assert len(int_range) == data.shape[0], 'int_range: one range per region is expected.'
+        temp_range = np.asarray(int_range, dtype=float)
+    else:
+        temp_range = np.full(data.shape[0], float(int_range))
+
+    # all the windows share the same bin edges (fix range); the cells of every window are taken once
+    # and matched with the cells of the next window.
+    with stage('histogram', 'fix_nd_inforate_square', data.size):
+        temp_codes = cell_codes(np.moveaxis(data, 2, 1), -1*temp_range, temp_range, temp_bins)
+        temp_rows, temp_cells, temp_counts = sparse_cell_counts(temp_codes)
+
+    # information rate square calculation; window t (BEFORE) with window t+1 (AFTER)
+    with stage('reduction', 'fix_nd_inforate_square', temp_cells.shape[0]):
+        temp_before = temp_rows < data.shape[2] - 1
+        temp_after = temp_rows > 0
+        temp_sum = sparse_sqrt_diff(temp_rows[temp_before], temp_cells[temp_before], temp_counts[temp_before], temp_rows[temp_after] - 1, temp_cells[temp_after], temp_counts[temp_after], data.shape[2] - 1)
+
+        delta_time_array = np.diff(time_data, axis=0)[0][0]
+        temp_inforate_square = (4 * temp_sum / (delta_time_array**2)).astype(data.dtype, copy=False)
+
+    return temp_inforate_square, time_data[:-1, 0]
+
+def adjnd_collect_inforate_series(data, time, bins_size=50):
+    data = as_working(data)
+    time = np.asarray(time)
+
+    check_regions(data, time)
+    assert (bins_size=='rice') or (bins_size=='sturges') or (type(bins_size)==int) or (type(bins_size)==tuple) or (type(bins_size)==list), 'bins_size: bin size for the histogram. it can estimated by rice, sturges, or specify to certain number.'
+
+    temp_bins = region_bins(density_bins(bins_size, data.shape[1] * data.shape[-1], dims=data.shape[0]), data.shape[0])
+
+    # window index at the second axis; DxTxNxW (view, no copy)
+    temp_windows = np.moveaxis(data, 2, 1)
+
+    # getting the range between every two consecutive distribution of every region [D x (T-1)]
+    temp_min = np.min(temp_windows, axis=(2, 3))
+    temp_max = np.max(temp_windows, axis=(2, 3))
+    temp_range_lo = np.minimum(temp_min[:, :-1], temp_min[:, 1:])
+    temp_range_hi = np.maximum(temp_max[:, :-1], temp_max[:, 1:])
+
+    # occupied cells BEFORE and AFTER for every consecutive pair; both share the same edges of the range.
+    with stage('histogram', 'adjnd_collect_inforate_series', 2*temp_windows[:, 1:].size):
+        temp_before = sparse_cell_counts(cell_codes(temp_windows[:, :-1], temp_range_lo, temp_range_hi, temp_bins))
+        temp_after = sparse_cell_counts(cell_codes(temp_windows[:, 1:], temp_range_lo, temp_range_hi, temp_bins))
+
+    # information rate square calculation
+    with stage('reduction', 'adjnd_collect_inforate_series', temp_before[0].shape[0] + temp_after[0].shape[0]):
+        temp_dt = np.diff(time[:, 0])
+        temp_sum = sparse_sqrt_diff(*temp_before, *temp_after, data.shape[2] - 1)
+
+        temp_inforate_square = (4 * temp_sum / (temp_dt**2)).astype(data.dtype, copy=False)
+
+    return temp_inforate_square, time[:-1, 0]
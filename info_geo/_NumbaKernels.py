@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 09:09:33 2026
+
+@author: agent
+
+Optional compiled (numba) kernels of the [information rate] histogram path. The NumPy path computes
+histogram -> PDF -> sqrt -> diff -> square -> sum as separate passes, each with a [T x bins] (or
+[T x binsx x binsy]) temporary array. Every kernel here goes from the windowed samples straight to the
+sum of the square of the sqrt difference of every two consecutive windows: the counts of the two windows
+of a time index are kept in a local array of the thread (bins, or binsx x binsy) and reduced at once, and
+the time index is run in parallel (numba.prange). No PDF tensor is allocated.
+
+With q = count/n (the probability of the bin), PDF = q/dx and
+    sum((sqrt(PDF2) - sqrt(PDF1))**2) dx = sum((sqrt(q2) - sqrt(q1))**2),
+so the bin width cancels and the kernels give sum((sqrt(q2) - sqrt(q1))**2) [T-1]; the caller multiplies
+by 4/dt**2 (the same as the NumPy path up to rounding, about 1e-15 relative). The bin index of every sample
+is the same as numpy.histogram() (same edges and the same correction at the edges; see batch_bin_indices()).
+The ranges are given as they are after batch_range() (empty range widened). A window without any sample in
+the range gives NaN, same as the NumPy path.
+
+The kernels are used when the execution configuration has jit=True (see set_execution()) and numba is
+installed; otherwise (or for ash and kde) the functions run the NumPy path. The kernels are compiled at the
+first call for every dtype of the data (cached on disk by numba). The counts are reduced in float64, so
+with the float32 dtype the kernels are slightly more accurate than the NumPy path (about 2e-7 relative).
+Used by fix_single_inforate_square(), fix_collect_inforate_square(), adj_collect_inforate_series(),
+fix_double_inforate_square() (same number of channels) and adj2d_inforate_shannon_entro().
+
+parameters:
+    data: windowed samples [C x T x W] (1D collective; C=1 for a single signal), or data1 and data2 [C x T x W] (2D).
+    range_lo: lower limit of the range of every two consecutive windows [T-1] (the same value for fix range).
+    range_hi: upper limit of the range of every two consecutive windows [T-1].
+    bins: bins size of the distribution; integer (binsx and binsy for 2D).
+
+return:
+    numpy.ndarray: sum((sqrt(q2) - sqrt(q1))**2) of every two consecutive windows [T-1] (float64).
+
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+NUMBA_AVAILABLE = numba is not None
+
+if NUMBA_AVAILABLE:
+    prange = numba.prange
+    jit_inline = numba.njit(cache=True)
+    jit_parallel = numba.njit(parallel=True, cache=True)
+else:
+    # without numba the kernels are plain python functions (they are not called by the package)
+    prange = range
+    jit_inline = jit_parallel = lambda function: function
+
+# edges of the range; same as batch_edges()
+@jit_inline
+def kernel_edges(lo, hi, bins):
+    temp_edges = np.empty(bins + 1)
+    temp_step = (hi - lo)/bins
+    for k in range(bins + 1):
+        temp_edges[k] = k*temp_step + lo
+    temp_edges[bins] = hi
+    return temp_edges
+
+# bin index of one sample; -1 outside the range. Same as batch_bin_indices() (numpy.histogram()).
+@jit_inline
+def kernel_bin_index(value, lo, hi, bins, edges):
+    if not ((value >= lo) and (value <= hi)):
+        return -1
+    temp_index = int(((value - lo)/(hi - lo)) * bins)
+    if temp_index == bins:
+        temp_index -= 1
+    if value < edges[temp_index]:
+        temp_index -= 1
+    elif (value >= edges[temp_index + 1]) and (temp_index != bins - 1):
+        temp_index += 1
+    return temp_index
+
+# sum of the square of the sqrt difference of the two count arrays (flattened)
+@jit_inline
+def kernel_sqrt_diff(counts1, counts2):
+    temp_n1 = 0.0
+    temp_n2 = 0.0
+    for k in range(counts1.shape[0]):
+        temp_n1 += counts1[k]
+        temp_n2 += counts2[k]
+    if (temp_n1 == 0) or (temp_n2 == 0):
+        return np.nan
+
+    temp_sum = 0.0
+    for k in range(counts1.shape[0]):
+        temp_diff = np.sqrt(counts2[k]/temp_n2) - np.sqrt(counts1[k]/temp_n1)
+        temp_sum += temp_diff*temp_diff
+    return temp_sum
+
+# 1D (collective): the samples of all the C channels of the window form the distribution
+@jit_parallel
+def inforate_sqrt_diff(data, range_lo, range_hi, bins):
+    temp_c, temp_t, temp_w = data.shape
+    temp_out = np.empty(temp_t - 1)
+    for t in prange(temp_t - 1):
+        temp_lo = range_lo[t]
+        temp_hi = range_hi[t]
+        temp_edges = kernel_edges(temp_lo, temp_hi, bins)
+        temp_counts = np.zeros((2, bins))
+        for s in range(2):
+            for c in range(temp_c):
+                for w in range(temp_w):
+                    temp_index = kernel_bin_index(data[c, t + s, w], temp_lo, temp_hi, bins, temp_edges)
+                    if temp_index >= 0:
+                        temp_counts[s, temp_index] += 1
+        temp_out[t] = kernel_sqrt_diff(temp_counts[0], temp_counts[1])
+    return temp_out
+
+# 2D: data1 and data2 are paired sample by sample
+@jit_parallel
+def inforate2d_sqrt_diff(data1, data2, range1_lo, range1_hi, range2_lo, range2_hi, binsx, binsy):
+    temp_c, temp_t, temp_w = data1.shape
+    temp_out = np.empty(temp_t - 1)
+    for t in prange(temp_t - 1):
+        temp_edges1 = kernel_edges(range1_lo[t], range1_hi[t], binsx)
+        temp_edges2 = kernel_edges(range2_lo[t], range2_hi[t], binsy)
+        temp_counts = np.zeros((2, binsx*binsy))
+        for s in range(2):
+            for c in range(temp_c):
+                for w in range(temp_w):
+                    temp_index1 = kernel_bin_index(data1[c, t + s, w], range1_lo[t], range1_hi[t], binsx, temp_edges1)
+                    temp_index2 = kernel_bin_index(data2[c, t + s, w], range2_lo[t], range2_hi[t], binsy, temp_edges2)
+                    if (temp_index1 >= 0) and (temp_index2 >= 0):
+                        temp_counts[s, temp_index1*binsy + temp_index2] += 1
+        temp_out[t] = kernel_sqrt_diff(temp_counts[0], temp_counts[1])
+    return temp_out
+
+# ranges of the kernels [T-1] from the scalar (fix range) or the arrays of every two consecutive windows
+def kernel_ranges(range_lo, range_hi, n_pairs):
+    from info_geo._BatchHistogram import batch_range
+
+    range_lo, range_hi = batch_range(range_lo, range_hi)
+    return np.ascontiguousarray(np.broadcast_to(range_lo, (n_pairs,))), np.ascontiguousarray(np.broadcast_to(range_hi, (n_pairs,)))
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:50:15 2026
+
+@author: agent
+
+Out-of-core [information rate], Hjorth parameters, phase entropy PDF and [phase lock matrix] for the
+recordings larger than the memory. The recording is given as a .npy file (opened memory-mapped, read only),
+a numpy.memmap or a numpy.ndarray, and it is never copied as a whole. The windows are processed in
+window-aligned chunks of chunk_windows windows; the chunk reads the samples of its windows only, plus one
+window of overlap for the [information rate] (difference of two consecutive windows). The outputs are
+written chunk by chunk to the .npy files in out_dir (numpy.lib.format.open_memmap) and returned as the
+memory-mapped arrays, i.e. they can be opened again later with numpy.load(path, mmap_mode='r').
+The [information rate], Hjorth and [phase lock matrix] outputs are written in the dtype of set_execution()
+(e.g. numpy.float32 halves the files); the time is written in float64.
+
+The chunked results are the same as the in-memory functions on sliding_window_view(signal, win)[::sld]
+(up to rounding) for a uniform time, except the [phase lock matrix], which is approximate: the hilbert
+transform of every chunk of chunk_size samples is the blockwise analytic signal (analytic_signal() with
+block_size=chunk_size and margin samples on both sides), so it differs from the transform of the whole
+recording near the border of the chunks. The error decreases with the margin and grows with the power
+of the signal at the low frequencies (periods comparable to the margin). With the default margin, on
+EEG-like input about 1% of the entries can be off by more than 0.1 (a band-limited 0.5-45 Hz signal gave
+about 0.05%, a signal with strong content below 0.5 Hz much more); where the amplitude of the analytic
+signal is near zero a single entry can be off by up to 2. A chunk_size not smaller than the recording
+gives the whole transform; a smaller chunk_size warns (RuntimeWarning) that the result is approximate.
+
+out_of_core_inforate() parameters:
+    signal: recording in 2 dimensions [N x L] (or 1 dimension [L]); .npy path, numpy.memmap or numpy.ndarray.
+    time: time of the recording in 1 dimension [L]; .npy path, numpy.memmap or numpy.ndarray.
+    out_dir: directory of the output .npy files (inforate.npy, inforate_time.npy).
+    win: window size of the sliding window. Integer is expected; default is 10.
+    sld: sliding of the sliding window. Integer is expected; default is 2.
+    int_bins: bins size of the distribution; integer, rice or sturges. Default is 30.
+    int_range: range of the distribution for the fix mode; integer, float, 2-tuple or 2-list. Default is 1.05.
+    mode: fix (fix_collect_inforate_square()) or adj (adj_collect_inforate_series()). Default is fix.
+    density: density estimator of the distribution; histogram, ash, or kde. Default is histogram.
+    chunk_windows: number of windows processed at once. Integer is expected; default is 4096.
+
+out_of_core_hjorth() parameters (hjorth_paras_raw()):
+    signal, time, out_dir: same as out_of_core_inforate(); hjorth_complexity.npy, hjorth_mobility.npy, hjorth_activity.npy, hjorth_time.npy.
+    win: window size of the sliding window. Integer larger than 2 is expected.
+    sld: sliding of the sliding window. Integer is expected; default is 1.
+    chunk_windows: number of windows processed at once. Integer is expected; default is 4096.
+
+out_of_core_phase_en() parameters (phase_en_pdf_range() of every channel):
+    signal, time, out_dir: same as out_of_core_inforate(); phase_en_pdf.npy, phase_en_time.npy.
+    int_win, int_sld, int_bins, int_delay, int_sigma: same as phase_en_pdf_range().
+    chunk_windows: number of windows processed at once. Integer is expected; default is 1024.
+
+out_of_core_phase_lock() parameters (phase_lock_matrix()):
+    signal, out_dir: same as out_of_core_inforate(); phase_lock.npy.
+    dtype: data type of the [phase lock matrix]; numpy.float64, numpy.float32, or None (dtype of set_execution(); default).
+    chunk_size: number of samples processed at once. Integer is expected; default is 65536.
+    margin: samples on both sides of the chunk for the hilbert transform. Integer is expected; default is 4096.
+
+return:
+    out_of_core_inforate(): information rate square [T-1], time [T-1]
+    out_of_core_hjorth(): complexity [N x T], mobility [N x T], activity [N x T], time [T]
+    out_of_core_phase_en(): PDF [N x T x int_bins], time [T]
+    out_of_core_phase_lock(): [phase lock matrix] [N x N x L]
+    (numpy.memmap; T=# windows)
+
+"""
+
+import os
+import warnings
+import numpy as np
+import info_geo as ig
+
+from numpy.lib.format import open_memmap
+from numpy.lib.stride_tricks import sliding_window_view
+from info_geo._Profiling import stage
+from info_geo._DensityEstimator import check_density
+from info_geo._PhaseLockMatrix import phase_lock_block
+from info_geo._AnalyticSignal import analytic_blocks
+from info_geo._ExecConfig import working_dtype
+
+# memory-mapped view of the recording; the .npy path is opened read only, numpy.memmap and numpy.ndarray are not copied.
+def load_recording(recording):
+    if isinstance(recording, (str, os.PathLike)):
+        return np.load(recording, mmap_mode='r')
+    return np.asarray(recording)
+
+# new .npy file of the output, memory-mapped
+def create_output(out_dir, name, shape, dtype=np.float64):
+    os.makedirs(out_dir, exist_ok=True)
+    return open_memmap(os.path.join(out_dir, name), mode='w+', dtype=dtype, shape=shape)
+
+# window-aligned chunks: (first output, end output, first sample, end sample) of every chunk.
+# The outputs [first, end) need the windows [first, end + overlap), i.e. the samples [first*sld, (end + overlap - 1)*sld + win).
+def window_chunks(n_windows, win, sld, chunk_windows, overlap=0):
+    for temp_first in range(0, n_windows - overlap, chunk_windows):
+        temp_end = min(temp_first + chunk_windows, n_windows - overlap)
+        yield temp_first, temp_end, temp_first*sld, (temp_end + overlap - 1)*sld + win
+
+def check_recording(signal, time):
+    assert len(signal.shape) == 2, 'signal: given signal should be in 2 dimensions; NxL, N=# channels, L=samples.'
+    assert len(time.shape) == 1, 'time: given time data should be in 1 dimension; L=samples.'
+    assert signal.shape[1] == time.shape[0], 'BOTH signal and time should have the same number of samples.'
+
+def out_of_core_inforate(signal, time, out_dir, win=10, sld=2, int_bins=30, int_range=1.05, mode='fix', density='histogram', chunk_windows=4096):
+    signal = np.atleast_2d(load_recording(signal))
+    time = load_recording(time)
+
+    check_recording(signal, time)
+    assert isinstance(win, int) and (win > 0), 'win: window size of the sliding window. Integer is expected; default is 10.'
+    assert isinstance(sld, int) and (sld > 0), 'sld: sliding of the sliding window. Integer is expected; default is 2.'
+    assert mode in ('fix', 'adj'), 'mode: fix or adj is expected; default is fix.'
+    check_density(density)
+    assert isinstance(chunk_windows, int) and (chunk_windows > 0), 'chunk_windows: number of windows processed at once. Integer is expected; default is 4096.'
+    assert signal.shape[1] >= win + sld, 'signal: given signal should have at least 2 windows.'
+
+    # the scalar range is given as (-int_range, int_range)
+    temp_range = tuple(int_range) if isinstance(int_range, (tuple, list)) else (-1*int_range, int_range)
+
+    temp_windows = (signal.shape[1] - win)//sld + 1
+    inforate_data = create_output(out_dir, 'inforate.npy', (temp_windows - 1,), dtype=working_dtype())
+    inforate_time = create_output(out_dir, 'inforate_time.npy', (temp_windows - 1,))
+
+    for temp_first, temp_end, temp_start, temp_stop in window_chunks(temp_windows, win, sld, chunk_windows, overlap=1):
+        temp_data = sliding_window_view(signal[:, temp_start:temp_stop], window_shape=win, axis=-1)[:, ::sld, :]
+        temp_time = sliding_window_view(time[temp_start:temp_stop], window_shape=win)[::sld, :]
+
+        if mode == 'fix':
+            temp_inforate, temp_inforate_time = ig.fix_collect_inforate_square(temp_data, temp_time, int_range=temp_range, int_bins=int_bins, density=density)
+        else:
+            temp_inforate, temp_inforate_time = ig.adj_collect_inforate_series(temp_data, temp_time, bins_size=int_bins, density=density)
+
+        with stage('writing', 'out_of_core_inforate', temp_inforate.size):
+            inforate_data[temp_first:temp_end] = temp_inforate
+            inforate_time[temp_first:temp_end] = temp_inforate_time
+
+    inforate_data.flush()
+    inforate_time.flush()
+
+    return inforate_data, inforate_time
+
+def out_of_core_hjorth(signal, time, out_dir, win, sld=1, chunk_windows=4096):
+    signal = np.atleast_2d(load_recording(signal))
+    time = load_recording(time)
+
+    check_recording(signal, time)
+    assert isinstance(win, int) and (win > 2), 'win: window size of the sliding window. Integer larger than 2 is expected.'
+    assert isinstance(sld, int) and (sld > 0), 'sld: sliding of the sliding window. Integer is expected; default is 1.'
+    assert isinstance(chunk_windows, int) and (chunk_windows > 0), 'chunk_windows: number of windows processed at once. Integer is expected; default is 4096.'
+    assert signal.shape[1] >= win, 'signal: given signal should be longer than the window size.'
+
+    temp_windows = (signal.shape[1] - win)//sld + 1
+    temp_complexity = create_output(out_dir, 'hjorth_complexity.npy', (signal.shape[0], temp_windows), dtype=working_dtype())
+    temp_mobility = create_output(out_dir, 'hjorth_mobility.npy', (signal.shape[0], temp_windows), dtype=working_dtype())
+    temp_activity = create_output(out_dir, 'hjorth_activity.npy', (signal.shape[0], temp_windows), dtype=working_dtype())
+    temp_time = create_output(out_dir, 'hjorth_time.npy', (temp_windows,))
+
+    for temp_first, temp_end, temp_start, temp_stop in window_chunks(temp_windows, win, sld, chunk_windows):
+        # hjorth_paras_raw() takes the time step of ONE window from the samples; the chunk of one window is given a neighbour window.
+        temp_lead = 0
+        if (temp_end - temp_first == 1) and (temp_windows > 1):
+            if temp_first > 0:
+                temp_lead = 1
+                temp_start = temp_start - sld
+            else:
+                temp_stop = temp_stop + sld
+        temp_keep = slice(temp_lead, temp_lead + temp_end - temp_first)
+
+        temp_paras = ig.hjorth_paras_raw(signal[:, temp_start:temp_stop], time[temp_start:temp_stop], win, sld=sld)
+
+        with stage('writing', 'out_of_core_hjorth', temp_paras[0].size):
+            temp_complexity[:, temp_first:temp_end] = temp_paras[0][:, temp_keep]
+            temp_mobility[:, temp_first:temp_end] = temp_paras[1][:, temp_keep]
+            temp_activity[:, temp_first:temp_end] = temp_paras[2][:, temp_keep]
+            temp_time[temp_first:temp_end] = temp_paras[3][temp_keep]
+
+    for temp_out in (temp_complexity, temp_mobility, temp_activity, temp_time):
+        temp_out.flush()
+
+    return temp_complexity, temp_mobility, temp_activity, temp_time
+
+def out_of_core_phase_en(signal, time, out_dir, int_win=500, int_sld=250, int_bins=80, int_delay=10, int_sigma=5, chunk_windows=1024):
+    signal = np.atleast_2d(load_recording(signal))
+    time = load_recording(time)
+
+    check_recording(signal, time)
+    assert isinstance(int_win, int) and (int_win > 10), 'int_win: slidng window, window of estimating the distribution. Integer larger than 10 is expected.'
+    assert isinstance(int_sld, int) and (int_sld > 0), 'int_sld: slidinng window, sliding of estimating the evolution of the distribution.'
+    assert isinstance(int_bins, int), 'int_bins: bin size of the distribution.'
+    assert isinstance(chunk_windows, int) and (chunk_windows > 0), 'chunk_windows: number of windows processed at once. Integer is expected; default is 1024.'
+    assert signal.shape[1] >= int_win, 'signal: given signal should be longer than the window size.'
+
+    temp_windows = (signal.shape[1] - int_win)//int_sld + 1
+    phase_pdf = create_output(out_dir, 'phase_en_pdf.npy', (signal.shape[0], temp_windows, int_bins))
+    phase_time = create_output(out_dir, 'phase_en_time.npy', (temp_windows,))
+
+    for temp_first, temp_end, temp_start, temp_stop in window_chunks(temp_windows, int_win, int_sld, chunk_windows):
+        # windows of all the channels in one batch [(N x chunk) x W]
+        temp_data = sliding_window_view(signal[:, temp_start:temp_stop], window_shape=int_win, axis=-1)[:, ::int_sld, :]
+        temp_pdf, _ = ig.phase_en_pdf_batch(temp_data.reshape(-1, int_win), int_k=int_bins, int_tau=int_delay, int_sigma=int_sigma)
+
+        with stage('writing', 'out_of_core_phase_en', temp_pdf.size):
+            phase_pdf[:, temp_first:temp_end, :] = temp_pdf.reshape(signal.shape[0], temp_end - temp_first, int_bins)
+            phase_time[temp_first:temp_end] = time[temp_start:temp_stop:int_sld][:temp_end - temp_first]
+
+    phase_pdf.flush()
+    phase_time.flush()
+
+    return phase_pdf, phase_time
+
+def out_of_core_phase_lock(signal, out_dir, dtype=None, chunk_size=65536, margin=4096):
+    signal = np.atleast_2d(load_recording(signal))
+
+    assert len(signal.shape) == 2, 'signal: given signal should be in 2 dimensions; NxL, N=# channels, L=samples.'
+    assert signal.shape[0] >= 2, 'signal: given signal should have 2 or more channels [N >= 2]; N=# channels.'
+    assert isinstance(chunk_size, int) and (chunk_size > 0), 'chunk_size: number of samples processed at once. Integer is expected; default is 65536.'
+    assert isinstance(margin, int) and (margin >= 0), 'margin: samples on both sides of the chunk for the hilbert transform. Integer is expected; default is 4096.'
+
+    temp_length = signal.shape[1]
+    if chunk_size < temp_length:
+        warnings.warn(f'out_of_core_phase_lock: the hilbert transform is blockwise (chunk_size={chunk_size} < {temp_length} samples, margin={margin}); the phase lock matrix is approximate near the border of the chunks.', RuntimeWarning)
+    matrix_hilbert_angle = create_output(out_dir, 'phase_lock.npy', (signal.shape[0], signal.shape[0], temp_length), dtype=working_dtype(dtype))
+
+    # blockwise analytic signal (see analytic_signal()); the chunk and its margins are read from the recording.
+    # Only cos() and sin() of the phase are used, so the phase is not unwrapped.
+    temp_blocks = analytic_blocks(signal, block_size=chunk_size, margin=margin, dtype=np.float64)
+    for _ in range(-(-temp_length//chunk_size)):
+        with stage('hilbert', 'out_of_core_phase_lock', signal.shape[0]*min(chunk_size + 2*margin, temp_length)):
+            temp_start, temp_stop, temp_analytic = next(temp_blocks)
+            hilbert_angle = np.angle(temp_analytic)
+        with stage('phase lock', 'out_of_core_phase_lock', signal.shape[0]**2*(temp_stop - temp_start)):
+            phase_lock_block(hilbert_angle, out=matrix_hilbert_angle[:, :, temp_start:temp_stop], dtype=matrix_hilbert_angle.dtype)
+
+    matrix_hilbert_angle.flush()
+
+    return matrix_hilbert_angle
@@ -19,6 +19,9 @@ return:
     all_phase_pdf: numpy.ndarray 
     all_phase_range: numpy.ndarray
 
+phase_en_pdf_batch() gives the PDF of every window (TxW) in one batched call; the PMF of all the windows 
+and the gaussian filter are computed at once instead of one job per window. 
+
 """
 
 import numpy as np
@@ -26,8 +29,8 @@ import info_geo as ig # NOTE: this is own package
 
 from numpy.lib.stride_tricks import sliding_window_view
 #from tqdm import tqdm
-from joblib import Parallel, delayed
 from scipy.ndimage import gaussian_filter1d
+from info_geo._Profiling import stage
 #from gtda.time_series import SingleTakensEmbedding
 
 
@@ -42,6 +45,19 @@ def phase_en_pdf(data, index, int_k=80, int_tau=10, int_sigma=5):
 
     return temp_phase_pdf, temp_phase_range
 
+def phase_en_pdf_batch(data, int_k=80, int_tau=10, int_sigma=5):
+    assert data.ndim==2, 'data: given data should be in two dimension. TxW, T=time index, W=window of sample data.'
+
+    with stage('histogram', 'phase_en_pdf_batch', data.size):
+        temp_phase_pmf = ig.phase_en_pmf(data, K=int_k, tau=int_tau)
+        temp_phase_pmf = np.atleast_2d(temp_phase_pmf)
+    with stage('smoothing', 'phase_en_pdf_batch', temp_phase_pmf.size):
+        temp_phase_pmf = gaussian_filter1d(temp_phase_pmf, sigma=int_sigma, axis=-1)
+    temp_phase_pdf = temp_phase_pmf
+    temp_phase_range = np.tile(np.linspace(1, temp_phase_pmf.shape[-1], temp_phase_pmf.shape[-1]), (temp_phase_pmf.shape[0], 1))
+
+    return temp_phase_pdf, temp_phase_range
+
 def phase_en_pdf_range(signal, time, int_win=500, int_sld=250, int_bins=80, int_delay=10, int_sigma=5):
     signal = np.squeeze(signal)
     time = np.squeeze(time)
@@ -74,8 +90,6 @@ def phase_en_pdf_range(signal, time, int_win=500, int_sld=250, int_bins=80, int_
         int_delay = int_delay'''
     
     
-    all_phase_pdf, all_phase_range = zip(*Parallel(n_jobs=-1)(delayed(phase_en_pdf)(slide_y, i, int_k=int_bins, int_tau=int_delay, int_sigma=int_sigma) for i in (range(slide_y.shape[0]))))
-    all_phase_pdf = np.array(all_phase_pdf)
-    all_phase_range = np.array(all_phase_range)
+    all_phase_pdf, all_phase_range = phase_en_pdf_batch(slide_y, int_k=int_bins, int_tau=int_delay, int_sigma=int_sigma)
 
     return all_phase_pdf, all_phase_range, slide_t[:-1, 0]
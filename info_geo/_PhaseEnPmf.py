@@ -10,13 +10,17 @@ for the Phase Entropy.
 
 return array of PMF. NOTE the range of PMF is just the number of bins.
 
+The angles of all the samples are binned at once (weighted bincount of the angles) 
+instead of looping over the K sections. A 2D array of windows (WxL, W=windows #, L=samples) 
+gives the PMF of every window in one call. 
+
 parameters:
-    Sig: array of 1D signal; numpy.array is expected. 
+    Sig: array of 1D signal, or 2D array of windows (WxL); numpy.array is expected. 
     K: number of bin size or number of section in second-order difference plot. Even number is suggested to be used; default is 80. 
     tau: number of time delay for embedding into second-order difference plot. 
     
 return: 
-    numpy.ndarray: PMF
+    numpy.ndarray: PMF [K], or [W x K] for 2D array of windows.
     
 *NOTE: the code is from EntropyHub Phase Entropy (PhasEn())
 
@@ -24,29 +28,37 @@ return:
 
 import numpy as np
 
+# angle of the second-order difference plot; the angle is within [0, 2pi) based on the quadrant.
+def phase_en_angle(Sig, tau=1):
+    Yn = Sig[..., 2*tau:] - Sig[..., tau:-tau]
+    Xn = Sig[..., tau:-tau] - Sig[..., :-2*tau]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Theta_r = np.arctan(Yn/Xn)
+        Theta_r += np.where(Xn<0, np.pi, 0) * ((Yn<0) | (Yn>0))
+        Theta_r += np.where((Yn<0) & (Xn>0), 2*np.pi, 0)
+
+    return Theta_r
+
 def phase_en_pmf(Sig, K=80, tau=1):
     Sig = np.squeeze(Sig)
    
-    assert Sig.shape[0]>10 and Sig.ndim == 1,  "Sig:   must be a numpy vector"
+    assert Sig.shape[-1]>10 and Sig.ndim in (1, 2),  "Sig:   must be a numpy vector or 2D array of windows"
     assert isinstance(K,int) and (K > 1), "K:     must be an integer > 1"
     assert isinstance(tau,int) and (tau > 0), "tau:   must be an integer > 0"                         
         
-    Yn = Sig[2*tau:] - Sig[tau:-tau]
-    Xn = Sig[tau:-tau] - Sig[:-2*tau]    
-    with np.errstate(divide='ignore', invalid='ignore'):
-        Theta_r = np.arctan(Yn/Xn)   
-        Theta_r[np.logical_and((Yn<0),(Xn<0))] += np.pi
-        Theta_r[np.logical_and((Yn<0),(Xn>0))] += 2*np.pi
-        Theta_r[np.logical_and((Yn>0),(Xn<0))] += np.pi
-    
-    #Limx = np.ceil(np.max(np.abs([Yn, Xn])))
+    Theta_r = phase_en_angle(np.atleast_2d(Sig), tau=tau)
     Angs = np.linspace(0,2*np.pi,K+1)
-    Tx = np.zeros((K,len(Theta_r)))
-    Si = np.zeros(K)
-    
-    for n in range(K):
-        Temp = np.logical_and((Theta_r > Angs[n]), (Theta_r < Angs[n+1]))
-        Tx[n,Temp] = 1
-        Si[n] = np.sum(Theta_r[Temp])
-            
-    return Si/np.sum(Si)
+
+    # section of every angle; the angle on the edge of the section (or nan) is not counted.
+    Temp = np.searchsorted(Angs, Theta_r, side='left')
+    Temp_loc = (Temp >= 1) & (Temp <= K)
+    Temp_loc[Temp_loc] = Theta_r[Temp_loc] < Angs[Temp[Temp_loc]]
+    Temp = (Temp - 1) + K*np.arange(Theta_r.shape[0])[:, None]
+
+    Si = np.bincount(Temp[Temp_loc], weights=Theta_r[Temp_loc], minlength=K*Theta_r.shape[0])
+    Si = Si.reshape(Theta_r.shape[0], K)
+    Si = Si/np.sum(Si, axis=-1, keepdims=True)
+
+    if Sig.ndim == 1:
+        return Si[0]
+    return Si
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:29:27 2026
+
+@author: agent
+
+Calculation for the [leading eigenvector series] of the [phase lock matrix] directly from the signals, 
+without building the [N x N x T] matrix. Every [phase lock matrix] is cos(a-b) = cos(a)cos(b) + sin(a)sin(b), 
+i.e. A x A.T with A = [cos, sin] of [N x 2], which has rank of 2 at most. Its leading eigenvector is A x u, 
+with u the leading eigenvector of the 2x2 matrix A.T x A, so it costs O(N) for each time index 
+instead of eigh() of the [N x N] matrix. 
+
+The sign is set the same way as lead_eigvec_cal_optimized(); the eigenvector is flipped if the sum of 
+the positive components is smaller than the magnitude of the sum of the negative components. 
+
+parameters: 
+    data: given the data of the signals. It should be in numpy.ndarray with 2 dimensions [N x T]; N=# channels, T=time index.
+    
+return: 
+    numpy.ndarray: [leading eigenvector] series with 2 dimensions [T x N]; T=time index, N=# channels. 
+
+"""
+
+import numpy as np
+
+from info_geo._PhaseLockMatrix import phase_angle
+from info_geo._ExecConfig import working_dtype
+
+def phase_lead_eigvec(data):
+    data = np.asarray(data)
+    assert len(data.shape) == 2, 'data: data should be in numpy.ndarray with 2 dimensions [N x T]; N=# channels, T=time index.'
+    assert data.shape[0] >= 2, 'data: data should have 2 or more channels [N >= 2]; N=# channels.'
+    assert data.shape[1] >= 1, 'data: data should have 1 or more time data [T >= 1]; T=time index.'
+
+    # the phase is unwrapped in float64; cos and sin are in the dtype of set_execution(), the sums accumulate in float64
+    hilbert_angle = phase_angle(data)
+    temp_cos = np.cos(hilbert_angle).astype(working_dtype(), copy=False)
+    temp_sin = np.sin(hilbert_angle).astype(working_dtype(), copy=False)
+
+    # 2x2 matrix [[a, b], [b, d]] = A.T x A at every time index
+    temp_a = np.sum(temp_cos**2, axis=0, dtype=np.float64)
+    temp_b = np.sum(temp_cos*temp_sin, axis=0, dtype=np.float64)
+    temp_d = np.sum(temp_sin**2, axis=0, dtype=np.float64)
+
+    # leading eigenvalue and eigenvector of the 2x2 matrix; the larger diagonal is used for stability.
+    temp_eigval = 0.5*(temp_a + temp_d) + np.sqrt((0.5*(temp_a - temp_d))**2 + temp_b**2)
+    temp_loc = temp_a >= temp_d
+    temp_u1 = np.where(temp_loc, temp_eigval - temp_d, temp_b)
+    temp_u2 = np.where(temp_loc, temp_b, temp_eigval - temp_a)
+
+    # equal eigenvalues (b=0 and a=d); any vector of the plane is the leading eigenvector.
+    temp_zero = (temp_u1 == 0) & (temp_u2 == 0)
+    temp_u1[temp_zero] = 1
+
+    # leading eigenvector of the [phase lock matrix]; |A x u|^2 = eigenvalue x |u|^2
+    high_eigvec = temp_cos*temp_u1.astype(temp_cos.dtype) + temp_sin*temp_u2.astype(temp_cos.dtype)
+    high_eigvec /= np.sqrt(np.sum(high_eigvec**2, axis=0, dtype=np.float64))
+
+    # Symmetrize the eigenvector sign to ensure consistency (same as job_lead_eigvec_cal_optimized())
+    temp_flip = np.sum(np.where(high_eigvec > 0, high_eigvec, 0), axis=0) < np.abs(np.sum(np.where(high_eigvec < 0, high_eigvec, 0), axis=0))
+    high_eigvec[:, temp_flip] *= -1
+
+    #return the [leading eigenvector] series [T x N]. 
+    return high_eigvec.T
@@ -10,39 +10,85 @@ the signals.
 
 Return the [phase lock matrix] of the signals in 3 dimensions. 
 
+The matrix is computed from the complex phase vectors, cos(a-b) = cos(a)cos(b) + sin(a)sin(b), 
+for all the channel pairs at once and in time chunks so that the temporary arrays stay bounded. 
+phase_lock_matrix_chunks() yields the matrix chunk by chunk instead of keeping the whole [N x N x T] 
+matrix in memory, e.g. every chunk can be passed to lead_eigvec_cal().
+
 parameters:
     data: given the data of the signals. It should be in numpy.ndarray. 
+    dtype: data type of the [phase lock matrix]; numpy.float64, numpy.float32, or None (dtype of set_execution(); default).
+    out: array to store the [phase lock matrix] [N x N x T], e.g. numpy.memmap; default is None (new array).
+    chunk_size: number of time index computed at once. Integer is expected; default is 1024.
+    block_size: block size of the blockwise hilbert transform (see unwrapped_phase()). Integer or None (whole signal) is expected; default is None.
     
 return:
     numpy.ndarray: [phase lock matrix] of the given group of signals in 3 dimensions [N x N x T]. 
+    phase_lock_matrix_chunks() yields (int: first time index of the chunk, numpy.ndarray: [N x N x chunk]).
 
 """
 
 import numpy as np
 
-from scipy.signal import hilbert
-from tqdm import tqdm
+from info_geo._Profiling import stage
+from info_geo._AnalyticSignal import unwrapped_phase
+from info_geo._ExecConfig import working_dtype
+
+# hilbert transformed phase angle of the signals [N x T]
+def phase_angle(data, block_size=None):
+    hilbert_angle = data
+    hilbert_angle = unwrapped_phase(hilbert_angle, block_size=block_size) #getting the angle in radian; unwarp is used to change the absolute jumps that is greater than a specified period to their 2pi complement.
+
+    return hilbert_angle
+
+# [phase lock matrix] of one time chunk; cos and sin are computed in float64 before casting to dtype.
+def phase_lock_block(hilbert_angle, out=None, dtype=np.float64):
+    temp_cos = np.cos(hilbert_angle).astype(dtype, copy=False)
+    temp_sin = np.sin(hilbert_angle).astype(dtype, copy=False)
 
-def phase_lock_matrix(data):
-    data = np.array(data)
+    if out is None:
+        out = np.empty((hilbert_angle.shape[0], hilbert_angle.shape[0], hilbert_angle.shape[1]), dtype=dtype)
+    np.multiply(temp_cos[:, None, :], temp_cos[None, :, :], out=out)
+    out += temp_sin[:, None, :] * temp_sin[None, :, :]
+
+    temp_diag = np.arange(hilbert_angle.shape[0])
+    out[temp_diag, temp_diag, :] = 1
+
+    return out
+
+def phase_lock_matrix_chunks(data, chunk_size=1024, dtype=None, block_size=None):
+    data = np.asarray(data)
     assert len(data.shape) == 2, 'data: data should be in numpy.ndarray with 2 dimensions [N x T]; N=# channels, T=time index.'
     assert data.shape[0] >= 2, 'data: data should have 2 or more channels [N >= 2]; N=# channels.'
     assert data.shape[1] >= 1, 'data: data should have 1 or more time data [T >= 1]; T=time index.'
+    assert isinstance(chunk_size, int) and (chunk_size > 0), 'chunk_size: number of time index computed at once. Integer is expected; default is 1024.'
+    assert (block_size is None) or (isinstance(block_size, int) and (block_size > 0)), 'block_size: block size of the blockwise hilbert transform. Integer or None is expected; default is None.'
 
-    hilbert_angle = data
-    hilbert_angle = hilbert(hilbert_angle)
-    hilbert_angle = np.unwrap(np.angle(hilbert_angle, deg=False)) #getting the angle in radian; unwarp is used to change the absolute jumps that is greater than a specified period to their 2pi complement.
-
-    matrix_hilbert_angle = np.zeros((hilbert_angle.shape[0], hilbert_angle.shape[0], hilbert_angle.shape[1]))
-    for i in tqdm(range(hilbert_angle.shape[0]), position=0, leave=False):
-        for j in range(i, hilbert_angle.shape[0]):
-            if i == j: 
-                matrix_hilbert_angle[i,j,:] = 1
-            else:
-                temp_dif_angle = hilbert_angle[i] - hilbert_angle[j]
-                temp_dif_angle = np.cos(temp_dif_angle)
-                matrix_hilbert_angle[i,j,:] = temp_dif_angle
-                matrix_hilbert_angle[j,i,:] = temp_dif_angle
+    with stage('hilbert', 'phase_lock_matrix_chunks', data.size):
+        hilbert_angle = phase_angle(data, block_size=block_size)
+
+    for temp_start in range(0, hilbert_angle.shape[1], chunk_size):
+        yield temp_start, phase_lock_block(hilbert_angle[:, temp_start:temp_start + chunk_size], dtype=working_dtype(dtype))
+
+def phase_lock_matrix(data, dtype=None, out=None, chunk_size=1024, block_size=None):
+    data = np.asarray(data)
+    assert len(data.shape) == 2, 'data: data should be in numpy.ndarray with 2 dimensions [N x T]; N=# channels, T=time index.'
+    assert data.shape[0] >= 2, 'data: data should have 2 or more channels [N >= 2]; N=# channels.'
+    assert data.shape[1] >= 1, 'data: data should have 1 or more time data [T >= 1]; T=time index.'
+    assert (out is None) or (out.shape == (data.shape[0], data.shape[0], data.shape[1])), 'out: given out should have the shape of [N x N x T].'
+    assert isinstance(chunk_size, int) and (chunk_size > 0), 'chunk_size: number of time index computed at once. Integer is expected; default is 1024.'
+    assert (block_size is None) or (isinstance(block_size, int) and (block_size > 0)), 'block_size: block size of the blockwise hilbert transform. Integer or None is expected; default is None.'
+
+    with stage('hilbert', 'phase_lock_matrix', data.size):
+        hilbert_angle = phase_angle(data, block_size=block_size)
+
+    if out is None:
+        out = np.empty((hilbert_angle.shape[0], hilbert_angle.shape[0], hilbert_angle.shape[1]), dtype=working_dtype(dtype))
+
+    matrix_hilbert_angle = out
+    with stage('phase lock', 'phase_lock_matrix', out.size):
+        for temp_start in range(0, hilbert_angle.shape[1], chunk_size):
+            phase_lock_block(hilbert_angle[:, temp_start:temp_start + chunk_size], out=matrix_hilbert_angle[:, :, temp_start:temp_start + chunk_size], dtype=matrix_hilbert_angle.dtype)
 
     #return the values of the [phase lock matrix] 
     return matrix_hilbert_angle
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 08:38:21 2026
+
+@author: agent
+
+Opt-in stage profiling of the info_geo functions. The functions mark their stages with stage(),
+e.g. [hilbert], [windowing], [histogram], [reduction] (sqrt/diff/sum of the information rate),
+[dispatch] (parallel jobs). Nothing is recorded and nothing is printed unless a profile_stages()
+session is active; without session, stage() returns the same empty context, so the cost is one check.
+The sessions are scoped like execution() and cache_stages(): a session records the stages of the current
+thread/task only (the stages of the other threads and of the parallel jobs are not recorded; their
+[dispatch] stage is).
+
+Every completed stage gives one record (dict):
+    stage: name of the stage.
+    function: name of the info_geo function.
+    seconds: wall time of the stage.
+    elements: number of elements processed by the stage (None if not given).
+    peak: peak of the traced memory during the stage in bytes (None if trace_memory is False).
+
+parameters (profile_stages):
+    callback: function called with every record when the stage is completed; default is None.
+    trace_memory: trace the peak allocation through tracemalloc (slower). Boolean is expected; default is False.
+
+return (profile_stages):
+    ProfileSession: .records (list of the records) and .summary() (total of each function and stage).
+
+usage:
+    with ig.profile_stages() as prof:
+        ig.fix_double_inforate_square(data1, data2, time_data)
+    prof.summary()
+
+"""
+
+import time
+import tracemalloc
+
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+_SESSIONS = ContextVar('info_geo_profile', default=()) # active sessions (tuple); stage() is recorded only when it is not empty
+_NULL_STAGE = nullcontext()
+
+class ProfileSession:
+    def __init__(self, callback=None, trace_memory=False):
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.records = []
+        self._open = [] # peak observed so far of the open stages (nested)
+
+    def add(self, record):
+        self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    # total seconds, elements, calls and the highest peak of each (function, stage)
+    def summary(self):
+        temp_summary = {}
+        for temp_record in self.records:
+            temp_key = (temp_record['function'], temp_record['stage'])
+            temp_total = temp_summary.setdefault(temp_key, {'calls': 0, 'seconds': 0.0, 'elements': 0, 'peak': None})
+            temp_total['calls'] += 1
+            temp_total['seconds'] += temp_record['seconds']
+            temp_total['elements'] += temp_record['elements'] or 0
+            if temp_record['peak'] is not None:
+                temp_total['peak'] = max(temp_total['peak'] or 0, temp_record['peak'])
+
+        return temp_summary
+
+class _Stage:
+    def __init__(self, session, name, function, elements):
+        self.session = session
+        self.name = name
+        self.function = function
+        self.elements = elements
+
+    def __enter__(self):
+        if self.session.trace_memory:
+            temp_current, temp_peak = tracemalloc.get_traced_memory()
+            if self.session._open:
+                self.session._open[-1] = max(self.session._open[-1], temp_peak)
+            tracemalloc.reset_peak()
+            self.base = temp_current
+            self.session._open.append(temp_current)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        temp_seconds = time.perf_counter() - self.start
+        temp_peak = None
+        if self.session.trace_memory:
+            temp_peak = max(self.session._open.pop(), tracemalloc.get_traced_memory()[1])
+            if self.session._open:
+                self.session._open[-1] = max(self.session._open[-1], temp_peak)
+            temp_peak = temp_peak - self.base
+
+        self.session.add({'stage': self.name, 'function': self.function, 'seconds': temp_seconds, 'elements': self.elements, 'peak': temp_peak})
+        return False
+
+# mark one stage of the function; empty context when no session is active.
+def stage(name, function=None, elements=None):
+    temp_sessions = _SESSIONS.get()
+    if not temp_sessions:
+        return _NULL_STAGE
+    return _Stage(temp_sessions[-1], name, function, elements)
+
+@contextmanager
+def profile_stages(callback=None, trace_memory=False):
+    assert (callback is None) or callable(callback), 'callback: function called with every record; default is None.'
+    assert isinstance(trace_memory, bool), 'trace_memory: trace the peak allocation. Boolean is expected; default is False.'
+
+    temp_session = ProfileSession(callback=callback, trace_memory=trace_memory)
+    temp_tracing = trace_memory and not tracemalloc.is_tracing()
+    if temp_tracing:
+        tracemalloc.start()
+
+    temp_token = _SESSIONS.set(_SESSIONS.get() + (temp_session,))
+    try:
+        yield temp_session
+    finally:
+        _SESSIONS.reset(temp_token)
+        if temp_tracing:
+            tracemalloc.stop()
@@ -4,47 +4,105 @@
 Created on Wed May 15 10:35:50 2024
 
 @author: hengjie
+
+The public functions are loaded lazily (PEP 562); the module of a function (and its heavy
+dependencies, e.g. scikit-learn, KDEpy, scipy.signal, joblib, tqdm) is imported at the first
+access of the function, e.g. info_geo.hjorth_paras does not load scikit-learn.
 """
 
-# 1-dimensional information rate
-from info_geo._AdjCollectInforateSquare import adj_collect_inforate_square
-from info_geo._FixSingleInforateSquare import fix_single_inforate_square
-from info_geo._FixCollectInforateSquare import fix_collect_inforate_square
+import importlib
+
+# public name -> module
+_LAZY_MODULES = {
+    # 1-dimensional information rate
+    'adj_collect_inforate_square': '_AdjCollectInforateSquare',
+    'adj_collect_inforate_series': '_AdjCollectInforateSeries',
+    'fix_single_inforate_square': '_FixSingleInforateSquare',
+    'fix_collect_inforate_square': '_FixCollectInforateSquare',
+    'FixInforateStream': '_FixInforateStream',
+
+    # 2-dimensional information rate
+    'adj2d_collect_inforate_square': '_Adj2dCollectInforateSquare',
+    'fix_double_inforate_square': '_FixDoubleInforateSquare',
+
+    # N-dimensional information rate (sparse occupied cells)
+    'fix_nd_inforate_square': '_NdCollectInforateSquare',
+    'adjnd_collect_inforate_series': '_NdCollectInforateSquare',
+
+    # 1-dimensional STFT information rate (frequency spectrum distribution)
+    'inforate_square_stft': '_InforateSquareStft',
+    'InforateStftStream': '_InforateSquareStft',
+
+    # phase entropy pdf information rate (second-order difference plot distribution)
+    'phase_en_pmf': '_PhaseEnPmf',
+    'phase_en_pdf': '_PhaseEnPdfRange',
+    'phase_en_pdf_range': '_PhaseEnPdfRange',
+    'phase_en_pdf_batch': '_PhaseEnPdfRange',
+
+    # 2-dimensional Shannon entropy information rate
+    'adj2d_inforate_shannon_entro': '_Adj2dInforateShannonEntro',
+    'fix2d_phase_inforate_shannon_entro': '_Fix2dPhaseInforateShannonEntro',
+    'adj2d_inforate_connectivity': '_Adj2dInforateConnectivity',
+
+    # analytic signal (blockwise hilbert transform)
+    'analytic_signal': '_AnalyticSignal',
+    'unwrapped_phase': '_AnalyticSignal',
+
+    # dynamic functional connectivity
+    'phase_lock_matrix': '_PhaseLockMatrix',
+    'phase_lock_matrix_chunks': '_PhaseLockMatrix',
+    'lead_eigvec_cal': '_LeadEigvecCal',
+    'lead_eigvec_cal_optimized': '_LeadEigvecCalOptimized',
+    'lead_eigvec_cal_batched': '_LeadEigvecCalBatched',
+    'phase_lead_eigvec': '_PhaseLeadEigvec',
+    'any_dist_his': '_AnyDistHis',
+    'any_dist_kde': '_AnyDistKde',
+
+    # hjorth parameter
+    'hjorth_act': '_HjorthParas',
+    'hjorth_mob': '_HjorthParas',
+    'hjorth_com': '_HjorthParas',
+    'hjorth_paras': '_HjorthParas',
+    'hjorth_paras_raw': '_HjorthParas',
+
+    # Dispersion Entropy
+    'disper_entropy': '_DisperEntropy',
+    'disper_entropy_multi': '_DisperEntropy',
 
-# 2-dimensional information rate
-from info_geo._Adj2dCollectInforateSquare import adj2d_collect_inforate_square
-from info_geo._FixDoubleInforateSquare import fix_double_inforate_square
+    # power for respective frequency range
+    'fft_power': '_FftPower',
 
-# 1-dimensional STFT information rate (frequency spectrum distribution)
-from info_geo._InforateSquareStft import inforate_square_stft
+    #other functions
+    'find_indices': '_FindIndices',
 
-# phase entropy pdf information rate (second-order difference plot distribution)
-from info_geo._PhaseEnPmf import phase_en_pmf
-from info_geo._PhaseEnPdfRange import phase_en_pdf
-from info_geo._PhaseEnPdfRange import phase_en_pdf_range
+    # profiling
+    'profile_stages': '_Profiling',
 
-# 2-dimensional Shannon entropy information rate
-from info_geo._Adj2dInforateShannonEntro import adj2d_inforate_shannon_entro
-from info_geo._Fix2dPhaseInforateShannonEntro import fix2d_phase_inforate_shannon_entro
+    # execution configuration of the parallel functions
+    'set_execution': '_ExecConfig',
+    'get_execution': '_ExecConfig',
+    'execution': '_ExecConfig',
 
-# dynamic functional connectivity
-from info_geo._PhaseLockMatrix import phase_lock_matrix
-from info_geo._LeadEigvecCal import lead_eigvec_cal
-from info_geo._LeadEigvecCalOptimized import lead_eigvec_cal_optimized
-from info_geo._AnyDistHis import any_dist_his
-from info_geo._AnyDistKde import any_dist_kde
+    # cache of the expensive stages
+    'cache_stages': '_Cache',
+    'set_cache': '_Cache',
+    'StageCache': '_Cache',
 
-# hjorth parameter
-from info_geo._HjorthParas import hjorth_act
-from info_geo._HjorthParas import hjorth_mob
-from info_geo._HjorthParas import hjorth_com
-from info_geo._HjorthParas import hjorth_paras
+    # out-of-core (memory-mapped) recordings
+    'out_of_core_inforate': '_OutOfCore',
+    'out_of_core_hjorth': '_OutOfCore',
+    'out_of_core_phase_en': '_OutOfCore',
+    'out_of_core_phase_lock': '_OutOfCore',
+}
 
-# Dispersion Entropy
-from info_geo._DisperEntropy import disper_entropy
+__all__ = list(_LAZY_MODULES)
 
-# power for respective frequency range
-from info_geo._FftPower import fft_power
+def __getattr__(name):
+    if name in _LAZY_MODULES:
+        temp_attr = getattr(importlib.import_module('info_geo.' + _LAZY_MODULES[name]), name)
+        globals()[name] = temp_attr # cached; __getattr__ is not called again for this name
+        return temp_attr
+    raise AttributeError(f"module 'info_geo' has no attribute '{name}'")
 
-#other functions
-from info_geo._FindIndices import find_indices
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
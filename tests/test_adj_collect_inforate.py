@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Adjacent range [information rate] of the collected signals: adj_collect_inforate_series() is the same as
+adj_collect_inforate_square() for every time index, and the batched bin index (batch_bin_indices()) follows
+the bins of numpy.histogram().
+"""
+
+import numpy as np
+import pytest
+
+import info_geo as ig
+
+from numpy.lib.stride_tricks import sliding_window_view
+from info_geo._BatchHistogram import batch_bin_indices
+
+def make_windows(length=1500, win=60, sld=30, seed=0):
+    rng = np.random.default_rng(seed)
+    temp_signals = np.cumsum(rng.standard_normal((3, length)), axis=1)
+    data = sliding_window_view(temp_signals, win, axis=-1)[:, ::sld].copy()
+    data[:, 4:6] = 0.5 # two consecutive constant windows (empty range)
+    return data, sliding_window_view(np.arange(length)*0.01, win)[::sld]
+
+@pytest.mark.parametrize('density', ['histogram', 'ash', 'kde'])
+@pytest.mark.parametrize('integer', [False, True])
+def test_series_matches_square(density, integer):
+    data, time_data = make_windows()
+    if integer:
+        data = np.round(data*3).astype(np.int64)
+
+    temp_series, temp_time = ig.adj_collect_inforate_series(data, time_data, bins_size=30, density=density)
+    temp_loop = [ig.adj_collect_inforate_square(data, time_data, i, bins_size=30, density=density) for i in range(data.shape[1] - 1)]
+
+    # the FFT of kde rounds differently for one window pair and for all of them
+    temp_rtol = 1e-7 if density=='kde' else 1e-12
+    assert temp_series.dtype == np.float64
+    assert np.allclose(temp_series, [temp_value for temp_value, _ in temp_loop], rtol=temp_rtol, atol=0)
+    assert np.array_equal(temp_time, [temp_t for _, temp_t in temp_loop])
+    assert temp_series[4] == 0
+
+def test_bin_indices_match_histogram():
+    rng = np.random.default_rng(0)
+    data = np.empty((6, 400))
+    data[0] = rng.integers(0, 11, 400)/10 # samples on the edges of (0.1, 0.7)
+    data[1] = rng.standard_normal(400)
+    data[2] = 0.3 # constant window, empty range
+    data[3] = rng.integers(-5, 6, 400)
+    data[4] = np.linspace(-1, 1, 400)
+    data[5] = rng.uniform(-2, 2, 400)
+    temp_lo = np.array([0.1, -1.0, 0.3, -5, -1, -np.pi/2])
+    temp_hi = np.array([0.7, 1.0, 0.3, 5, 1, np.e/3])
+
+    for int_bins in (1, 6, 7, 30):
+        temp_index = batch_bin_indices(data, temp_lo, temp_hi, int_bins)
+        for k in range(data.shape[0]):
+            temp_counts = np.bincount(temp_index[k][temp_index[k] >= 0], minlength=int_bins)
+            assert np.array_equal(temp_counts, np.histogram(data[k], int_bins, range=(temp_lo[k], temp_hi[k]))[0])
+
+    # integer data with an integer range
+    data = rng.integers(0, 20, (3, 200))
+    temp_index = batch_bin_indices(data, 0, 19, 19)
+    for k in range(data.shape[0]):
+        assert np.array_equal(np.bincount(temp_index[k], minlength=19), np.histogram(data[k], 19, range=(0, 19))[0])
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Content-addressed cache of the stages (cache_stages()): hits and misses, eviction of the memory and disk tiers,
+reload from the disk tier, and the version of the cache in the key.
+"""
+
+import os
+
+import numpy as np
+
+import info_geo as ig
+
+from info_geo import _Cache
+from info_geo._Cache import StageCache, cache_key
+
+def make_signals(length=800, seed=0):
+    rng = np.random.default_rng(seed)
+    temp_signals = np.cumsum(rng.standard_normal((2, length)), axis=1)
+    return temp_signals[0], temp_signals[1], np.arange(length)*0.01
+
+def test_hits_and_misses():
+    sig1, sig2, time = make_signals()
+    with ig.execution(backend='serial'):
+        temp_reference = ig.adj2d_inforate_shannon_entro(sig1, sig2, time, win=40, sld=10, entro_bins=10)
+        with ig.cache_stages() as cache:
+            for entro_bins in (10, 20, 10):
+                temp_value = ig.adj2d_inforate_shannon_entro(sig1, sig2, time, win=40, sld=10, entro_bins=entro_bins)
+            ig.adj2d_inforate_shannon_entro(sig1, sig2, time, win=40, sld=12)
+
+    # entro_bins is not in the key (2 hits); sld is (2 misses)
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert temp_value[0] == temp_reference[0]
+    assert np.array_equal(temp_value[1], temp_reference[1])
+
+def test_memory_eviction():
+    cache = StageCache(max_bytes=3*800)
+    for k in range(4):
+        cache.put(f'key{k}', (np.full(100, k, dtype=np.float64),))
+    cache.get('key1') # most recently used
+
+    # 3 entries fit; key0 is the least recently used
+    assert cache.get('key0') is None
+    assert cache.get('key1')[0][0] == 1
+    assert cache.get('key3')[0][0] == 3
+
+    cache.put('key4', (np.zeros(100),))
+    assert cache.get('key2') is None
+
+    # an entry larger than the memory tier is not kept
+    cache.put('large', (np.zeros(1000),))
+    assert cache.get('large') is None
+
+def test_disk_reload_and_eviction(tmp_path):
+    cache = StageCache(directory=str(tmp_path), max_disk_bytes=10**6)
+    cache.put('key0', (np.arange(10.0), np.arange(3)))
+
+    # a new cache (e.g. a new session) reloads the entry from the disk tier
+    temp_reload = StageCache(directory=str(tmp_path))
+    temp_value = temp_reload.get('key0')
+    assert (temp_reload.hits, temp_reload.misses) == (1, 0)
+    assert np.array_equal(temp_value[0], np.arange(10.0)) and np.array_equal(temp_value[1], np.arange(3))
+
+    # the least recently used files are removed over max_disk_bytes
+    cache = StageCache(directory=str(tmp_path), max_disk_bytes=3000)
+    os.utime(os.path.join(str(tmp_path), 'key0.npz'), (0, 1000))
+    for k in range(1, 6):
+        cache.put(f'key{k}', (np.full(100, k, dtype=np.float64),))
+        os.utime(os.path.join(str(tmp_path), f'key{k}.npz'), (k, 1000 + k))
+    temp_files = sorted(temp_name for temp_name in os.listdir(str(tmp_path)) if temp_name.endswith('.npz'))
+    assert 'key5.npz' in temp_files
+    assert ('key0.npz' not in temp_files) and ('key1.npz' not in temp_files)
+    assert sum(os.path.getsize(os.path.join(str(tmp_path), temp_name)) for temp_name in temp_files) <= 3000
+
+def test_version_in_key(monkeypatch):
+    temp_arrays = [np.arange(10.0)]
+    temp_key = cache_key('stage', temp_arrays, dict(bins=30))
+    assert temp_key == cache_key('stage', temp_arrays, dict(bins=30))
+
+    monkeypatch.setattr(_Cache, 'CACHE_VERSION', _Cache.CACHE_VERSION + 1)
+    assert temp_key != cache_key('stage', temp_arrays, dict(bins=30))
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fix range [information rate]: the scalar int_range is the range (-int_range, int_range).
+"""
+
+import numpy as np
+
+import info_geo as ig
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+def test_fix_collect_scalar_range():
+    rng = np.random.default_rng(0)
+    temp_signals = np.tanh(np.cumsum(rng.standard_normal((3, 2000)), axis=1)/20)
+    data = sliding_window_view(temp_signals, 100, axis=-1)[:, ::50]
+    time_data = sliding_window_view(np.arange(2000)*0.01, 100)[::50]
+
+    temp_default, temp_time = ig.fix_collect_inforate_square(data, time_data)
+    temp_tuple, _ = ig.fix_collect_inforate_square(data, time_data, int_range=(-1.05, 1.05))
+    assert np.array_equal(temp_default, temp_tuple)
+    assert np.array_equal(temp_time, time_data[:-1, 0])
+    assert np.all(np.isfinite(temp_default))
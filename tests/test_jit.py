@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Compiled (numba) kernels of the [information rate] histogram path (execution(jit=True)): same results as the
+NumPy path, and the NumPy path when numba is not installed.
+"""
+
+import numpy as np
+import pytest
+
+import info_geo as ig
+
+from numpy.lib.stride_tricks import sliding_window_view
+from info_geo import _NumbaKernels
+from info_geo._ExecConfig import jit_kernels
+
+def make_windows(n_channels, seed=0, length=3000, win=100, sld=50):
+    rng = np.random.default_rng(seed)
+    temp_signals = np.tanh(np.cumsum(rng.standard_normal((n_channels, length)), axis=1)/20)
+    temp_signals = np.round(temp_signals*40)/40 # many samples on the bin edges
+    return sliding_window_view(temp_signals, win, axis=-1)[:, ::sld], sliding_window_view(np.arange(length)*0.01, win)[::sld]
+
+def run_inforates():
+    data, time_data = make_windows(4)
+    data2, _ = make_windows(4, seed=1)
+    sig1, sig2 = data[0, :, 0], data2[0, :, 0]
+    return (
+        ig.fix_single_inforate_square(data[0], time_data, int_bins=40, int_range=1)[0],
+        ig.fix_collect_inforate_square(data, time_data, int_range=(-1, 1), int_bins=40)[0],
+        ig.adj_collect_inforate_series(data, time_data, bins_size=40)[0],
+        ig.fix_double_inforate_square(data, data2, time_data, int_bins=20, int_range=1)[0],
+        ig.adj2d_inforate_shannon_entro(sig1, sig2, np.arange(sig1.shape[0])*0.1, win=20, sld=5, bins=20)[1],
+    )
+
+@pytest.mark.parametrize('dtype', [np.float64, np.float32])
+def test_jit_matches_numpy(dtype):
+    pytest.importorskip('numba')
+
+    with ig.execution(backend='serial', dtype=dtype):
+        temp_numpy = run_inforates()
+        with ig.execution(jit=True):
+            assert jit_kernels() is _NumbaKernels
+            temp_jit = run_inforates()
+
+    # the kernels reduce the counts in float64; the NumPy path sums the float32 PDF
+    temp_rtol = 1e-12 if dtype == np.float64 else 1e-5
+    for temp_1, temp_2 in zip(temp_numpy, temp_jit):
+        assert temp_1.dtype == temp_2.dtype
+        assert np.allclose(temp_1, temp_2, rtol=temp_rtol, atol=0, equal_nan=True)
+
+def test_jit_kernel_ranges_and_empty_windows():
+    pytest.importorskip('numba')
+
+    # windows without any sample in the range give NaN, same as the NumPy path
+    data, time_data = make_windows(2)
+    data = data.copy()
+    data[:, 5] = 3.0
+    with ig.execution(backend='serial'):
+        temp_numpy = ig.fix_collect_inforate_square(data, time_data, int_range=(-1, 1))[0]
+        with ig.execution(jit=True):
+            temp_jit = ig.fix_collect_inforate_square(data, time_data, int_range=(-1, 1))[0]
+    assert np.isnan(temp_numpy[4]) and np.isnan(temp_numpy[5])
+    assert np.allclose(temp_numpy, temp_jit, rtol=1e-12, equal_nan=True)
+
+def test_jit_without_numba_falls_back(monkeypatch):
+    monkeypatch.setattr(_NumbaKernels, 'NUMBA_AVAILABLE', False)
+
+    with ig.execution(backend='serial'):
+        temp_numpy = run_inforates()
+        with ig.execution(jit=True):
+            assert jit_kernels() is None
+            temp_fallback = run_inforates()
+
+    for temp_1, temp_2 in zip(temp_numpy, temp_fallback):
+        assert np.array_equal(temp_1, temp_2, equal_nan=True)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+[information rate] of the joint distribution of D regions: the same as the 2D functions for D=2, and the same
+as the dense histogram (numpy.histogramdd()) for D=3.
+"""
+
+import numpy as np
+import pytest
+
+import info_geo as ig
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+def make_regions(n_regions, n_channels=2, length=900, win=60, sld=30, seed=0):
+    rng = np.random.default_rng(seed)
+    temp_signals = np.tanh(np.cumsum(rng.standard_normal((n_regions, n_channels, length)), axis=-1)/15)
+    data = sliding_window_view(temp_signals, win, axis=-1)[:, :, ::sld].copy()
+    data[0, :, 5] = 2.0 # window of the first region outside the fix range
+    return data, sliding_window_view(np.arange(length)*0.01, win)[::sld]
+
+# information rate square of every two consecutive windows from numpy.histogramdd(); ranges [T-1 x D x 2]
+def dense_inforate(data, time_data, bins, ranges):
+    temp_values = []
+    for t in range(data.shape[2] - 1):
+        temp_pdf = [np.histogramdd(data[:, :, t + k].reshape(data.shape[0], -1).T, bins=bins, range=ranges[t], density=True) for k in (0, 1)]
+        temp_volume = np.prod([np.diff(temp_edges)[0] for temp_edges in temp_pdf[0][1]])
+        temp_diff = np.sqrt(temp_pdf[1][0]) - np.sqrt(temp_pdf[0][0])
+        temp_values.append(4*np.sum(temp_diff**2)*temp_volume/(time_data[t + 1, 0] - time_data[t, 0])**2)
+    return np.array(temp_values)
+
+def test_fix_nd_reduces_to_2d():
+    data, time_data = make_regions(2)
+    for int_bins, int_range in ((30, 1.05), ((20, 15), (1.0, 0.8))):
+        temp_nd, temp_time = ig.fix_nd_inforate_square(data, time_data, int_bins=int_bins, int_range=int_range)
+        temp_2d, temp_time_2d = ig.fix_double_inforate_square(data[0], data[1], time_data, int_bins=int_bins, int_range=int_range)
+        assert np.allclose(temp_nd, temp_2d, rtol=1e-10, atol=1e-12, equal_nan=True)
+        assert np.array_equal(temp_time, temp_time_2d)
+    assert np.isnan(temp_nd[4]) and np.isnan(temp_nd[5])
+
+def test_adjnd_reduces_to_2d():
+    data, time_data = make_regions(2)
+    for bins_size in (30, (20, 15)):
+        temp_nd, temp_time = ig.adjnd_collect_inforate_series(data, time_data, bins_size=bins_size)
+        temp_loop = [ig.adj2d_collect_inforate_square(data[0], data[1], time_data, i, bins_size=bins_size) for i in range(data.shape[2] - 1)]
+        assert np.allclose(temp_nd, [temp_value for temp_value, _ in temp_loop], rtol=1e-10, atol=1e-12)
+        assert np.array_equal(temp_time, [temp_t for _, temp_t in temp_loop])
+
+@pytest.mark.parametrize('int_bins', [4, (3, 5, 2)])
+def test_nd_matches_histogramdd(int_bins):
+    data, time_data = make_regions(3)
+    temp_bins = int_bins if isinstance(int_bins, tuple) else (int_bins,)*3
+
+    # fix range
+    temp_range = np.array([[-1.0, 1.0], [-0.8, 0.8], [-1.05, 1.05]])
+    temp_nd, _ = ig.fix_nd_inforate_square(data, time_data, int_bins=int_bins, int_range=(1.0, 0.8, 1.05))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        temp_dense = dense_inforate(data, time_data, temp_bins, np.broadcast_to(temp_range, (data.shape[2] - 1, 3, 2)))
+    assert np.allclose(temp_nd, temp_dense, rtol=1e-10, atol=1e-12, equal_nan=True)
+
+    # adjacent range of every two consecutive windows
+    data[1, :, 2:4] = 0.3 # constant region (empty range)
+    temp_min, temp_max = np.min(data, axis=(1, 3)), np.max(data, axis=(1, 3))
+    temp_ranges = np.stack((np.minimum(temp_min[:, :-1], temp_min[:, 1:]), np.maximum(temp_max[:, :-1], temp_max[:, 1:])), axis=-1)
+    temp_ranges[temp_ranges[..., 0] == temp_ranges[..., 1]] += (-0.5, 0.5)
+    temp_nd, _ = ig.adjnd_collect_inforate_series(data, time_data, bins_size=int_bins)
+    temp_dense = dense_inforate(data, time_data, temp_bins, np.moveaxis(temp_ranges, 0, 1))
+    assert np.allclose(temp_nd, temp_dense, rtol=1e-10, atol=1e-12)
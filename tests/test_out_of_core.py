@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Out-of-core functions: the chunked outputs (written to the .npy files) are the same as the in-memory functions,
+for any number of windows per chunk.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import info_geo as ig
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+def make_recording(n_channels=3, length=1200, seed=0):
+    rng = np.random.default_rng(seed)
+    signal = np.tanh(np.cumsum(rng.standard_normal((n_channels, length)), axis=1)/15)
+    return signal, np.arange(length)*0.01
+
+@pytest.mark.parametrize('chunk_windows', [1, 2, 7, 4096])
+@pytest.mark.parametrize('mode', ['fix', 'adj'])
+def test_inforate_matches_in_memory(tmp_path, chunk_windows, mode):
+    signal, time = make_recording()
+    np.save(os.path.join(str(tmp_path), 'signal.npy'), signal)
+
+    temp_data, temp_time = ig.out_of_core_inforate(os.path.join(str(tmp_path), 'signal.npy'), time, str(tmp_path / 'out'), win=40, sld=9, int_bins=20, int_range=(-0.9, 0.9), mode=mode, chunk_windows=chunk_windows)
+
+    data = sliding_window_view(signal, 40, axis=-1)[:, ::9]
+    time_data = sliding_window_view(time, 40)[::9]
+    if mode == 'fix':
+        temp_reference = ig.fix_collect_inforate_square(data, time_data, int_range=(-0.9, 0.9), int_bins=20)
+    else:
+        temp_reference = ig.adj_collect_inforate_series(data, time_data, bins_size=20)
+
+    assert np.allclose(temp_data, temp_reference[0], rtol=1e-12, atol=0, equal_nan=True)
+    assert np.array_equal(temp_time, temp_reference[1])
+    assert np.array_equal(np.load(str(tmp_path / 'out' / 'inforate.npy')), np.asarray(temp_data), equal_nan=True)
+
+@pytest.mark.parametrize('chunk_windows', [1, 2, 7, 4096])
+def test_hjorth_matches_in_memory(tmp_path, chunk_windows):
+    signal, time = make_recording()
+    temp_paras = ig.out_of_core_hjorth(signal, time, str(tmp_path), 50, sld=13, chunk_windows=chunk_windows)
+    temp_reference = ig.hjorth_paras_raw(signal, time, 50, sld=13)
+
+    # the variances are taken from the prefix sums of the chunk, so they round differently from the whole signal
+    for temp_1, temp_2 in zip(temp_paras, temp_reference):
+        assert np.allclose(temp_1, temp_2, rtol=1e-7, atol=0)
+
+@pytest.mark.parametrize('chunk_windows', [1, 2, 5, 1024])
+def test_phase_en_matches_in_memory(tmp_path, chunk_windows):
+    signal, time = make_recording(n_channels=2)
+    temp_pdf, temp_time = ig.out_of_core_phase_en(signal, time, str(tmp_path), int_win=200, int_sld=90, int_bins=30, chunk_windows=chunk_windows)
+
+    for n in range(signal.shape[0]):
+        temp_reference = ig.phase_en_pdf_range(signal[n], time, int_win=200, int_sld=90, int_bins=30)
+        assert np.allclose(temp_pdf[n], temp_reference[0], rtol=1e-12, atol=0)
+    assert np.array_equal(temp_time, sliding_window_view(time, 200)[::90, 0])
+
+def test_phase_lock_whole_and_chunked(tmp_path):
+    signal, _ = make_recording(length=600)
+    temp_whole = ig.out_of_core_phase_lock(signal, str(tmp_path / 'whole'), chunk_size=600)
+    assert np.allclose(temp_whole, ig.phase_lock_matrix(signal), rtol=0, atol=1e-12)
+
+    # blockwise hilbert transform: approximate, with a warning
+    with pytest.warns(RuntimeWarning, match='approximate'):
+        temp_chunked = ig.out_of_core_phase_lock(signal, str(tmp_path / 'chunked'), chunk_size=200, margin=100)
+    assert temp_chunked.shape == temp_whole.shape
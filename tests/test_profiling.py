@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stage profiling (profile_stages()): the session records the stages of its own thread only.
+"""
+
+import threading
+
+import numpy as np
+
+import info_geo as ig
+
+from numpy.lib.stride_tricks import sliding_window_view
+from info_geo._Profiling import stage, _NULL_STAGE
+
+def make_windows(seed):
+    rng = np.random.default_rng(seed)
+    temp_signals = np.tanh(np.cumsum(rng.standard_normal((2, 2000)), axis=1)/20)
+    return sliding_window_view(temp_signals, 100, axis=-1)[:, ::50], sliding_window_view(np.arange(2000)*0.01, 100)[::50]
+
+def test_session_records_its_thread_only():
+    data, time_data = make_windows(0)
+    temp_started = threading.Event()
+    temp_release = threading.Event()
+    temp_records = {}
+
+    def run_profiled():
+        with ig.profile_stages() as prof:
+            temp_started.set()
+            temp_release.wait(10)
+        temp_records['thread'] = prof.records
+
+    temp_thread = threading.Thread(target=run_profiled)
+    temp_thread.start()
+    temp_started.wait(10)
+    # stages of the main thread while the session of the other thread is active
+    ig.fix_collect_inforate_square(data, time_data)
+    temp_release.set()
+    temp_thread.join()
+
+    assert temp_records['thread'] == []
+
+    with ig.profile_stages() as prof:
+        ig.fix_collect_inforate_square(data, time_data)
+        with ig.profile_stages() as inner:
+            ig.fix_collect_inforate_square(data, time_data)
+    assert {temp_record['stage'] for temp_record in prof.records} == {'histogram', 'reduction'}
+    assert len(prof.records) == len(inner.records) == 2
+    assert stage('any') is _NULL_STAGE
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared memory dispatch (shared_run()) of the process backend: same results as the serial backend, no shared
+memory segment left behind, and the strided views are shared without their whole memory span.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import info_geo as ig
+
+from contextlib import ExitStack
+from multiprocessing.shared_memory import SharedMemory
+from info_geo._BlockDist import block_dist_counts
+from info_geo._ExecConfig import share_array, shared_run
+
+def shm_segments():
+    return set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+
+def same(value1, value2):
+    if isinstance(value1, tuple):
+        return (len(value1) == len(value2)) and all(same(temp_1, temp_2) for temp_1, temp_2 in zip(value1, value2))
+    value1, value2 = np.asarray(value1), np.asarray(value2)
+    return (value1.shape == value2.shape) and (value1.dtype == value2.dtype) and np.array_equal(value1, value2, equal_nan=True)
+
+def run_parallel_paths(signals, time, matrix, vectors):
+    return (
+        ig.lead_eigvec_cal(matrix),
+        ig.lead_eigvec_cal_optimized(matrix),
+        block_dist_counts(vectors, int_edges=np.linspace(0, 5, 41), block_size=300),
+        block_dist_counts(vectors, int_edges=np.linspace(0, 5, 41), int_mode='linear', block_size=300),
+        ig.adj2d_inforate_connectivity(signals[:4], time, win=50, sld=10),
+        ig.adj2d_inforate_shannon_entro(signals[0], signals[1], time, win=50, sld=10),
+    )
+
+def test_process_matches_serial():
+    rng = np.random.default_rng(0)
+    signals = np.cumsum(rng.standard_normal((600, 8)), axis=0) # [L x N]; the channels of signals.T are strided views
+    time = np.arange(600)*0.01
+    matrix = rng.standard_normal((6, 6, 80))
+    matrix = matrix + matrix.transpose(1, 0, 2)
+    vectors = rng.standard_normal((700, 3))
+
+    with ig.execution(backend='serial'):
+        temp_serial = run_parallel_paths(signals.T, time, matrix, vectors)
+
+    temp_before = shm_segments()
+    with ig.execution(backend='process', n_jobs=2):
+        temp_process = run_parallel_paths(signals.T, time, matrix, vectors)
+    temp_after = shm_segments()
+
+    for temp_1, temp_2 in zip(temp_serial, temp_process):
+        assert same(temp_1, temp_2)
+    assert {temp_name for temp_name in temp_after - temp_before if temp_name.startswith('psm_')} == set()
+
+def test_strided_views_stay_small():
+    data = np.zeros((10000, 64))
+    signal = np.arange(10000, dtype=np.float64)
+    windows = np.lib.stride_tricks.sliding_window_view(signal, 100)[::10]
+
+    with ExitStack() as temp_stack:
+        temp_column = share_array(data[:, 3], temp_stack)
+        temp_windows = share_array(windows, temp_stack)
+
+        temp_shm = SharedMemory(name=temp_column[0])
+        assert temp_shm.size <= data[:, 3].nbytes + 4096
+        temp_shm.close()
+
+        # the sliding windows are shared as the signal they span, not as the windows
+        temp_shm = SharedMemory(name=temp_windows[0])
+        assert temp_shm.size <= signal.nbytes + 4096
+        temp_view = np.ndarray(temp_windows[1], dtype=temp_windows[2], buffer=temp_shm.buf, strides=temp_windows[3])
+        assert np.array_equal(temp_view, windows)
+        del temp_view
+        temp_shm.close()
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason='/dev/shm is not available')
+def test_no_segment_left_after_error():
+    def job_error(out, data, k):
+        raise ValueError('error of the job')
+
+    temp_before = shm_segments()
+    with ig.execution(backend='process', n_jobs=2):
+        with pytest.raises(ValueError):
+            shared_run(job_error, [(0,), (1,)], [np.ones(100)], (2,), np.float64)
+    assert {temp_name for temp_name in shm_segments() - temp_before if temp_name.startswith('psm_')} == set()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Streaming [information rate]: the chunks given to update() (and flush()) give the same information rate
+square as the batch functions on the whole signal.
+"""
+
+import numpy as np
+import pytest
+
+import info_geo as ig
+
+from numpy.lib.stride_tricks import sliding_window_view
+
+def make_signals(n_channels, length, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.tanh(np.cumsum(rng.standard_normal((n_channels, length)), axis=1)/15)
+
+# chunks of the given sizes in turn
+def chunk_bounds(length, sizes=(1, 7, 50, 123)):
+    temp_bounds, temp_start, k = [], 0, 0
+    while temp_start < length:
+        temp_stop = min(temp_start + sizes[k % len(sizes)], length)
+        temp_bounds.append((temp_start, temp_stop))
+        temp_start, k = temp_stop, k + 1
+    return temp_bounds
+
+@pytest.mark.parametrize('int_range', [1, 0.8, (-0.9, 0.7)])
+@pytest.mark.parametrize('n_channels', [1, 3])
+def test_fix_stream_matches_batch(int_range, n_channels):
+    win, sld = 40, 7
+    signals = make_signals(n_channels, 1500)
+    time = np.arange(1500)*0.01
+
+    stream = ig.FixInforateStream(win=win, sld=sld, int_bins=25, int_range=int_range, n_channels=n_channels)
+    temp_values, temp_times = [], []
+    for temp_start, temp_stop in chunk_bounds(signals.shape[1]):
+        temp_value, temp_time = stream.update(signals[:, temp_start:temp_stop], time[temp_start:temp_stop])
+        temp_values.append(temp_value)
+        temp_times.append(temp_time)
+
+    data = sliding_window_view(signals, win, axis=-1)[:, ::sld]
+    time_data = sliding_window_view(time, win)[::sld]
+    temp_batch, temp_batch_time = ig.fix_collect_inforate_square(data, time_data, int_range=int_range, int_bins=25)
+
+    assert np.allclose(np.concatenate(temp_values), temp_batch, rtol=1e-10, atol=0, equal_nan=True)
+    assert np.array_equal(np.concatenate(temp_times), temp_batch_time)
+
+def run_stft_stream(signals, int_fs, win_size, overlap):
+    stream = ig.InforateStftStream(int_fs, win_size=win_size, overlap=overlap, int_freq_range=[2, 40], n_channels=signals.shape[0])
+    temp_values, temp_times = [], []
+    for temp_start, temp_stop in chunk_bounds(signals.shape[-1], sizes=(1, 13, 77, 5, 131)):
+        temp_value, temp_time = stream.update(signals[..., temp_start:temp_stop] if signals.shape[0] > 1 else signals[0, temp_start:temp_stop])
+        temp_values.append(temp_value)
+        temp_times.append(temp_time)
+    temp_value, temp_time = stream.flush()
+    temp_values.append(temp_value)
+    temp_times.append(temp_time)
+    return np.concatenate(temp_values, axis=-1), np.concatenate(temp_times)
+
+@pytest.mark.parametrize('win_size, overlap', [(64, None), (64, 63), (51, 20), (51, 50)])
+def test_stft_stream_matches_batch(win_size, overlap):
+    rng = np.random.default_rng(0)
+    signals = rng.standard_normal((3, 1000))
+    time = np.arange(1000)/200
+
+    temp_batch, temp_batch_time = ig.inforate_square_stft(signals, time, win_size=win_size, overlap=overlap, int_freq_range=[2, 40])
+    temp_stream, temp_stream_time = run_stft_stream(signals, 200, win_size, overlap)
+    assert temp_stream.shape == temp_batch.shape
+    assert np.allclose(temp_stream, temp_batch, rtol=1e-9, atol=0)
+    assert np.allclose(temp_stream_time, temp_batch_time, rtol=0, atol=1e-12)
+
+    # one channel (1D chunks) is the same as the channel of the N channels
+    temp_single, temp_single_time = run_stft_stream(signals[1:2], 200, win_size, overlap)
+    assert temp_single.ndim == 1
+    assert np.array_equal(temp_single, temp_stream[1])
+    assert np.array_equal(temp_single_time, temp_stream_time)